@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import io
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_FIXTURES = HERE / "mock-legal-fixtures.json"
+RUN_TAG = "BENCH20260301"
+# (language, case title, description) swapped into the bundled fixtures for the multilingual case.
+MULTILINGUAL = [
+    ("ru", "Уведомление о выселении — Иванов против ООО «Дом»", "Арендодатель уведомляет арендатора о задолженности."),
+    ("el", "Ειδοποίηση δικαστηρίου — Παπαδόπουλος κατά Δήμου", "Η ειδοποίηση ενημερώνει για την προθεσμία απάντησης."),
+    ("vi", "Thông báo của tòa án — Nguyễn và Trần", "Thông báo cho biết thời hạn phản hồi và hồ sơ cần chuẩn bị."),
+    ("pl", "Wezwanie do zapłaty — Kowalski przeciwko Spółce", "Wierzyciel wzywa dłużnika do zapłaty w terminie 14 dni."),
+    ("zh", "法院通知 — 张三诉李四", "本通知告知收件人答复期限以及需要准备的相关文件和记录。"),
+    ("ja", "裁判所からの通知 — 山田対佐藤", "この通知は、回答期限と準備すべき書類についてお知らせするものです。"),
+    ("ko", "법원 통지서 — 김철수 대 이영희", "이 통지서는 수신인에게 답변 기한과 준비해야 할 서류를 안내합니다."),
+]
+
+# Metric name -> True when a larger value is better.
+METRICS = {
+    "docs_per_sec": True,
+    "ms_per_page": False,
+    "bytes_per_doc": False,
+    "peak_rss_kb": False,
+    "us_per_call": False,
+}
+
+
+def load_generator() -> Any:
+    if str(HERE) not in sys.path:
+        sys.path.insert(0, str(HERE))
+    import mock_legal_generator
+
+    return mock_legal_generator
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the mock legal document generator.")
+    parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES))
+    parser.add_argument("--out", default="output/ops/mock-legal-generator-bench.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative regression (0.15 = 15%%).")
+    parser.add_argument("--docs", type=int, default=40, help="Documents rendered per category case.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions; the best one is kept.")
+    parser.add_argument("--corpus-docs", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--only", action="append", help="Run only cases whose name starts with this prefix.")
+    parser.add_argument("--quick", action="store_true", help="Small sizes for a smoke run.")
+    args = parser.parse_args()
+    if args.quick:
+        args.docs, args.repeat, args.corpus_docs = 8, 1, 120
+    return args
+
+
+def peak_rss_kb() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> tuple[float, Any]:
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def job_for(gen: Any, fixture: dict[str, str], variant: int = 0) -> dict[str, Any]:
+    base = {
+        "run_tag": RUN_TAG,
+        "issue_date": gen.run_date(RUN_TAG),
+        "recipient_name": "Xavier Smooth",
+        "recipient_address": "2458 N Valencia Dr, Phoenix, AZ 85016",
+        "fixture": fixture,
+        "output_path": Path(fixture["fileName"]),
+    }
+    job = base if variant == 0 else gen.variant_job(base, 0, variant, RUN_TAG)
+    return {key: value for key, value in job.items() if key != "output_path"}
+
+
+def render_case(gen: Any, jobs: list[dict[str, Any]], repeat: int) -> dict[str, Any]:
+    def run() -> tuple[int, int]:
+        pages = size = 0
+        for job in jobs:
+            data, facts = gen.render_document(**job)
+            pages += facts["pages"]
+            size += len(data)
+        return pages, size
+
+    elapsed, (pages, size) = best_of(repeat, run)
+    return {
+        "docs": len(jobs),
+        "docs_per_sec": round(len(jobs) / elapsed, 2),
+        "ms_per_page": round(elapsed * 1000 / pages, 4),
+        "bytes_per_doc": round(size / len(jobs), 1),
+    }
+
+
+def micro_case(gen: Any, fixtures: list[dict[str, str]], repeat: int, calls: int) -> dict[str, Any]:
+    from reportlab.lib.pagesizes import LETTER
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(io.BytesIO(), pagesize=LETTER)
+    text = " ".join(fixture["description"] for fixture in fixtures[:6])
+    rows = [("March 01, 2026", "Notice issued", "Document served to recipient")] * 3
+    items = gen.PROFILE["court"]["consequences"]
+
+    def timed(draw: Callable[[], Any]) -> dict[str, float]:
+        def run() -> None:
+            for _ in range(calls):
+                draw()
+                del c._code[:]
+
+        elapsed, _ = best_of(repeat, run)
+        return {"us_per_call": round(elapsed * 1e6 / calls, 2)}
+
+    results = {
+        "draw_wrapped": timed(lambda: gen.draw_wrapped(c, text, gen.MARGIN, 700, gen.PAGE_W - 2 * gen.MARGIN)),
+        "draw_timeline_table": timed(lambda: gen.draw_timeline_table(c, 500, rows)),
+        "bullets": timed(lambda: gen.bullets(c, items, 400)),
+    }
+
+    job = job_for(gen, fixtures[0])
+    facts = gen.document_facts(job["fixture"], RUN_TAG, job["issue_date"])
+    facts.update(fonts=gen.font_family("latin"), enclosure_pages=0)
+    canvases = []
+
+    def build() -> None:
+        canvases.clear()
+        for _ in range(calls):
+            doc = canvas.Canvas(io.BytesIO(), pagesize=LETTER)
+            gen.render_template(
+                doc, job["fixture"], RUN_TAG, job["issue_date"], job["recipient_name"], job["recipient_address"], facts
+            )
+            canvases.append(doc)
+
+    best = None
+    for _ in range(repeat):
+        build()
+        start = time.perf_counter()
+        for doc in canvases:
+            doc.save()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    results["canvas_save"] = {"us_per_call": round(best * 1e6 / calls, 2)}
+    return results
+
+
+def corpus_case(gen: Any, fixtures_path: str, docs: int, jobs: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        base = {
+            "run_tag": RUN_TAG,
+            "issue_date": gen.run_date(RUN_TAG),
+            "recipient_name": "Xavier Smooth",
+            "recipient_address": "2458 N Valencia Dr, Phoenix, AZ 85016",
+        }
+        source = gen.FixtureSource(Path(fixtures_path))
+        planned = gen.expand_jobs(source, base, out_dir, variants=None, total_docs=docs, seed=RUN_TAG)
+        start = time.perf_counter()
+        pages = size = count = 0
+        for _, outcome, _ in gen.run_jobs(((job, None) for job in planned), jobs, prepare=gen.preload_fonts):
+            if outcome["error"]:
+                raise RuntimeError(outcome["error"])
+            count += 1
+            pages += outcome["pages"]
+            size += outcome["bytes"]
+        elapsed = time.perf_counter() - start
+    return {
+        "docs": count,
+        "jobs": jobs,
+        "docs_per_sec": round(count / elapsed, 2),
+        "ms_per_page": round(elapsed * 1000 / pages, 4),
+        "bytes_per_doc": round(size / count, 1),
+    }
+
+
+def run_case(name: str, args: dict[str, Any]) -> dict[str, Any]:
+    gen = load_generator()
+    fixtures = gen.load_fixtures(Path(args["fixtures"]))
+    if name.startswith("category/"):
+        category = name.split("/", 1)[1]
+        fixture = next(f for f in fixtures if gen.DOC_CATEGORY.get(f["documentType"], "general") == category)
+        jobs = [job_for(gen, fixture, variant) for variant in range(args["docs"])]
+        result = render_case(gen, jobs, args["repeat"])
+    elif name == "large-text":
+        long_text = " ".join(f["description"] for f in fixtures) * 2
+        jobs = [job_for(gen, {**f, "description": long_text}) for f in fixtures[: args["docs"]]]
+        result = render_case(gen, jobs, args["repeat"])
+    elif name == "multilingual":
+        # Variants of every language in turn; the first repetition also pays for registering the fonts.
+        rows = [
+            {**fixture, "language": language, "caseTitle": title, "description": description}
+            for fixture, (language, title, description) in zip(fixtures, MULTILINGUAL)
+        ]
+        jobs = [job_for(gen, rows[index % len(rows)], index // len(rows)) for index in range(args["docs"])]
+        result = render_case(gen, jobs, args["repeat"])
+    elif name == "micro":
+        result = micro_case(gen, fixtures, args["repeat"], calls=args["docs"] * 10)
+        return {f"micro/{key}": value for key, value in result.items()}
+    elif name == "corpus":
+        result = corpus_case(gen, args["fixtures"], args["corpus_docs"], args["jobs"])
+    else:
+        raise ValueError(f"unknown case {name}")
+    result["peak_rss_kb"] = peak_rss_kb()
+    return {name: result}
+
+
+def case_names(gen_categories: list[str]) -> list[str]:
+    return [f"category/{category}" for category in gen_categories] + ["large-text", "multilingual", "micro", "corpus"]
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    regressions = []
+    for case, metrics in sorted(results.items()):
+        before = baseline.get(case)
+        if not before:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            new, old = metrics.get(metric), before.get(metric)
+            if not isinstance(new, (int, float)) or not isinstance(old, (int, float)) or old <= 0:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(f"{case} {metric}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=HERE, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def main() -> int:
+    args = parse_args()
+    gen = load_generator()
+    fixtures = gen.load_fixtures(Path(args.fixtures))
+    categories = sorted({gen.DOC_CATEGORY.get(f["documentType"], "general") for f in fixtures})
+    names = [
+        name for name in case_names(categories) if not args.only or any(name.startswith(p) for p in args.only)
+    ]
+    settings = {
+        "fixtures": args.fixtures,
+        "docs": args.docs,
+        "repeat": args.repeat,
+        "corpus_docs": args.corpus_docs,
+        "jobs": args.jobs,
+    }
+    results: dict[str, Any] = {}
+    # Every case runs in a fresh interpreter so peak RSS belongs to that case alone.
+    spawn = multiprocessing.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            case = pool.submit(run_case, name, settings).result()
+        for case_name, metrics in case.items():
+            results[case_name] = metrics
+            shown = ", ".join(f"{key}={value}" for key, value in metrics.items() if key in METRICS)
+            print(f"{case_name}: {shown}")
+
+    payload = {
+        "generatedAt": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "reportlab": gen.reportlab_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": results,
+    }
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    print(f"results written to {out}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
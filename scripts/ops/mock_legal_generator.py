@@ -0,0 +1,2881 @@
+from __future__ import annotations
+
+import argparse
+import collections
+import contextlib
+import datetime as dt
+import functools
+import hashlib
+import heapq
+import importlib
+import importlib.util
+import io
+import itertools
+import json
+import math
+import os
+import random
+import re
+import struct
+import sys
+import threading
+import time
+import types
+import zlib
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+import mock_legal_metrics
+import mock_legal_scan
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen.canvas import Canvas
+
+# reportlab's drawing modules, the process pool and the archive modules are imported on first use; see --timing.
+MODULE_STARTED = time.perf_counter()
+TIMINGS: dict[str, float] = {}
+# Per-stage seconds for the document render_job is profiling, or None.
+DOCUMENT_SPANS: dict[str, float] | None = None
+# Held while a canvas is created; see new_canvas().
+CANVAS_LOCK = threading.Lock()
+PAGE_W, PAGE_H = 612.0, 792.0  # reportlab.lib.pagesizes.LETTER
+MARGIN = 40
+CACHE_MANIFEST = ".mock-legal-cache.json"
+# Job keys that place a document in the run but do not change its bytes: not render inputs, not in digests.
+PLAN_KEYS = ("output_path", "slot", "shard", "profiled")
+CACHE_VERSION = 2
+WRAP_CACHE_ENTRIES = 4096
+ARCHIVE_FORMATS = {".zip": "zip", ".tar": "tar", ".tar.gz": "tar.gz", ".tgz": "tar.gz", ".tar.zst": "tar.zst"}
+ARCHIVE_MANIFEST = "manifest.jsonl"
+DEFAULT_RECIPIENT_NAME = "Xavier Smooth"
+DEFAULT_RECIPIENT_ADDRESS = "2458 N Valencia Dr, Phoenix, AZ 85016"
+FIXTURE_FIELDS = ("documentType", "caseTitle", "fileName", "description")
+MAX_PACKET_PAGES = 1000
+# Case, notice and docket numbers are six digits, so a run has ID_SPACE unique values per field.
+ID_SPACE = 900000
+ID_FIELDS = ("case", "notice", "docket")
+ID_BLOCK = 4096
+# Bytes in the smallest valid fixture row: the four FIXTURE_FIELDS with one-character values, no whitespace.
+MIN_FIXTURE_ROW_BYTES = 69
+# Module-level data render_inputs_digest() hashes per document rather than as part of the generator source,
+# so an edit to one category's PROFILE entry or one template only invalidates the documents using it.
+LAYOUT_DATA = ("DOC_CATEGORY", "PROFILE", "NOTICE_SUMMARY", "TEMPLATES")
+# --watch polls the fixture file and this module this often, then waits WATCH_SETTLE for an editor's save to land.
+WATCH_INTERVAL = 0.1
+WATCH_SETTLE = 0.05
+FLOW_TOP = PAGE_H - 76
+FLOW_BOTTOM = 58
+JSON_WHITESPACE = re.compile(r"[ \t\r\n]*")
+# Longest JSON token a decode error can point into while it is still incomplete (a \uXXXX escape).
+JSON_TOKEN_CHARS = 6
+# Output size profiles. compress/a85: page stream Flate and ASCII85 (None keeps the reportlab defaults, which
+# are both on); font: a TrueType font embedded as a subset for the enclosure transcript; enclosure: bytes of
+# scanned-enclosure image data every document carries. --size-target adds more image data to reach a size.
+OUTPUT_PROFILES = {
+    "default": {"compress": None, "a85": None, "font": None, "enclosure": 0},
+    "compact": {"compress": True, "a85": False, "font": None, "enclosure": 0},
+    "uncompressed": {"compress": False, "a85": False, "font": None, "enclosure": 0},
+    "embedded-font": {"compress": True, "a85": False, "font": "Vera", "enclosure": 0},
+    "scanned-enclosure": {"compress": True, "a85": False, "font": "Vera", "enclosure": 350_000},
+}
+SIZE_UNITS = {"": 1, "b": 1, "k": 1 << 10, "kb": 1 << 10, "m": 1 << 20, "mb": 1 << 20, "g": 1 << 30, "gb": 1 << 30}
+SIZE_DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "choice")
+MAX_TARGET_BYTES = 256 << 20
+MERGE_PROBLEMS_SHOWN = 20
+# A document within this many bytes of its target is not padded further.
+MIN_PADDING = 256
+# Maps random bytes onto light paper-grey levels, so padding looks like a faint scan and stays incompressible.
+ENCLOSURE_SPECKLE = bytes(200 + (value * 56 >> 8) for value in range(256))
+# Font families for fixture text (case title, description, recipient). Each maps the base-14 fonts the layout
+# uses to the family's fonts; "latin" keeps them, which limits text to WinAnsi. The other families use the
+# TrueType fonts vendored in FONTS_DIR, embedded as subsets. Noto Sans CJK ships only CFF outlines, which
+# reportlab cannot embed, so the CJK families share Droid Sans Fallback; "rtl" uses DejaVu Sans for its Hebrew,
+# Arabic and Arabic presentation-form glyphs. Fixed layout text and static layers are English and always use the
+# base-14 fonts.
+FONTS_DIR = Path(__file__).resolve().parent / "fonts"
+CJK_FONT = dict.fromkeys(("Helvetica", "Helvetica-Bold", "Courier"), "DroidSansFallbackFull")
+FONT_FAMILIES: dict[str, dict[str, str]] = {
+    "latin": {},
+    "unicode": {"Helvetica": "NotoSans-Regular", "Helvetica-Bold": "NotoSans-Bold", "Courier": "NotoSans-Regular"},
+    "chinese": CJK_FONT,
+    "chinese-traditional": CJK_FONT,
+    "japanese": CJK_FONT,
+    "korean": CJK_FONT,
+    "rtl": {"Helvetica": "DejaVuSans", "Helvetica-Bold": "DejaVuSans-Bold", "Courier": "DejaVuSans"},
+}
+# Hebrew and Arabic text is drawn in display order: arabic-reshaper joins Arabic letters into their contextual
+# forms and python-bidi reorders each drawn line. Both are optional and only imported for such text.
+RTL_TEXT = re.compile(r"[\u0590-\u08ff\ufb1d-\ufdff\ufe70-\ufefc]")
+RTL_DEPENDENCIES = {"arabic_reshaper": "arabic-reshaper", "bidi": "python-bidi"}
+# A fixture's "language" picks the family where the script alone cannot (Han text is Chinese or Japanese);
+# other languages, and fixtures without one, get the family their text needs.
+LANGUAGE_FONTS = {
+    "zh": "chinese",
+    "zh-tw": "chinese-traditional",
+    "zh-hk": "chinese-traditional",
+    "zh-hant": "chinese-traditional",
+    "ja": "japanese",
+    "ko": "korean",
+    "ar": "rtl",
+    "fa": "rtl",
+    "ur": "rtl",
+    "he": "rtl",
+    "yi": "rtl",
+}
+SCRIPT_FONTS = (
+    ("rtl", RTL_TEXT),
+    ("japanese", re.compile(r"[\u3040-\u30ff]")),
+    ("korean", re.compile(r"[\u1100-\u11ff\u3130-\u318f\uac00-\ud7af]")),
+    ("chinese", re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]")),
+)
+# Glyph subsets built per embedded font and process; documents sharing their text's characters reuse one.
+SUBSET_CACHE_ENTRIES = 64
+COLORS = {
+    "ink": "#0F172A",
+    "slate": "#334155",
+    "rule": "#CBD5E1",
+    "band": "#E2E8F0",
+    "panel": "#F8FAFC",
+    "white": "#FFFFFF",
+}
+
+DOC_CATEGORY = {
+    "protective_order_notice": "court",
+    "family_court_notice": "court",
+    "small_claims_complaint": "court",
+    "summons_complaint": "court",
+    "subpoena_notice": "court",
+    "judgment_notice": "court",
+    "court_hearing_notice": "court",
+    "demand_letter": "civil",
+    "eviction_notice": "housing",
+    "foreclosure_default_notice": "housing",
+    "repossession_notice": "housing",
+    "landlord_security_deposit_notice": "housing",
+    "lease_violation_notice": "housing",
+    "debt_collection_notice": "debt",
+    "wage_garnishment_notice": "debt",
+    "tax_notice": "debt",
+    "unemployment_benefits_denial": "benefits",
+    "workers_comp_denial_notice": "benefits",
+    "benefits_overpayment_notice": "benefits",
+    "insurance_denial_letter": "insurance",
+    "insurance_subrogation_notice": "insurance",
+    "incident_evidence_photo": "incident",
+    "utility_shutoff_notice": "utility",
+    "license_suspension_notice": "dmv",
+    "citation_ticket": "citation",
+    "general_legal_notice": "general",
+    "non_legal_or_unclear_image": "receipt",
+    "unknown_legal_document": "unknown",
+}
+
+PROFILE = {
+    "court": {
+        "issuer": "Superior Court Administration",
+        "office": "Civil and Family Clerk Division",
+        "response_days": 14,
+        "consequences": [
+            "Court action may proceed without your response.",
+            "A default order can increase cost and complexity.",
+            "Delayed filings can reduce available options.",
+        ],
+        "records": [
+            "Complete notice packet and all envelopes.",
+            "Timeline of events and communication log.",
+            "Prior filings, orders, and receipts.",
+        ],
+    },
+    "civil": {
+        "issuer": "Pre-Litigation Resolution Services",
+        "office": "Claims and Compliance Department",
+        "response_days": 10,
+        "consequences": [
+            "The sender may escalate to formal litigation.",
+            "Claimed costs can increase with delay.",
+            "Negotiation options may narrow over time.",
+        ],
+        "records": [
+            "Letter and all attachments.",
+            "Proof of payment or performance.",
+            "Dated communication history.",
+        ],
+    },
+    "housing": {
+        "issuer": "Metro Housing Compliance Office",
+        "office": "Tenant and Property Enforcement Unit",
+        "response_days": 7,
+        "consequences": [
+            "Occupancy or property rights may change quickly.",
+            "Fees can increase with service and filing activity.",
+            "Missing cure windows can limit remedies.",
+        ],
+        "records": [
+            "Lease or loan records and payment history.",
+            "Photos and property condition notes.",
+            "Messages with landlord, servicer, or manager.",
+        ],
+    },
+    "debt": {
+        "issuer": "Financial Recovery Administration",
+        "office": "Collections and Compliance Unit",
+        "response_days": 20,
+        "consequences": [
+            "Collection activity may continue.",
+            "Interest, penalties, or fees may accrue.",
+            "Some dispute windows may close.",
+        ],
+        "records": [
+            "Statements, balances, and prior notices.",
+            "Dispute letters and payment confirmations.",
+            "Identity or account correction evidence.",
+        ],
+    },
+    "benefits": {
+        "issuer": "State Benefits Adjudication Office",
+        "office": "Appeals and Determinations Bureau",
+        "response_days": 15,
+        "consequences": [
+            "Benefit interruption or recoupment may continue.",
+            "Appeal rights can narrow after deadlines.",
+            "Future eligibility review may be harder.",
+        ],
+        "records": [
+            "Determination letters and claim history.",
+            "Employment or medical support records.",
+            "Appeal submissions and receipts.",
+        ],
+    },
+    "insurance": {
+        "issuer": "Insurance Claims Resolution Center",
+        "office": "Coverage and Recovery Team",
+        "response_days": 30,
+        "consequences": [
+            "Coverage disputes may remain unresolved.",
+            "Recovery or lien claims may continue.",
+            "Missed appeals may reduce remedies.",
+        ],
+        "records": [
+            "Policy terms and denial/subrogation notices.",
+            "Invoices, estimates, and claim files.",
+            "Timeline of incident and communications.",
+        ],
+    },
+    "incident": {
+        "issuer": "Incident Documentation Intake Unit",
+        "office": "Evidence Review Desk",
+        "response_days": 30,
+        "consequences": [
+            "Missing context can weaken evidence use.",
+            "Unsorted files increase consultation prep time.",
+            "Important facts are harder to reconstruct later.",
+        ],
+        "records": [
+            "Original photos and timestamps.",
+            "Police, medical, and estimate records.",
+            "Witness names and contact details.",
+        ],
+    },
+    "utility": {
+        "issuer": "City Utility Revenue Office",
+        "office": "Service Continuity and Collections",
+        "response_days": 5,
+        "consequences": [
+            "Disconnection may occur on listed date.",
+            "Reconnection may require added fees.",
+            "Billing disputes can continue while disconnected.",
+        ],
+        "records": [
+            "Current and prior utility statements.",
+            "Payment confirmations and account notes.",
+            "Hardship records when relevant.",
+        ],
+    },
+    "dmv": {
+        "issuer": "Department of Motor Vehicle Compliance",
+        "office": "License Review and Enforcement",
+        "response_days": 12,
+        "consequences": [
+            "Driving restrictions may become effective.",
+            "Reinstatement requirements may increase.",
+            "Delays may extend suspension timelines.",
+        ],
+        "records": [
+            "Notice, registration, and insurance records.",
+            "Prior DMV correspondence.",
+            "Proof of completed obligations.",
+        ],
+    },
+    "citation": {
+        "issuer": "Traffic and Municipal Violations Bureau",
+        "office": "Citation Processing Unit",
+        "response_days": 21,
+        "consequences": [
+            "Penalties may increase over time.",
+            "Collection or holds may be initiated.",
+            "Additional appearance requirements may apply.",
+        ],
+        "records": [
+            "Citation copy and any correction proof.",
+            "Payment receipts if already resolved.",
+            "Supporting media or witness notes.",
+        ],
+    },
+    "general": {
+        "issuer": "Legal Affairs Administrative Office",
+        "office": "Public Notice and Compliance Desk",
+        "response_days": 14,
+        "consequences": [
+            "Review may proceed without clarification.",
+            "Follow-up notices may have tighter windows.",
+            "Delay can increase coordination time.",
+        ],
+        "records": [
+            "Current notice and referenced exhibits.",
+            "Background records tied to the matter.",
+            "Simple chronology of events.",
+        ],
+    },
+    "receipt": {
+        "issuer": "Valley Market and Pharmacy",
+        "office": "Store Register Receipt",
+        "response_days": 0,
+        "consequences": [
+            "This file alone is not a legal notice.",
+            "Add legal context to avoid missing signals.",
+            "Attach related formal documents when available.",
+        ],
+        "records": [
+            "Receipt and purchase details.",
+            "Incident context linking this evidence.",
+            "Any notice related to this transaction.",
+        ],
+    },
+    "unknown": {
+        "issuer": "Unclassified Legal Correspondence Desk",
+        "office": "Manual Review Unit",
+        "response_days": 14,
+        "consequences": [
+            "Unknown context may hide critical deadlines.",
+            "Incomplete packets can raise legal prep costs.",
+            "Routing delays can defer next steps.",
+        ],
+        "records": [
+            "All available pages from sender.",
+            "How and when the document was received.",
+            "Related contracts and prior notices.",
+        ],
+    },
+}
+
+VARIANT_RECIPIENTS = [
+    (DEFAULT_RECIPIENT_NAME, DEFAULT_RECIPIENT_ADDRESS),
+    ("Maria Delgado", "1719 W Roosevelt St, Phoenix, AZ 85007"),
+    ("Jordan Ellis", "830 E University Dr, Tempe, AZ 85281"),
+    ("Aaliyah Brooks", "4410 N 44th St Apt 212, Phoenix, AZ 85018"),
+    ("Tomas Nguyen", "1205 S Alma School Rd, Mesa, AZ 85210"),
+    ("Priya Raman", "9932 E Sunnydale Ave, Scottsdale, AZ 85258"),
+    ("Daniel Okafor", "3321 W Glendale Ave, Glendale, AZ 85051"),
+    ("Rosa Castillo", "615 N 5th Ave, Tucson, AZ 85705"),
+    ("Kevin Walsh", "2107 E Baseline Rd Unit 9, Gilbert, AZ 85234"),
+    ("Hannah Pierce", "78 W Cedar Ln, Flagstaff, AZ 86001"),
+    ("Luis Herrera", "5230 W Thomas Rd, Phoenix, AZ 85031"),
+    ("Grace Kim", "1440 N Dysart Rd, Avondale, AZ 85323"),
+]
+
+VARIANT_AMOUNT_LINES = [
+    "Amount referenced in this notice: ${amount}.",
+    "Balance listed as ${amount} as of {date}.",
+    "Related charges currently total ${amount}.",
+    "The sender claims ${amount} remains outstanding.",
+]
+
+PACKET_ACTIONS = [
+    "Letter received",
+    "Phone call to issuing office",
+    "Payment record located",
+    "Follow-up notice mailed",
+    "Hearing date confirmed",
+    "Supporting statement requested",
+    "Copy forwarded to counsel",
+    "Account history printed",
+]
+VARIANT_DETAIL_LINES = [
+    "",
+    "A copy was also sent by certified mail.",
+    "Reply to the office listed above and include the reference ID.",
+    "An earlier notice on this matter may have been sent to a prior address.",
+    "Supporting pages referenced in the notice were not included in this copy.",
+]
+
+
+# Declarative page layouts, one per template, each split into parts a renderer replays in order: "head", then
+# "packet" for packetPages fixtures or "body" otherwise. An op is (kind, *args); text arguments are format
+# strings over template_values(). Kinds:
+#   layer NAME             static page art (a StaticLayer); if it returns a y, that becomes the cursor
+#   fill NAME / stroke NAME / font NAME SIZE     graphics state
+#   text|right|center X Y TEXT                   a string at a fixed position
+#   wrapped TEXT X WIDTH [FONT SIZE LEADING]     wrapped paragraph from the cursor down
+#   section TITLE / table KEY / bullets KEY      headed band, timeline table, bullet list from the cursor down
+#   gap N / footer PAGE / page / stage NAME      cursor, page furniture, page break, --profile stage boundary
+#   packet TEXT                                  the flowing packet layout from the cursor (render_packet_body)
+NOTICE_SUMMARY = (
+    "{description} This synthetic sample mirrors common formatting and wording seen in legal or administrative "
+    "notices."
+)
+TEMPLATES: dict[str, dict[str, list[tuple[Any, ...]]]] = {
+    "notice": {
+        "head": [
+            ("layer", "header"),
+            ("fill", "white"),
+            ("font", "Helvetica", 9),
+            ("right", PAGE_W - MARGIN - 12, PAGE_H - 78, "Run: {run_tag}"),
+            ("fill", "ink"),
+            ("font", "Helvetica-Bold", 13),
+            ("text", MARGIN, PAGE_H - 108, "{case_title_upper}"),
+            ("font", "Helvetica", 9),
+            ("fill", "slate"),
+            ("text", MARGIN, PAGE_H - 123, "Type: {document_type} | Jurisdiction: AZ"),
+            ("layer", "notice_frame"),
+            ("font", "Helvetica", 8),
+            ("fill", "ink"),
+            ("right", PAGE_W - MARGIN - 8, PAGE_H - 140, "{notice_no}"),
+            ("right", PAGE_W - MARGIN - 8, PAGE_H - 158, "{case_no}"),
+            ("right", PAGE_W - MARGIN - 8, PAGE_H - 176, "{docket_no}"),
+            ("right", PAGE_W - MARGIN - 8, PAGE_H - 194, "{issue_date}"),
+            ("font", "Helvetica", 10),
+            ("text", MARGIN + 8, PAGE_H - 245, "{recipient_name}"),
+            ("text", MARGIN + 8, PAGE_H - 259, "{recipient_address}"),
+            ("text", MARGIN + 8, PAGE_H - 273, "Reference ID: XS-{case_no}"),
+            ("font", "Helvetica", 9),
+            ("right", PAGE_W - MARGIN - 8, PAGE_H - 273, "Suggested response date: {due_date}"),
+            ("stage", "header"),
+        ],
+        "body": [
+            ("wrapped", NOTICE_SUMMARY, MARGIN + 6, PAGE_W - (2 * MARGIN) - 12),
+            ("gap", 6),
+            ("stage", "summary"),
+            ("section", "Important Dates and Actions"),
+            ("table", "timeline"),
+            ("stage", "timeline"),
+            ("section", "Potential Outcomes if Ignored"),
+            ("bullets", "consequences"),
+            ("gap", 4),
+            ("section", "Records Commonly Gathered"),
+            ("bullets", "records"),
+            ("footer", 1),
+            ("page",),
+            ("stage", "summary"),
+            ("layer", "intake_worksheet"),
+            ("fill", "ink"),
+            ("font", "Helvetica", 9),
+            ("text", MARGIN, PAGE_H - 74, "{case_title} | Case {case_no} | Recipient {recipient_name}"),
+            ("page",),
+            ("stage", "worksheet"),
+        ],
+        "packet": [
+            ("packet", NOTICE_SUMMARY),
+            ("stage", "packet"),
+        ],
+    },
+    "receipt": {
+        "head": [
+            ("layer", "receipt"),
+            ("font", "Courier", 10),
+            ("text", MARGIN, PAGE_H - 116, "Receipt ID: RCT-{notice_no}"),
+            ("right", PAGE_W - MARGIN, PAGE_H - 116, "Date: {issue_date}"),
+            ("text", MARGIN, PAGE_H - 132, "Customer: {recipient_name}"),
+            ("right", PAGE_W - MARGIN, PAGE_H - 132, "Register: 04  Run: {run_tag}"),
+            ("stage", "header"),
+        ],
+        "body": [
+            ("fill", "ink"),
+            ("font", "Helvetica", 10),
+            (
+                "wrapped",
+                "{description} This receipt alone is not a legal notice. "
+                "Attach legal correspondence and event context if this is evidence.",
+                MARGIN,
+                PAGE_W - (2 * MARGIN),
+            ),
+            ("footer", 1),
+            ("page",),
+            ("stage", "summary"),
+            ("layer", "evidence_worksheet"),
+            ("fill", "ink"),
+            ("font", "Helvetica", 9),
+            ("text", MARGIN, PAGE_H - 74, "Case {case_no} | Link receipt details to case events."),
+            ("page",),
+            ("stage", "worksheet"),
+        ],
+    },
+}
+CATEGORY_TEMPLATE = {"receipt": "receipt"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", required=True)
+    sink = parser.add_mutually_exclusive_group(required=True)
+    sink.add_argument("--out-dir")
+    sink.add_argument(
+        "--out-archive",
+        help="Write every document into one .zip, .tar, .tar.gz or .tar.zst archive instead of a directory.",
+    )
+    sink.add_argument(
+        "--out-stream",
+        action="store_true",
+        help="Write documents to stdout as frames: 4-byte big-endian header length, JSON manifest record, "
+        "then the PDF (its length is the record's 'bytes').",
+    )
+    parser.add_argument("--run-tag", required=True)
+    parser.add_argument(
+        "--issue-date", type=dt.date.fromisoformat, help="Issue date (YYYY-MM-DD). Defaults to the run tag's date."
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Byte-identical output for identical inputs: reportlab invariant mode and a clock pinned to the issue "
+        "date. Needs --issue-date or a run tag containing a date.",
+    )
+    parser.add_argument("--recipient-name", default=DEFAULT_RECIPIENT_NAME)
+    parser.add_argument("--recipient-address", default=DEFAULT_RECIPIENT_ADDRESS)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    scale = parser.add_mutually_exclusive_group()
+    scale.add_argument("--variants-per-fixture", type=int, default=1)
+    scale.add_argument("--total-docs", type=int)
+    parser.add_argument("--variant-seed", help="Seed for variant data. Defaults to the run tag.")
+    parser.add_argument(
+        "--shard",
+        help="Render only slice I of N (1-based, e.g. 2/8) of the corpus; IDs, variants and manifest indexes match "
+        "an unsharded run. Join the shard manifests with the 'merge' subcommand.",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-render every document even if cached.")
+    parser.add_argument("--validate", action="store_true", help="Only validate the fixture file.")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After the build, keep watching the fixture file and the generator's profile and template data "
+        "(and the scan module with --scan), re-rendering only the documents each edit affects.",
+    )
+    parser.add_argument("--manifest", help="Write a JSONL ground-truth record for every generated document.")
+    parser.add_argument("--timing", action="store_true", help="Print a startup and stage timing breakdown to stderr.")
+    parser.add_argument(
+        "--profile",
+        help="Record per-document stage spans and write aggregated metrics with percentiles here: "
+        "JSON for a .json path, Prometheus text otherwise (e.g. .prom).",
+    )
+    parser.add_argument(
+        "--profile-stats",
+        help="Dump cProfile stats (pstats format) for the whole run here. Renders in this process (--jobs 1).",
+    )
+    parser.add_argument(
+        "--scan",
+        choices=sorted(mock_legal_scan.SCAN_FORMATS),
+        help="Rasterize output with scan artifacts: png/jpeg hold the first page, pdf is an image-only PDF.",
+    )
+    parser.add_argument("--scan-profile", choices=sorted(mock_legal_scan.SCAN_PROFILES), default="phone")
+    parser.add_argument("--scan-dpi", type=int, default=150)
+    parser.add_argument(
+        "--size-profile",
+        choices=list(OUTPUT_PROFILES),
+        default="default",
+        help="Page compression, font embedding and enclosure images for every document.",
+    )
+    parser.add_argument(
+        "--size-target",
+        help="Pad each document with enclosure image data to a target size drawn per document from SIZE, "
+        "uniform:MIN:MAX, lognormal:MEDIAN:SIGMA or choice:SIZE,SIZE,... (sizes like 80k or 2.5M).",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    if args.profile_stats and args.jobs > 1:
+        # cProfile only sees this process, so worker processes would leave the render out of the stats.
+        print("--profile-stats renders in this process; ignoring --jobs.", file=sys.stderr)
+        args.jobs = 1
+    if args.variants_per_fixture < 1:
+        parser.error("--variants-per-fixture must be at least 1.")
+    if args.reproducible and not (args.issue_date or run_tag_date(args.run_tag)):
+        parser.error("--reproducible needs --issue-date or a run tag with a YYYYMMDD date; it will not use today.")
+    if args.watch and (not args.out_dir or args.validate or args.profile_stats):
+        parser.error("--watch needs --out-dir and does not combine with --validate or --profile-stats.")
+    missing = missing_rtl_dependencies() if RTL_TEXT.search(args.recipient_name + args.recipient_address) else []
+    if missing:
+        parser.error(
+            f"right-to-left --recipient-name/--recipient-address text needs the optional packages {', '.join(missing)} "
+            f"(pip install {' '.join(missing)})."
+        )
+    if args.shard:
+        args.shard = parse_shard(args.shard)
+        if args.shard is None:
+            parser.error("--shard must look like I/N with 1 <= I <= N, e.g. 2/8.")
+    if args.total_docs is not None and not 1 <= args.total_docs <= ID_SPACE:
+        parser.error(f"--total-docs must be between 1 and {ID_SPACE} (unique document IDs per run).")
+    if not Path(args.fixtures).is_file():
+        parser.error(f"--fixtures {args.fixtures} is not a file.")
+    most_rows = Path(args.fixtures).stat().st_size // MIN_FIXTURE_ROW_BYTES
+    if args.total_docs is None and not args.validate and most_rows * args.variants_per_fixture > ID_SPACE:
+        # Without --total-docs the corpus is every valid row times the variants. Only a file large enough to
+        # overflow the ID space is counted before rendering; expand_jobs() still stops any corpus that does.
+        rows = count_fixture_rows(Path(args.fixtures))
+        if rows * args.variants_per_fixture > ID_SPACE:
+            parser.error(
+                f"{rows} fixture row(s) x --variants-per-fixture {args.variants_per_fixture} is more than {ID_SPACE} "
+                "documents (unique document IDs per run); use fewer variants or --total-docs."
+            )
+    if args.out_archive:
+        kind = archive_format(Path(args.out_archive))
+        if kind is None:
+            parser.error(f"--out-archive must end in one of: {', '.join(ARCHIVE_FORMATS)}.")
+        if kind == "tar.zst" and importlib.util.find_spec("zstandard") is None:
+            parser.error("--out-archive .tar.zst needs the optional 'zstandard' package (pip install zstandard).")
+    if args.scan:
+        missing = mock_legal_scan.missing_dependencies()
+        if missing:
+            parser.error(f"--scan needs the optional packages {', '.join(missing)} (pip install {' '.join(missing)}).")
+        if not 36 <= args.scan_dpi <= 600:
+            parser.error("--scan-dpi must be between 36 and 600.")
+        if args.size_profile != "default" or args.size_target:
+            parser.error("--size-profile and --size-target do not apply to --scan output.")
+    args.size_distribution = None
+    if args.size_target:
+        try:
+            args.size_distribution = parse_size_distribution(args.size_target)
+        except ValueError as exc:
+            parser.error(f"--size-target: {exc}")
+    return args
+
+
+@contextlib.contextmanager
+def timed(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIMINGS[stage] = TIMINGS.get(stage, 0.0) + time.perf_counter() - start
+
+
+@functools.lru_cache(maxsize=None)
+def backend() -> types.SimpleNamespace:
+    # --help, --validate and fully cached runs never draw, so they never import these.
+    with timed("import reportlab.lib.colors"):
+        from reportlab.lib import colors
+    with timed("import reportlab.pdfbase.pdfmetrics"):
+        from reportlab.pdfbase import pdfmetrics
+    with timed("import reportlab.pdfgen.canvas"):
+        from reportlab.pdfgen import canvas
+    return types.SimpleNamespace(colors=colors, pdfmetrics=pdfmetrics, canvas=canvas)
+
+
+@functools.lru_cache(maxsize=None)
+def archive_modules() -> types.SimpleNamespace:
+    # Only ArchiveSink uses these, so directory and stream runs never import them.
+    with timed("import archive modules"):
+        import gzip
+        import shutil
+        import tarfile
+        import tempfile
+        import zipfile
+    return types.SimpleNamespace(gzip=gzip, shutil=shutil, tarfile=tarfile, tempfile=tempfile, zipfile=zipfile)
+
+
+def stage_timer() -> Callable[[str], None]:
+    # lap(stage) adds the time since the previous lap to the document's span for that stage. Spans are only
+    # kept while render_job profiles a document; otherwise lap does nothing.
+    spans = DOCUMENT_SPANS
+    if spans is None:
+        return skip_stage
+    last = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal last
+        now = time.perf_counter()
+        spans[stage] = spans.get(stage, 0.0) + now - last
+        last = now
+
+    return lap
+
+
+def skip_stage(stage: str) -> None:
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def embedded_font(name: str) -> str:
+    # Registered once per process (pool workers forked after it inherit the parsed font) from FONTS_DIR by
+    # absolute path, or else from reportlab's TTF search path; each document embeds only the glyphs it uses.
+    pdfmetrics = backend().pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFError, TTFont
+
+    vendored = FONTS_DIR / f"{name}.ttf"
+    try:
+        font = TTFont(name, str(vendored) if vendored.is_file() else f"{name}.ttf")
+    except TTFError as exc:
+        raise ValueError(f"font {name!r} is not available: {exc}") from None
+    font.face.makeSubset = cached_subsets(font.face.makeSubset)
+    pdfmetrics.registerFont(font)
+    return name
+
+
+def cached_subsets(make: Callable[[list[int]], bytes]) -> Callable[[list[int]], bytes]:
+    # reportlab rebuilds a font's subset for every document at save time, though documents with the same
+    # characters in the same order of first use produce the same subset.
+    cached = functools.lru_cache(maxsize=SUBSET_CACHE_ENTRIES)(lambda codes: make(list(codes)))
+    return lambda subset: cached(tuple(subset))
+
+
+@functools.lru_cache(maxsize=None)
+def font_family(name: str) -> dict[str, str]:
+    fonts = FONT_FAMILIES[name]
+    for font in fonts.values():
+        embedded_font(font)
+    return fonts
+
+
+def font_family_name(fixture: dict[str, Any], recipient_name: str, recipient_address: str) -> str:
+    if fixture.get("fontFamily"):
+        return fixture["fontFamily"]
+    language = fixture.get("language", "").lower()
+    family = LANGUAGE_FONTS.get(language) or LANGUAGE_FONTS.get(language.split("-")[0])
+    if family:
+        return family
+    text = " ".join(rendered_text(fixture, recipient_name, recipient_address))
+    try:
+        text.encode("cp1252")
+        return "latin"
+    except UnicodeEncodeError:
+        pass
+    return next((family for family, script in SCRIPT_FONTS if script.search(text)), "unicode")
+
+
+def rendered_text(fixture: dict[str, Any], recipient_name: str, recipient_address: str) -> tuple[str, ...]:
+    # The fixture and recipient text a document draws; the rest of the layout is fixed English.
+    return fixture["caseTitle"], fixture["documentType"], fixture["description"], recipient_name, recipient_address
+
+
+def missing_rtl_dependencies() -> list[str]:
+    return [package for module, package in RTL_DEPENDENCIES.items() if importlib.util.find_spec(module) is None]
+
+
+@functools.lru_cache(maxsize=None)
+def rtl_modules() -> types.SimpleNamespace:
+    missing = missing_rtl_dependencies()
+    if missing:
+        raise ValueError(
+            f"right-to-left text needs the optional packages {', '.join(missing)} (pip install {' '.join(missing)})"
+        )
+    import arabic_reshaper
+    from bidi.algorithm import get_display
+
+    return types.SimpleNamespace(reshape=arabic_reshaper.reshape, get_display=get_display)
+
+
+@functools.lru_cache(maxsize=WRAP_CACHE_ENTRIES)
+def shaped(text: str) -> str:
+    # Arabic letters in their joined forms. Applied before wrapping, so lines are measured on the glyphs drawn.
+    return rtl_modules().reshape(text) if RTL_TEXT.search(text) else text
+
+
+def visual(line: str) -> str:
+    # One drawn line in display order; bidi reordering never changes its width.
+    return rtl_modules().get_display(line) if RTL_TEXT.search(line) else line
+
+
+def preload_fonts(job: dict[str, Any]) -> None:
+    # Called in the parent before a job is handed to the pool, so workers forked afterwards share its fonts.
+    name = font_family_name(job["fixture"], job["recipient_name"], job["recipient_address"])
+    if FONT_FAMILIES[name]:
+        with contextlib.suppress(ValueError):  # a missing font fails each of its documents in render_job
+            font_family(name)
+
+
+@functools.lru_cache(maxsize=None)
+def palette() -> dict[str, Any]:
+    return {name: backend().colors.HexColor(value) for name, value in COLORS.items()}
+
+
+def report_timings() -> None:
+    # Like -X importtime, but only for this tool's stages. In worker processes the backend import is not shown.
+    print(f"timing: {'interpreter + imports (cpu)':<40} {MODULE_CPU * 1000:9.1f} ms", file=sys.stderr)
+    for stage, seconds in TIMINGS.items():
+        print(f"timing: {stage:<40} {seconds * 1000:9.1f} ms", file=sys.stderr)
+    total = time.perf_counter() - MODULE_STARTED
+    print(f"timing: {'total since module load':<40} {total * 1000:9.1f} ms", file=sys.stderr)
+
+
+def run_date(run_tag: str) -> dt.date:
+    return reproducible_date(run_tag, False)
+
+
+def run_tag_date(run_tag: str) -> dt.date | None:
+    digits = "".join(ch for ch in run_tag if ch.isdigit())
+    if len(digits) >= 8:
+        try:
+            return dt.date(int(digits[:4]), int(digits[4:6]), int(digits[6:8]))
+        except ValueError:
+            return None
+    return None
+
+
+def issue_clock(issue_date: dt.date) -> int:
+    # The fixed clock of --reproducible output: midnight UTC on the issue date, as a Unix timestamp.
+    return int(dt.datetime.combine(issue_date, dt.time(), dt.timezone.utc).timestamp())
+
+
+def new_canvas(buffer: IO[bytes], compress: bool | None, issue_date: dt.date | None) -> Canvas:
+    # Settings are passed per canvas, never through the process-wide rl_config, so documents can render on
+    # several threads at once. reportlab reads the timestamp for invariant mode from SOURCE_DATE_EPOCH only
+    # while a canvas is created, so creation is serialized and the issue date stands in for the wall clock.
+    canvas = backend().canvas
+    with CANVAS_LOCK:
+        if issue_date is None:
+            return canvas.Canvas(buffer, pagesize=(PAGE_W, PAGE_H), pageCompression=compress)
+        previous = os.environ.get("SOURCE_DATE_EPOCH")
+        os.environ["SOURCE_DATE_EPOCH"] = str(issue_clock(issue_date))
+        try:
+            return canvas.Canvas(buffer, pagesize=(PAGE_W, PAGE_H), pageCompression=compress, invariant=1)
+        finally:
+            if previous is None:
+                del os.environ["SOURCE_DATE_EPOCH"]
+            else:
+                os.environ["SOURCE_DATE_EPOCH"] = previous
+
+
+def page_streams(c: Canvas, a85: bool | None) -> None:
+    # Page content streams with the output profile's ASCII85 choice. reportlab would pick the filters from the
+    # process-wide rl_config.useA85 while saving; streams already in place are kept as they are.
+    if a85 is None:
+        return
+    from reportlab.pdfbase.pdfdoc import PDFBase85Encode, PDFStream, PDFZCompress
+
+    for page in c._doc.Pages.pages:
+        if page.Contents or not page.stream:
+            continue
+        stream = PDFStream(content=page.stream)
+        if page.compression:
+            stream.filters = [PDFBase85Encode, PDFZCompress] if a85 else [PDFZCompress]
+        stream.__Comment__ = "page stream"
+        page.Contents = stream
+
+
+def stable_num(seed: str, mod: int, offset: int = 0) -> int:
+    return offset + (int(hashlib.sha256(seed.encode("utf-8")).hexdigest()[:12], 16) % mod)
+
+
+@functools.lru_cache(maxsize=None)
+def id_permutation(run_tag: str) -> dict[str, tuple[int, int]]:
+    # One hash per run. Each field maps corpus slot s to (a * s + b) % ID_SPACE with a coprime to ID_SPACE,
+    # which is a bijection: slots below ID_SPACE never share a number, and any block of slots is computed
+    # directly, without the slots before it.
+    digest = hashlib.sha256(f"{run_tag}:ids".encode("utf-8")).digest()
+    keys = {}
+    for offset, field in enumerate(ID_FIELDS):
+        a = int.from_bytes(digest[offset * 8 : offset * 8 + 4], "big") % ID_SPACE
+        while a < 2 or math.gcd(a, ID_SPACE) != 1:
+            a += 1
+        keys[field] = (a, int.from_bytes(digest[offset * 8 + 4 : offset * 8 + 8], "big") % ID_SPACE)
+    return keys
+
+
+def allocate_ids(run_tag: str, slots: range) -> list[dict[str, int]]:
+    if not slots or slots.start < 0 or slots.stop > ID_SPACE:
+        raise ValueError(f"a run has {ID_SPACE} unique IDs per field; cannot allocate {slots}")
+    keys = id_permutation(run_tag).items()
+    return [{field: 100000 + (a * slot + b) % ID_SPACE for field, (a, b) in keys} for slot in slots]
+
+
+def fmt_date(value: dt.date) -> str:
+    return value.strftime("%B %d, %Y")
+
+
+@functools.lru_cache(maxsize=WRAP_CACHE_ENTRIES)
+def word_width(word: str, font: str, size: float) -> float:
+    return backend().pdfmetrics.stringWidth(word, font, size)
+
+
+@functools.lru_cache(maxsize=WRAP_CACHE_ENTRIES)
+def wrap_text(text: str, font: str, size: float, width: float) -> tuple[str, ...]:
+    # Greedy breaks on real glyph widths. Memoized (bounded) because PROFILE bullets and the shared
+    # notice wording are wrapped with identical arguments for every document in a corpus.
+    words = [piece for word in text.split() for piece in fit_word(word, font, size, width)]
+    if not words:
+        return ("",)
+    space = word_width(" ", font, size)
+    lines = []
+    current = [words[0]]
+    used = word_width(words[0], font, size)
+    for word in words[1:]:
+        width_of_word = word_width(word, font, size)
+        if used + space + width_of_word <= width:
+            current.append(word)
+            used += space + width_of_word
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+            used = width_of_word
+    lines.append(" ".join(current))
+    return tuple(lines)
+
+
+def fit_word(word: str, font: str, size: float, width: float) -> list[str]:
+    # Chinese and Japanese text has no spaces to break at, so a "word" wider than the line is broken between
+    # characters.
+    if word_width(word, font, size) <= width:
+        return [word]
+    pieces = [""]
+    used = 0.0
+    for char in word:
+        char_width = word_width(char, font, size)
+        if pieces[-1] and used + char_width > width:
+            pieces.append("")
+            used = 0.0
+        pieces[-1] += char
+        used += char_width
+    return pieces
+
+
+def draw_wrapped(
+    c: Canvas, text: str, x: float, y: float, width: float, font="Helvetica", size=10, leading=13
+) -> float:
+    c.setFont(font, size)
+    for para in text.split("\n"):
+        for line in wrap_text(shaped(para), font, size, width):
+            c.drawString(x, y, visual(line))
+            y -= leading
+        if not para.strip():
+            y -= 4
+    return y
+
+
+def section(c: Canvas, title: str, y: float) -> float:
+    c.setFillColor(palette()["band"])
+    c.rect(MARGIN, y - 14, PAGE_W - (2 * MARGIN), 17, fill=1, stroke=0)
+    c.setFillColor(palette()["ink"])
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(MARGIN + 7, y - 2, title.upper())
+    return y - 24
+
+
+def bullets(c: Canvas, items: list[str], y: float) -> float:
+    for item in items:
+        lines = wrap_text(item, "Helvetica", 10, PAGE_W - (2 * MARGIN) - 20)
+        if not lines:
+            continue
+        c.setFont("Helvetica", 10)
+        c.drawString(MARGIN + 8, y, "-")
+        c.drawString(MARGIN + 18, y, lines[0])
+        y -= 13
+        for line in lines[1:]:
+            c.drawString(MARGIN + 18, y, line)
+            y -= 13
+        y -= 1
+    return y
+
+
+class StaticLayer:
+    # Page art that never changes between documents, recorded once per process as PDF operators and
+    # appended to each page. Font resource names are per document, so they are re-bound on every draw.
+
+    def __init__(self, draw: Callable[[Canvas], Any]) -> None:
+        self._draw = draw
+        self._parts: list[str] | None = None
+        self._fonts: list[str] = []
+        self._result: Any = None
+
+    def _compile(self) -> None:
+        scratch = backend().canvas.Canvas(io.BytesIO(), pagesize=(PAGE_W, PAGE_H))
+        start = len(scratch._code)
+        self._result = self._draw(scratch)
+        ops: list[str] = []
+        state: dict[str, str] = {}
+        for op in scratch._code[start:]:
+            kind = state_kind(op)
+            if op in ("q", "Q"):
+                state.clear()
+            elif kind:
+                if state.get(kind) == op:
+                    continue
+                state[kind] = op
+            ops.append(op)
+        internal = {name: font for font, name in scratch._doc.fontMapping.items()}
+        self._parts = re.split(r"(/F\d+)(?= [\d.]+ Tf)", "\n".join(ops))
+        self._fonts = [internal[name] for name in self._parts[1::2]]
+
+    def draw(self, c: Canvas) -> Any:
+        if self._parts is None:
+            self._compile()
+        parts = list(self._parts)
+        parts[1::2] = [c._doc.getInternalFontName(font) for font in self._fonts]
+        c._code.append("q")
+        c._code.append("".join(parts))
+        c._code.append("Q")
+        return self._result
+
+
+def state_kind(op: str) -> str | None:
+    if op.startswith("BT /F") and " Tf " in op:
+        return "font"
+    if op.endswith(" rg"):
+        return "fill"
+    if op.endswith(" RG"):
+        return "stroke"
+    return None
+
+
+def draw_footer_art(c: Canvas) -> None:
+    c.setStrokeColor(palette()["band"])
+    c.line(MARGIN, 42, PAGE_W - MARGIN, 42)
+    c.setFont("Helvetica", 8)
+    c.setFillColor(palette()["slate"])
+    c.drawString(
+        MARGIN,
+        30,
+        "Synthetic QA document for ClearCase testing only. This document is not legal advice.",
+    )
+
+
+FOOTER_LAYER = StaticLayer(draw_footer_art)
+
+
+def footer(c: Canvas, page_no: int) -> None:
+    FOOTER_LAYER.draw(c)
+    c.setFont("Helvetica", 8)
+    c.setFillColor(palette()["slate"])
+    c.drawRightString(PAGE_W - MARGIN, 30, f"Page {page_no}")
+
+
+def draw_timeline_table(c: Canvas, y: float, rows: list[tuple[str, str, str]]) -> float:
+    row_h = 18
+    width = PAGE_W - (2 * MARGIN) - 12
+    x = MARGIN + 6
+    date_col = 122
+    action_col = 124
+    total_h = row_h * (len(rows) + 1)
+    bottom = y - total_h
+    c.setStrokeColor(palette()["rule"])
+    c.rect(x, bottom, width, total_h, stroke=1, fill=0)
+    c.line(x + date_col, bottom, x + date_col, y)
+    c.line(x + date_col + action_col, bottom, x + date_col + action_col, y)
+    for i in range(1, len(rows) + 1):
+        c.line(x, y - i * row_h, x + width, y - i * row_h)
+    c.setFillColor(palette()["panel"])
+    c.rect(x, y - row_h, width, row_h, stroke=0, fill=1)
+    c.setFillColor(palette()["ink"])
+    c.setFont("Helvetica-Bold", 9)
+    c.drawString(x + 6, y - 12, "Date")
+    c.drawString(x + date_col + 6, y - 12, "Action")
+    c.drawString(x + date_col + action_col + 6, y - 12, "Notes")
+    c.setFont("Helvetica", 9)
+    for idx, (d, a, n) in enumerate(rows, start=1):
+        yy = y - idx * row_h - 12
+        c.drawString(x + 6, yy, d[:24])
+        c.drawString(x + date_col + 6, yy, a[:26])
+        c.drawString(x + date_col + action_col + 6, yy, n[:40])
+    return bottom - 14
+
+
+def draw_receipt_art(c: Canvas) -> float:
+    c.setFont("Courier-Bold", 15)
+    c.drawCentredString(PAGE_W / 2, PAGE_H - 52, "VALLEY MARKET AND PHARMACY")
+    c.setFont("Courier", 10)
+    c.drawCentredString(PAGE_W / 2, PAGE_H - 68, "1880 East Brookline Ave, Phoenix, AZ 85018")
+    c.drawCentredString(PAGE_W / 2, PAGE_H - 82, "Tel: (602) 555-0101")
+    c.line(MARGIN, PAGE_H - 92, PAGE_W - MARGIN, PAGE_H - 92)
+
+    y = PAGE_H - 156
+    c.setFont("Courier-Bold", 10)
+    c.drawString(MARGIN, y, "ITEM")
+    c.drawRightString(PAGE_W - MARGIN - 120, y, "QTY")
+    c.drawRightString(PAGE_W - MARGIN - 40, y, "PRICE")
+    c.line(MARGIN, y - 4, PAGE_W - MARGIN, y - 4)
+    y -= 18
+
+    items = [
+        ("First aid kit", 1, 18.99),
+        ("Notebook and pens", 1, 8.49),
+        ("Phone charger", 1, 16.99),
+        ("Printed photos (8x10)", 12, 23.88),
+        ("Storage binder", 1, 9.79),
+    ]
+    subtotal = 0.0
+    c.setFont("Courier", 10)
+    for name, qty, price in items:
+        subtotal += price
+        c.drawString(MARGIN, y, name)
+        c.drawRightString(PAGE_W - MARGIN - 120, y, str(qty))
+        c.drawRightString(PAGE_W - MARGIN - 40, y, f"${price:0.2f}")
+        y -= 14
+
+    tax = round(subtotal * 0.086, 2)
+    total = round(subtotal + tax, 2)
+    y -= 8
+    c.line(MARGIN, y, PAGE_W - MARGIN, y)
+    y -= 15
+    c.drawRightString(PAGE_W - MARGIN - 120, y, "SUBTOTAL")
+    c.drawRightString(PAGE_W - MARGIN - 40, y, f"${subtotal:0.2f}")
+    y -= 14
+    c.drawRightString(PAGE_W - MARGIN - 120, y, "TAX")
+    c.drawRightString(PAGE_W - MARGIN - 40, y, f"${tax:0.2f}")
+    y -= 16
+    c.setFont("Courier-Bold", 11)
+    c.drawRightString(PAGE_W - MARGIN - 120, y, "TOTAL")
+    c.drawRightString(PAGE_W - MARGIN - 40, y, f"${total:0.2f}")
+    y -= 26
+
+    c.setFont("Helvetica-Bold", 10)
+    c.setFillColor(palette()["ink"])
+    c.drawString(MARGIN, y, "Assessment")
+    return y - 14
+
+
+def draw_evidence_worksheet_art(c: Canvas) -> None:
+    c.setFillColor(palette()["ink"])
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(MARGIN, PAGE_H - 58, "Evidence Context Worksheet")
+    y2 = PAGE_H - 98
+    y2 = section(c, "What happened and why this receipt matters", y2)
+    for _ in range(12):
+        c.line(MARGIN + 6, y2, PAGE_W - MARGIN - 6, y2)
+        y2 -= 15
+    y2 -= 8
+    y2 = section(c, "Related documents to upload next", y2)
+    for _ in range(8):
+        c.line(MARGIN + 6, y2, PAGE_W - MARGIN - 6, y2)
+        y2 -= 15
+    footer(c, 2)
+
+
+RECEIPT_LAYER = StaticLayer(draw_receipt_art)
+EVIDENCE_WORKSHEET_LAYER = StaticLayer(draw_evidence_worksheet_art)
+
+
+@functools.lru_cache(maxsize=None)
+def header_layer(issuer: str, office: str) -> StaticLayer:
+    def draw(c: Canvas) -> None:
+        c.setFillColor(palette()["ink"])
+        c.rect(MARGIN, PAGE_H - 92, PAGE_W - (2 * MARGIN), 52, fill=1, stroke=0)
+        c.setFillColor(palette()["white"])
+        c.setFont("Helvetica-Bold", 15)
+        c.drawString(MARGIN + 12, PAGE_H - 62, issuer)
+        c.setFont("Helvetica", 10)
+        c.drawString(MARGIN + 12, PAGE_H - 78, office)
+        c.setFont("Helvetica-Bold", 11)
+        c.drawRightString(PAGE_W - MARGIN - 12, PAGE_H - 62, "OFFICIAL NOTICE")
+
+    return StaticLayer(draw)
+
+
+def draw_notice_frame_art(c: Canvas) -> float:
+    meta_x = PAGE_W - MARGIN - 206
+    meta_y = PAGE_H - 128
+    c.setStrokeColor(palette()["rule"])
+    c.rect(meta_x, meta_y - 78, 206, 78, stroke=1, fill=0)
+    c.setFont("Helvetica-Bold", 8)
+    c.setFillColor(palette()["ink"])
+    c.drawString(meta_x + 8, meta_y - 12, "NOTICE NUMBER")
+    c.drawString(meta_x + 8, meta_y - 30, "CASE NUMBER")
+    c.drawString(meta_x + 8, meta_y - 48, "DOCKET")
+    c.drawString(meta_x + 8, meta_y - 66, "ISSUE DATE")
+
+    box_top = PAGE_H - 215
+    c.setStrokeColor(palette()["rule"])
+    c.rect(MARGIN, box_top - 66, PAGE_W - (2 * MARGIN), 66, stroke=1, fill=0)
+    c.setFont("Helvetica-Bold", 9)
+    c.setFillColor(palette()["ink"])
+    c.drawString(MARGIN + 8, box_top - 14, "TO")
+    c.drawRightString(PAGE_W - MARGIN - 8, box_top - 14, "SENT VIA MAIL AND ELECTRONIC COPY")
+    return section(c, "Notice Summary", box_top - 84)
+
+
+def draw_intake_worksheet_body(c: Canvas) -> None:
+    c.setFillColor(palette()["ink"])
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(MARGIN, PAGE_H - 58, "Consultation Intake Worksheet")
+    y2 = PAGE_H - 98
+    y2 = section(c, "Chronology of Events", y2)
+    for _ in range(8):
+        c.line(MARGIN + 6, y2, PAGE_W - MARGIN - 6, y2)
+        y2 -= 15
+    y2 -= 8
+    y2 = section(c, "People and Organizations Involved", y2)
+    for _ in range(5):
+        c.line(MARGIN + 6, y2, PAGE_W - MARGIN - 6, y2)
+        y2 -= 15
+    y2 -= 8
+    y2 = section(c, "Documents to Bring", y2)
+    checks = [
+        "Notice packet and attachments",
+        "Prior correspondence and statements",
+        "Payment records and receipts",
+        "Timeline notes and key names",
+        "Questions for first consultation",
+    ]
+    for row in checks:
+        c.rect(MARGIN + 8, y2 - 10, 9, 9, stroke=1, fill=0)
+        c.setFont("Helvetica", 9)
+        c.drawString(MARGIN + 23, y2 - 8, row)
+        y2 -= 16
+    y2 -= 6
+    y2 = section(c, "Questions for Counsel", y2)
+    for _ in range(7):
+        c.line(MARGIN + 6, y2, PAGE_W - MARGIN - 6, y2)
+        y2 -= 15
+    c.setFont("Helvetica-Bold", 9)
+    c.drawString(MARGIN + 6, y2 - 2, "Estimated preparation time saved when this packet is complete: 45-90 minutes.")
+
+
+def draw_intake_worksheet_art(c: Canvas) -> None:
+    draw_intake_worksheet_body(c)
+    footer(c, 2)
+
+
+NOTICE_FRAME_LAYER = StaticLayer(draw_notice_frame_art)
+INTAKE_WORKSHEET_LAYER = StaticLayer(draw_intake_worksheet_art)
+INTAKE_WORKSHEET_BODY_LAYER = StaticLayer(draw_intake_worksheet_body)
+# Layers templates refer to by name; "header" depends on the category profile and comes from template_values().
+STATIC_LAYERS = {
+    "notice_frame": NOTICE_FRAME_LAYER,
+    "intake_worksheet": INTAKE_WORKSHEET_LAYER,
+    "receipt": RECEIPT_LAYER,
+    "evidence_worksheet": EVIDENCE_WORKSHEET_LAYER,
+}
+
+
+class PageFlow:
+    # Vertical cursor for the flowing packet layout. A block that does not fit above the footer closes the page
+    # (footer and number) and continues on a new one; past last_page, need() refuses instead of adding pages.
+
+    def __init__(self, c: Canvas, y: float, last_page: int, title: str, case_no: str, fonts: dict[str, str]) -> None:
+        self.c = c
+        self.y = y
+        self.last_page = last_page
+        self.title = title
+        self.case_no = case_no
+        self.fonts = fonts
+
+    @property
+    def page_no(self) -> int:
+        return self.c.getPageNumber()
+
+    def need(self, height: float) -> bool:
+        if self.y - height >= FLOW_BOTTOM:
+            return True
+        if self.page_no >= self.last_page:
+            return False
+        footer(self.c, self.page_no)
+        self.c.showPage()
+        c = self.c
+        c.setFillColor(palette()["ink"])
+        c.setFont(self.fonts.get("Helvetica-Bold", "Helvetica-Bold"), 9)
+        c.drawString(MARGIN, PAGE_H - 48, visual(shaped(f"{self.title} (continued)")))
+        c.setFont("Helvetica", 9)
+        c.drawRightString(PAGE_W - MARGIN, PAGE_H - 48, f"Case {self.case_no}")
+        c.setStrokeColor(palette()["rule"])
+        c.line(MARGIN, PAGE_H - 56, PAGE_W - MARGIN, PAGE_H - 56)
+        self.y = FLOW_TOP
+        return True
+
+    def wrapped(self, text: str, x: float, width: float, font="Helvetica", size=10, leading=13) -> bool:
+        font = self.fonts.get(font, font)
+        page = None
+        for para in text.split("\n"):
+            for line in wrap_text(shaped(para), font, size, width):
+                if not self.need(leading):
+                    return False
+                if page != self.page_no:
+                    page = self.page_no
+                    self.c.setFillColor(palette()["ink"])
+                    self.c.setFont(font, size)
+                self.c.drawString(x, self.y, visual(line))
+                self.y -= leading
+            if not para.strip():
+                self.y -= 4
+        return True
+
+    def section(self, title: str) -> bool:
+        # Keeps a heading on the same page as at least one line of what follows it.
+        if not self.need(24 + 13):
+            return False
+        self.y = section(self.c, title, self.y)
+        return True
+
+    def bullets(self, items: list[str]) -> bool:
+        for item in items:
+            lines = wrap_text(item, "Helvetica", 10, PAGE_W - (2 * MARGIN) - 20)
+            for index, line in enumerate(lines):
+                if not self.need(13):
+                    return False
+                self.c.setFillColor(palette()["ink"])
+                self.c.setFont("Helvetica", 10)
+                if index == 0:
+                    self.c.drawString(MARGIN + 8, self.y, "-")
+                self.c.drawString(MARGIN + 18, self.y, line)
+                self.y -= 13
+            self.y -= 1
+        return True
+
+    def table(self, rows: list[tuple[str, str, str]]) -> bool:
+        # Same columns as draw_timeline_table, but cells wrap instead of being cut, rows never split and the
+        # header row is repeated on every page the table continues onto.
+        widths = (122, 124, PAGE_W - (2 * MARGIN) - 12 - 122 - 124)
+        cells = [
+            tuple(wrap_text(value, "Helvetica", 9, width - 12) for value, width in zip(row, widths)) for row in rows
+        ]
+        start = 0
+        while start < len(cells):
+            if not self.need(18 * 2):
+                return False
+            chunk = []
+            height = 18
+            for row in cells[start:]:
+                row_h = 18 + 11 * (max(len(lines) for lines in row) - 1)
+                if chunk and self.y - height - row_h < FLOW_BOTTOM:
+                    break
+                chunk.append((row, row_h))
+                height += row_h
+            self.y = draw_table_rows(self.c, self.y, widths, chunk)
+            start += len(chunk)
+        return True
+
+
+def draw_table_rows(
+    c: Canvas, y: float, widths: tuple[float, float, float], rows: list[tuple[tuple[tuple[str, ...], ...], float]]
+) -> float:
+    row_h = 18
+    x = MARGIN + 6
+    width = sum(widths)
+    total_h = row_h + sum(height for _, height in rows)
+    bottom = y - total_h
+    c.setStrokeColor(palette()["rule"])
+    c.rect(x, bottom, width, total_h, stroke=1, fill=0)
+    c.line(x + widths[0], bottom, x + widths[0], y)
+    c.line(x + widths[0] + widths[1], bottom, x + widths[0] + widths[1], y)
+    line_y = y - row_h
+    for _, height in rows:
+        c.line(x, line_y, x + width, line_y)
+        line_y -= height
+    c.setFillColor(palette()["panel"])
+    c.rect(x, y - row_h, width, row_h, stroke=0, fill=1)
+    c.setFillColor(palette()["ink"])
+    c.setFont("Helvetica-Bold", 9)
+    c.drawString(x + 6, y - 12, "Date")
+    c.drawString(x + widths[0] + 6, y - 12, "Action")
+    c.drawString(x + widths[0] + widths[1] + 6, y - 12, "Notes")
+    c.setFont("Helvetica", 9)
+    top = y - row_h
+    for cells, height in rows:
+        offsets = (0, widths[0], widths[0] + widths[1])
+        for lines, offset in zip(cells, offsets):
+            for index, line in enumerate(lines):
+                c.drawString(x + offset + 6, top - 12 - index * 11, line)
+        top -= height
+    return bottom - 14
+
+
+def document_facts(
+    fixture: dict[str, str],
+    run_tag: str,
+    issue_date: dt.date,
+    ids: dict[str, int] | None = None,
+    profile_overrides: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    category = DOC_CATEGORY.get(fixture["documentType"], "general")
+    profile = {**PROFILE[category], **(profile_overrides or {})}
+    response_days = int(profile["response_days"])
+    due_date = issue_date + dt.timedelta(days=max(response_days, 0))
+    if ids is None:
+        # A document rendered on its own, outside a corpus.
+        seed = f"{run_tag}:{fixture['documentType']}"
+        ids = {field: stable_num(f"{seed}:{field}", ID_SPACE, 100000) for field in ID_FIELDS}
+    case_no = f"{issue_date.year}-{ids['case']}"
+    notice_no = f"NTC-{issue_date.year}-{ids['notice']}"
+    docket_no = f"DKT-{ids['docket']}"
+    timeline = []
+    if category != "receipt":
+        timeline = [
+            (issue_date, "Notice issued", "Document served to recipient"),
+            (due_date, "Response or filing due", "Timeline may vary by jurisdiction"),
+            (due_date + dt.timedelta(days=7), "Administrative follow-up", "Additional notice may be sent"),
+        ]
+    return {
+        "category": category,
+        "profile": profile,
+        "response_days": response_days,
+        "due_date": due_date,
+        "case_no": case_no,
+        "notice_no": notice_no,
+        "docket_no": docket_no,
+        "timeline": timeline,
+    }
+
+
+def render_fixture(
+    fixture: dict[str, str],
+    output_path: Path,
+    run_tag: str,
+    issue_date: dt.date,
+    recipient_name: str,
+    recipient_address: str,
+    ids: dict[str, int] | None = None,
+    profile_overrides: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    data, facts = render_document(
+        fixture, run_tag, issue_date, recipient_name, recipient_address, ids, profile_overrides
+    )
+    output_path.write_bytes(data)
+    return facts
+
+
+def render_document(
+    fixture: dict[str, str],
+    run_tag: str,
+    issue_date: dt.date,
+    recipient_name: str,
+    recipient_address: str,
+    ids: dict[str, int] | None = None,
+    profile_overrides: dict[str, Any] | None = None,
+    output_profile: str = "default",
+    target_bytes: int | None = None,
+    reproducible: bool = False,
+) -> tuple[bytes, dict[str, Any]]:
+    facts = document_facts(fixture, run_tag, issue_date, ids, profile_overrides)
+    facts["fonts"] = font_family(font_family_name(fixture, recipient_name, recipient_address))
+    settings = OUTPUT_PROFILES[output_profile]
+    enclosure = settings["enclosure"]
+    # With a target, the first pass carries at least a one-byte enclosure image so its page, font and image
+    # overhead is already counted; the second pass only grows the image data by the remaining gap.
+    probe = enclosure or (1 if target_bytes else 0)
+    clock = issue_date if reproducible else None
+    data, pages = draw_document(
+        fixture, run_tag, issue_date, recipient_name, recipient_address, facts, settings, probe, clock
+    )
+    gap = (target_bytes or 0) - len(data)
+    if gap >= MIN_PADDING or probe != enclosure:
+        # Either pad to the target or, if the document is already big enough, drop the probe image again.
+        image_bytes = probe + gap if gap >= MIN_PADDING else enclosure
+        data, pages = draw_document(
+            fixture, run_tag, issue_date, recipient_name, recipient_address, facts, settings, image_bytes, clock
+        )
+    return data, {**facts, "pages": pages}
+
+
+def draw_document(
+    fixture: dict[str, str],
+    run_tag: str,
+    issue_date: dt.date,
+    recipient_name: str,
+    recipient_address: str,
+    facts: dict[str, Any],
+    settings: dict[str, Any],
+    enclosure: int,
+    clock: dt.date | None = None,
+) -> tuple[bytes, int]:
+    buffer = io.BytesIO()
+    c = new_canvas(buffer, settings["compress"], clock)
+    c.setTitle(fixture["caseTitle"])
+    c.setAuthor("ClearCase QA Fixture Generator")
+
+    # The enclosure page is one of a packet's packetPages, so the packet layout leaves room for it.
+    facts["enclosure_pages"] = 1 if enclosure or settings["font"] else 0
+    render_template(c, fixture, run_tag, issue_date, recipient_name, recipient_address, facts)
+    lap = stage_timer()
+    if facts["enclosure_pages"]:
+        render_enclosure(c, fixture, facts, settings["font"], enclosure)
+        lap("enclosure")
+    pages = c.getPageNumber() - 1
+    page_streams(c, settings["a85"])
+    c.save()
+    lap("save")
+    return buffer.getvalue(), pages
+
+
+def template_values(
+    fixture: dict[str, Any],
+    run_tag: str,
+    issue_date: dt.date,
+    recipient_name: str,
+    recipient_address: str,
+    facts: dict[str, Any],
+) -> dict[str, Any]:
+    profile = facts["profile"]
+    return {
+        "fixture": fixture,
+        "facts": facts,
+        "run_tag": run_tag,
+        "case_title": fixture["caseTitle"],
+        "case_title_upper": fixture["caseTitle"].upper(),
+        "document_type": fixture["documentType"],
+        "description": fixture["description"],
+        "notice_no": facts["notice_no"],
+        "case_no": facts["case_no"],
+        "docket_no": facts["docket_no"],
+        "issue_date": fmt_date(issue_date),
+        "due_date": fmt_date(facts["due_date"]),
+        "recipient_name": recipient_name,
+        "recipient_address": recipient_address,
+        "timeline": [(fmt_date(day), action, notes) for day, action, notes in facts["timeline"]],
+        "consequences": profile["consequences"],
+        "records": profile["records"],
+        "header": header_layer(profile["issuer"], profile["office"]),
+        "fonts": facts["fonts"],
+        "lap": stage_timer(),
+    }
+
+
+def render_template(
+    c: Canvas,
+    fixture: dict[str, Any],
+    run_tag: str,
+    issue_date: dt.date,
+    recipient_name: str,
+    recipient_address: str,
+    facts: dict[str, Any],
+) -> None:
+    parts = compiled_template(CATEGORY_TEMPLATE.get(facts["category"], "notice"))
+    values = template_values(fixture, run_tag, issue_date, recipient_name, recipient_address, facts)
+    y = PAGE_H
+    for step in parts["head"]:
+        y = step(c, values, y)
+    for step in parts["packet" if fixture.get("packetPages") else "body"]:
+        y = step(c, values, y)
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_template(name: str) -> dict[str, list[Callable[[Canvas, dict[str, Any], float], float]]]:
+    # Each op becomes one step(c, values, y) -> y with its fonts, colors, layers and canvas methods resolved,
+    # so replaying a document is a flat loop over prepared calls.
+    return {part: [compile_op(*op) for op in ops] for part, ops in TEMPLATES[name].items()}
+
+
+def compile_op(kind: str, *args: Any) -> Callable[[Canvas, dict[str, Any], float], float]:
+    canvas = backend().canvas.Canvas
+    if kind == "layer":
+        layer = STATIC_LAYERS.get(args[0])
+        name = args[0]
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            result = (layer or values[name]).draw(c)
+            return y if result is None else result
+
+    elif kind in ("fill", "stroke"):
+        color = palette()[args[0]]
+        setter = canvas.setFillColor if kind == "fill" else canvas.setStrokeColor
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            setter(c, color)
+            return y
+
+    elif kind == "font":
+        font, size = args
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            c.setFont(values["fonts"].get(font, font), size)
+            return y
+
+    elif kind in ("text", "right", "center"):
+        x, at, text = args
+        draw = {"text": canvas.drawString, "right": canvas.drawRightString, "center": canvas.drawCentredString}[kind]
+        render = slot_formatter(text)
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            draw(c, x, at, visual(shaped(render(values))))
+            return y
+
+    elif kind == "wrapped":
+        text, x, width, *style = args
+        font, *style = style or ["Helvetica"]
+        render = slot_formatter(text)
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            return draw_wrapped(c, render(values), x, y, width, values["fonts"].get(font, font), *style)
+
+    elif kind == "gap":
+        [gap] = args
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            return y - gap
+
+    elif kind == "section":
+        [title] = args
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            return section(c, title, y)
+
+    elif kind == "table":
+        [key] = args
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            return draw_timeline_table(c, y, values[key])
+
+    elif kind == "bullets":
+        [key] = args
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            return bullets(c, values[key], y)
+
+    elif kind == "footer":
+        [page_no] = args
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            footer(c, page_no)
+            return y
+
+    elif kind == "page":
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            c.showPage()
+            return y
+
+    elif kind == "stage":
+        [stage] = args
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            values["lap"](stage)
+            return y
+
+    elif kind == "packet":
+        render = slot_formatter(args[0])
+
+        def step(c: Canvas, values: dict[str, Any], y: float) -> float:
+            fixture = values["fixture"]
+            render_packet_body(
+                c, fixture, values["recipient_name"], values["facts"], y, render(values), values["timeline"]
+            )
+            return y
+
+    else:
+        raise ValueError(f"unknown template op {kind!r}")
+    return step
+
+
+def slot_formatter(text: str) -> Callable[[dict[str, Any]], str]:
+    if "{" not in text:
+        return lambda values: text
+    return text.format_map
+
+
+def render_packet_body(
+    c: Canvas,
+    fixture: dict[str, Any],
+    recipient_name: str,
+    facts: dict[str, Any],
+    y: float,
+    description: str,
+    rows: list[tuple[str, str, str]],
+) -> None:
+    # Flowing layout for packetPages: the notice body, then generated exhibits until the page budget is used,
+    # then the intake worksheet as the last page. Each page is emitted (and compressed) as soon as it is full.
+    # An output profile's enclosure page comes after the worksheet and counts towards packetPages.
+    profile = facts["profile"]
+    last_page = fixture["packetPages"] - facts["enclosure_pages"]
+    if last_page < 2:
+        raise ValueError("'packetPages' must be at least 3 with an enclosure page (--size-profile or --size-target)")
+    fonts = facts["fonts"]
+    flow = PageFlow(c, y, last_page - 1, fixture["caseTitle"], facts["case_no"], fonts)
+    rng = random.Random(f"{facts['case_no']}:{facts['notice_no']}:packet")
+    filled = (
+        flow.wrapped(description, MARGIN + 6, PAGE_W - (2 * MARGIN) - 12)
+        and flow.section("Important Dates and Actions")
+        and flow.table(rows)
+        and flow.section("Potential Outcomes if Ignored")
+        and flow.bullets(profile["consequences"])
+        and flow.section("Records Commonly Gathered")
+        and flow.bullets(profile["records"])
+    )
+    exhibit = 0
+    notes = [*profile["records"], *profile["consequences"], *filter(None, VARIANT_DETAIL_LINES)]
+    while filled:
+        exhibit += 1
+        log = []
+        day = facts["due_date"]
+        for _ in range(rng.randint(8, 30)):
+            day -= dt.timedelta(days=rng.randint(0, 6))
+            log.append((fmt_date(day), rng.choice(PACKET_ACTIONS), rng.choice(notes)))
+        summary = " ".join(rng.choice(notes) for _ in range(rng.randint(3, 9)))
+        filled = (
+            flow.section(f"Exhibit {exhibit}: Correspondence and Activity Log")
+            and flow.wrapped(f"{fixture['description']} {summary}", MARGIN + 6, PAGE_W - (2 * MARGIN) - 12)
+            and flow.table(log)
+            and flow.bullets(rng.sample(notes, k=min(len(notes), rng.randint(2, 5))))
+        )
+    footer(c, flow.page_no)
+    c.showPage()
+
+    INTAKE_WORKSHEET_BODY_LAYER.draw(c)
+    footer(c, last_page)
+    c.setFillColor(palette()["ink"])
+    c.setFont(fonts.get("Helvetica", "Helvetica"), 9)
+    banner = f"{fixture['caseTitle']} | Case {facts['case_no']} | Recipient {recipient_name}"
+    c.drawString(MARGIN, PAGE_H - 74, visual(shaped(banner)))
+    c.showPage()
+
+
+def render_enclosure(
+    c: Canvas, fixture: dict[str, str], facts: dict[str, Any], font: str | None, image_bytes: int
+) -> None:
+    # A trailing "scanned enclosure" page that carries the output profile's embedded font and image data.
+    page_no = c.getPageNumber()
+    fonts = facts["fonts"]
+    c.setFillColor(palette()["ink"])
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(MARGIN, PAGE_H - 60, "Enclosure: Scanned Supporting Records")
+    c.setFont(fonts.get("Helvetica", "Helvetica"), 9)
+    c.setFillColor(palette()["slate"])
+    banner = f"{fixture['caseTitle']} | Case {facts['case_no']} | {facts['notice_no']}"
+    c.drawString(MARGIN, PAGE_H - 76, visual(shaped(banner)))
+    y = PAGE_H - 100
+    if font:
+        c.setFillColor(palette()["ink"])
+        transcript = " ".join(["Transcript:", fixture["description"], *facts["profile"]["records"]])
+        # The profile's font is Latin-only; other families draw the transcript in their own font.
+        font = fonts.get("Helvetica") or embedded_font(font)
+        y = draw_wrapped(c, transcript, MARGIN, y, PAGE_W - (2 * MARGIN), font=font, size=9, leading=12)
+    if image_bytes:
+        seed = f"{facts['case_no']}:{facts['notice_no']}:enclosure"
+        draw_enclosure_image(c, image_bytes, seed, MARGIN, FLOW_BOTTOM, PAGE_W - (2 * MARGIN), y - 8 - FLOW_BOTTOM)
+    footer(c, page_no)
+    c.showPage()
+
+
+def draw_enclosure_image(c: Canvas, nbytes: int, seed: str, x: float, y: float, width: float, height: float) -> None:
+    # An 8-bit grey image of nbytes (to within one row) of seeded noise, registered the way canvas.drawImage
+    # registers image XObjects, without needing Pillow.
+    from reportlab.pdfbase.pdfdoc import PDFImageXObject
+
+    # nbytes is the encoded stream size: stored deflate costs 6 bytes plus 5 per 64 KiB block. The row count
+    # is picked near the box's aspect ratio so that rows * cols wastes as few bytes as possible.
+    raw = max(1, nbytes - 6 - 5 * -(-max(nbytes - 6, 1) // 65540))
+    ideal = max(1, round(math.sqrt(raw * height / width)))
+    rows = min(range(max(1, ideal - 32), ideal + 33), key=lambda count: (raw % count, abs(count - ideal)))
+    cols = max(1, raw // rows)
+    image = PDFImageXObject("MockEnclosure")
+    image.width, image.height = cols, rows
+    image.bitsPerComponent = 8
+    image.colorSpace = "DeviceGray"
+    image._filters = ("FlateDecode",)
+    # Stored (level 0) deflate blocks: noise does not compress, and the stream size stays predictable.
+    image.streamContent = zlib.compress(random.Random(seed).randbytes(rows * cols).translate(ENCLOSURE_SPECKLE), 0)
+    name = c._doc.getXObjectName(image.name)
+    c._setXObjects(image)
+    c._doc.Reference(image, name)
+    c._doc.addForm(image.name, image)
+    c.saveState()
+    c.translate(x, y)
+    c.scale(width, height)
+    c._code.append(f"/{name} Do")
+    c.restoreState()
+    c._formsinuse.append(image.name)
+
+
+def iter_json_array(path: Path, chunk_size: int = 1 << 16) -> Iterator[tuple[int, Any, str | None]]:
+    # Decodes one array element at a time from a rolling buffer and yields (line, row, error).
+    # A syntax error ends the stream because the array cannot be resynchronised after it.
+    decoder = json.JSONDecoder()
+    with path.open(encoding="utf-8") as handle:
+        buf, pos, line, eof = "", 0, 1, False
+        expect = "["
+
+        def refill() -> bool:
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            chunk = handle.read(chunk_size)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+            return not eof
+
+        while True:
+            end = JSON_WHITESPACE.match(buf, pos).end()
+            line += buf.count("\n", pos, end)
+            pos = end
+            if pos == len(buf):
+                if refill():
+                    continue
+                if expect == "[":
+                    yield line, None, "fixture file must be a JSON array"
+                elif expect != "done":
+                    yield line, None, "unexpected end of file, expected ']'"
+                return
+            char = buf[pos]
+            if expect == "done":
+                yield line, None, "unexpected data after the closing ']'"
+                return
+            if expect == "[":
+                if char != "[":
+                    yield line, None, "fixture file must be a JSON array"
+                    return
+                pos += 1
+                expect = "first"
+            elif char == "]" and expect in ("first", "separator"):
+                pos += 1
+                expect = "done"
+            elif expect == "separator":
+                if char != ",":
+                    yield line, None, "expected ',' or ']' after fixture row"
+                    return
+                pos += 1
+                expect = "value"
+            else:
+                try:
+                    row, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as exc:
+                    # Only a row cut off by the end of the buffer needs more input; any other error is in the row.
+                    cut = exc.pos >= len(buf) - JSON_TOKEN_CHARS or exc.msg.startswith("Unterminated string")
+                    if cut and refill():
+                        continue
+                    yield line + buf.count("\n", pos, exc.pos), None, f"invalid JSON: {exc.msg}"
+                    return
+                if end == len(buf) and refill():
+                    continue
+                yield line, row, None
+                line += buf.count("\n", pos, end)
+                pos = end
+                expect = "separator"
+
+
+def iter_jsonl(path: Path) -> Iterator[tuple[int, Any, str | None]]:
+    with path.open(encoding="utf-8") as handle:
+        for line, text in enumerate(handle, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text), None
+            except json.JSONDecodeError as exc:
+                yield line, None, f"invalid JSON: {exc.msg}"
+
+
+def validate_fixture(row: Any) -> dict[str, Any]:
+    if not isinstance(row, dict):
+        raise ValueError("fixture row must be an object")
+    data: dict[str, Any] = {}
+    for field in FIXTURE_FIELDS:
+        value = row.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"missing field '{field}'")
+        data[field] = value.strip()
+    pages = row.get("packetPages")
+    if pages is not None:
+        if isinstance(pages, bool) or not isinstance(pages, int) or not 2 <= pages <= MAX_PACKET_PAGES:
+            raise ValueError(f"'packetPages' must be an integer from 2 to {MAX_PACKET_PAGES}")
+        if DOC_CATEGORY.get(data["documentType"]) == "receipt":
+            raise ValueError("'packetPages' is not supported for receipts")
+        data["packetPages"] = pages
+    for field in ("language", "fontFamily"):
+        value = row.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"'{field}' must be a non-empty string")
+        data[field] = value.strip()
+    if data.get("fontFamily", "latin") not in FONT_FAMILIES:
+        raise ValueError(f"unknown 'fontFamily' {data['fontFamily']!r}; expected one of {', '.join(FONT_FAMILIES)}")
+    return data
+
+
+def iter_fixtures(path: Path) -> Iterator[tuple[int, int, dict[str, str] | None, str | None]]:
+    rows = iter_jsonl(path) if path.suffix.lower() in (".jsonl", ".ndjson") else iter_json_array(path)
+    for index, (line, row, error) in enumerate(rows):
+        fixture = None
+        if error is None:
+            try:
+                fixture = validate_fixture(row)
+            except ValueError as exc:
+                error = str(exc)
+        yield index, line, fixture, error
+
+
+def count_fixture_rows(path: Path) -> int:
+    # Valid rows only; an unreadable file counts as empty here and is reported when the build reads it.
+    try:
+        return sum(1 for _, _, fixture, _ in iter_fixtures(path) if fixture is not None)
+    except (OSError, ValueError):
+        return 0
+
+
+def load_fixtures(path: Path) -> list[dict[str, str]]:
+    fixtures = []
+    for _, line, fixture, error in iter_fixtures(path):
+        if error:
+            raise ValueError(f"{path}:{line}: {error}")
+        fixtures.append(fixture)
+    return fixtures
+
+
+class FixtureSource:
+    # Re-iterable stream of (index, fixture) rows. Invalid rows are reported once, on the first pass.
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.errors = 0
+        self._passes = 0
+
+    def __iter__(self) -> Iterator[tuple[int, dict[str, str]]]:
+        first = self._passes == 0
+        self._passes += 1
+        rows = iter_fixtures(self.path)
+        while True:
+            # Parsing is interleaved with planning and rendering, so only the reads themselves are timed.
+            with timed("parse fixtures"):
+                row = next(rows, None)
+            if row is None:
+                return
+            index, line, fixture, error = row
+            if error:
+                if first:
+                    self.errors += 1
+                    print(f"{self.path}:{line}: {error}", file=sys.stderr)
+                continue
+            yield index, fixture
+
+
+def variant_job(base: dict[str, Any], index: int, variant: int, seed: str) -> dict[str, Any]:
+    fixture = base["fixture"]
+    rng = random.Random(f"{seed}:{index}:{variant}")
+    category = DOC_CATEGORY.get(fixture["documentType"], "general")
+    profile = PROFILE[category]
+    recipient_name, recipient_address = rng.choice(VARIANT_RECIPIENTS)
+    issue_date = base["issue_date"] - dt.timedelta(days=rng.randint(0, 60))
+    amount = f"{rng.uniform(85, 12500):,.2f}"
+    extra = [
+        rng.choice(VARIANT_AMOUNT_LINES).format(amount=amount, date=fmt_date(issue_date)),
+        rng.choice(VARIANT_DETAIL_LINES),
+    ]
+    file_name = Path(fixture["fileName"])
+    return {
+        **base,
+        "fixture": {
+            **fixture,
+            "fileName": f"{file_name.stem}-v{variant:05d}{file_name.suffix}",
+            "description": " ".join([fixture["description"], *filter(None, extra)]),
+        },
+        "output_path": base["output_path"].with_name(f"{file_name.stem}-v{variant:05d}{file_name.suffix}"),
+        "issue_date": issue_date,
+        "recipient_name": recipient_name,
+        "recipient_address": recipient_address,
+        "profile_overrides": {
+            "consequences": subset(rng, profile["consequences"]),
+            "records": subset(rng, profile["records"]),
+        },
+    }
+
+
+def subset(rng: random.Random, items: list[str]) -> list[str]:
+    keep = sorted(rng.sample(range(len(items)), rng.randint(1, len(items))))
+    return [items[i] for i in keep]
+
+
+def expand_jobs(
+    fixtures: Iterable[tuple[int, dict[str, str]]],
+    base: dict[str, Any],
+    out_dir: Path,
+    variants: int | None,
+    total_docs: int | None,
+    seed: str,
+) -> Iterator[dict[str, Any]]:
+    # Round-robin over fixtures so any prefix of the corpus mixes every document type.
+    # Later passes re-read the fixture stream instead of holding it in memory.
+    # Each document's position in the corpus is its ID slot; IDs are allocated ID_BLOCK slots at a time.
+    passes = itertools.count() if total_docs is not None else range(variants or 1)
+    emitted = 0
+    block: list[dict[str, int]] = []
+    for variant in passes:
+        rows = 0
+        for index, fixture in fixtures:
+            if total_docs is not None and emitted >= total_docs:
+                return
+            if emitted >= ID_SPACE:
+                raise ValueError(f"the corpus is larger than the {ID_SPACE} unique document IDs a run has")
+            if emitted % ID_BLOCK == 0:
+                block = allocate_ids(base["run_tag"], range(emitted, min(emitted + ID_BLOCK, ID_SPACE)))
+            job = {
+                **base,
+                "fixture": fixture,
+                "output_path": out_dir / fixture["fileName"],
+                "slot": emitted,
+                "ids": block[emitted % ID_BLOCK],
+            }
+            yield job if variant == 0 else variant_job(job, index, variant, seed)
+            emitted += 1
+            rows += 1
+        if not rows:
+            return
+
+
+@functools.lru_cache(maxsize=None)
+def generator_version() -> str:
+    return f"{code_fingerprint(Path(__file__).read_text(encoding='utf-8'))}:reportlab-{reportlab_version()}"
+
+
+@functools.lru_cache(maxsize=None)
+def scan_version() -> str:
+    # Scanned output also depends on mock_legal_scan and the libraries that rasterize, degrade and encode it.
+    import importlib.metadata
+
+    versions = []
+    for package in mock_legal_scan.SCAN_DEPENDENCIES.values():
+        try:
+            versions.append(f"{package}-{importlib.metadata.version(package)}")
+        except importlib.metadata.PackageNotFoundError:
+            versions.append(f"{package}-missing")
+    source = Path(mock_legal_scan.__file__).read_text(encoding="utf-8")
+    return ":".join([code_fingerprint(source), *versions])
+
+
+@functools.lru_cache(maxsize=None)
+def rtl_version() -> str:
+    # Right-to-left text is also shaped and reordered by the RTL_DEPENDENCIES packages.
+    import importlib.metadata
+
+    versions = []
+    for package in RTL_DEPENDENCIES.values():
+        try:
+            versions.append(f"{package}-{importlib.metadata.version(package)}")
+        except importlib.metadata.PackageNotFoundError:
+            versions.append(f"{package}-missing")
+    return ":".join(versions)
+
+
+def reportlab_version() -> str:
+    # reportlab.Version, read from the package source so cache checks never import reportlab.
+    spec = importlib.util.find_spec("reportlab")
+    found = re.search(r"^Version\s*=\s*['\"]([^'\"]+)", Path(spec.origin).read_text(encoding="utf-8"), re.M)
+    return found.group(1) if found else "unknown"
+
+
+def code_fingerprint(source: str) -> str:
+    # Hash of the module's syntax tree without the LAYOUT_DATA assignments, so comments, formatting and layout
+    # data edits leave it unchanged. ast is only needed once the build cache is consulted.
+    import ast
+
+    tree = ast.parse(source)
+    body = []
+    for node in tree.body:
+        targets = node.targets if isinstance(node, ast.Assign) else [getattr(node, "target", None)]
+        if not any(isinstance(target, ast.Name) and target.id in LAYOUT_DATA for target in targets):
+            body.append(node)
+    tree.body = body
+    return hashlib.sha256(ast.dump(tree).encode("utf-8")).hexdigest()
+
+
+def layout_digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def render_inputs_digest(job: dict[str, Any]) -> str:
+    category = DOC_CATEGORY.get(job["fixture"]["documentType"], "general")
+    payload = {
+        "version": generator_version(),
+        "job": {key: value for key, value in job.items() if key not in PLAN_KEYS},
+        "category": category,
+        "profile": PROFILE[category],
+        "template": TEMPLATES[CATEGORY_TEMPLATE.get(category, "notice")],
+    }
+    if job.get("scan"):
+        payload["scanVersion"] = scan_version()
+    text = rendered_text(job["fixture"], job.get("recipient_name", ""), job.get("recipient_address", ""))
+    if RTL_TEXT.search(" ".join(text)):
+        payload["rtlVersion"] = rtl_version()
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class BuildCache:
+    # Manifest of render-input digests for the files in --out-dir, so unchanged documents are skipped.
+
+    def __init__(self, out_dir: Path, force: bool, name: str = CACHE_MANIFEST) -> None:
+        self.out_dir = out_dir
+        self.path = out_dir / name
+        self.previous: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                payload = json.loads(self.path.read_text(encoding="utf-8"))
+                if payload.get("version") == CACHE_VERSION:
+                    self.previous = dict(payload["entries"])
+            except (ValueError, AttributeError, KeyError):
+                print(f"ignoring unreadable cache manifest {self.path}", file=sys.stderr)
+        self.force = force
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.digests: dict[str, str] = {}
+        self.planned: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def name(self, job: dict[str, Any]) -> str:
+        return job["output_path"].relative_to(self.out_dir).as_posix()
+
+    def lookup(self, job: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        name = self.name(job)
+        digest = render_inputs_digest(job)
+        self.planned.add(name)
+        entry = self.previous.get(name)
+        if not self.force and entry and entry.get("digest") == digest and job["output_path"].exists():
+            self.hits += 1
+            self.entries[name] = entry
+            return job, entry
+        self.misses += 1
+        self.digests[name] = digest
+        return job, None
+
+    def record(self, job: dict[str, Any], outcome: dict[str, Any]) -> None:
+        name = self.name(job)
+        digest = self.digests.pop(name)
+        if not outcome["error"]:
+            self.entries[name] = {"digest": digest, **{key: outcome[key] for key in ("sha256", "bytes", "pages")}}
+
+    def prune(self) -> int:
+        # Names come from the on-disk manifest, so one that resolves outside --out-dir is never deleted.
+        pruned = 0
+        root = self.out_dir.resolve()
+        for name in sorted(set(self.previous) - self.planned):
+            target = (self.out_dir / name).resolve()
+            if not target.is_relative_to(root) or target == self.path.resolve():
+                print(f"not pruning {name!r}: it is not a document in {self.out_dir}", file=sys.stderr)
+                continue
+            if target.is_file():
+                target.unlink()
+                pruned += 1
+        return pruned
+
+    def save(self) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        payload = {"version": CACHE_VERSION, "entries": dict(sorted(self.entries.items()))}
+        tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def manifest_record(index: int, name: str, job: dict[str, Any], outcome: dict[str, Any]) -> dict[str, Any]:
+    fixture = job["fixture"]
+    issue_date = job["issue_date"]
+    facts = document_facts(fixture, job["run_tag"], issue_date, job.get("ids"), job.get("profile_overrides"))
+    receipt = facts["category"] == "receipt"
+    record = {
+        "index": index,
+        "fileName": name,
+        "documentType": fixture["documentType"],
+        "caseTitle": fixture["caseTitle"],
+        "category": facts["category"],
+        "caseNumber": facts["case_no"],
+        "noticeNumber": f"RCT-{facts['notice_no']}" if receipt else facts["notice_no"],
+        "docketNumber": None if receipt else facts["docket_no"],
+        "issueDateIso": issue_date.isoformat(),
+        "dueDateIso": None if receipt else facts["due_date"].isoformat(),
+        "responseDays": facts["response_days"],
+        "timeline": [
+            {"dateIso": day.isoformat(), "date": fmt_date(day), "action": action, "notes": notes}
+            for day, action, notes in facts["timeline"]
+        ],
+        "recipientName": job["recipient_name"],
+        "recipientAddress": job["recipient_address"],
+        "sha256": outcome["sha256"],
+        "bytes": outcome["bytes"],
+        "pages": outcome["pages"],
+    }
+    if job.get("shard"):
+        record["shard"] = job["shard"]
+    if job.get("scan"):
+        record["scan"] = job["scan"]
+    if job.get("output_profile"):
+        record["sizeProfile"] = job["output_profile"]
+        record["targetBytes"] = job.get("target_bytes")
+    return record
+
+
+def archive_format(path: Path) -> str | None:
+    name = path.name.lower()
+    for suffix, kind in ARCHIVE_FORMATS.items():
+        if name.endswith(suffix):
+            return kind
+    return None
+
+
+def manifest_line(record: dict[str, Any]) -> bytes:
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class ArchiveSink:
+    # Appends rendered documents to a single zip/tar stream, written to a temp name and moved into place on success.
+    # The manifest is spooled (in memory until it grows large) and stored as the last entry.
+    verb = "archived"
+
+    def __init__(self, path: Path, stamp: dt.date) -> None:
+        self.path = path
+        self.kind = archive_format(path)
+        self.tmp = path.with_name(path.name + ".tmp")
+        # Entries carry the run date rather than the wall clock so identical runs produce identical archives.
+        self.mtime = dt.datetime.combine(stamp, dt.time(), dt.timezone.utc)
+        self.count = 0
+        self.stack = contextlib.ExitStack()
+        self.modules = archive_modules()
+        try:
+            self.manifest = self.stack.enter_context(self.modules.tempfile.SpooledTemporaryFile(max_size=8 << 20))
+            self.open()
+        except BaseException:
+            self.abort()
+            raise
+
+    def open(self) -> None:
+        gzip, tarfile, zipfile = self.modules.gzip, self.modules.tarfile, self.modules.zipfile
+        if self.kind == "zip":
+            self.zip = self.stack.enter_context(zipfile.ZipFile(self.tmp, "w"))
+            return
+        stream: IO[bytes] = self.stack.enter_context(self.tmp.open("wb"))
+        if self.kind == "tar.zst":
+            import zstandard
+
+            stream = self.stack.enter_context(zstandard.ZstdCompressor().stream_writer(stream))
+        elif self.kind == "tar.gz":
+            stream = self.stack.enter_context(
+                gzip.GzipFile(filename="", mode="wb", fileobj=stream, mtime=int(self.mtime.timestamp()))
+            )
+        self.tar = self.stack.enter_context(tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT))
+
+    def add(self, name: str, data: bytes, record: dict[str, Any]) -> None:
+        self.add_file(name, io.BytesIO(data), len(data))
+        self.manifest.write(manifest_line(record))
+        self.count += 1
+
+    def add_file(self, name: str, handle: IO[bytes], size: int) -> None:
+        shutil, tarfile, zipfile = self.modules.shutil, self.modules.tarfile, self.modules.zipfile
+        if self.kind == "zip":
+            info = zipfile.ZipInfo(name, self.mtime.timetuple()[:6])
+            # PDF page streams are already flate-compressed; deflating them again costs time for no size gain.
+            info.compress_type = zipfile.ZIP_DEFLATED if name == ARCHIVE_MANIFEST else zipfile.ZIP_STORED
+            with self.zip.open(info, "w") as entry:
+                shutil.copyfileobj(handle, entry)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = size
+            info.mtime = int(self.mtime.timestamp())
+            info.mode = 0o644
+            self.tar.addfile(info, handle)
+
+    def commit(self) -> None:
+        size = self.manifest.tell()
+        self.manifest.seek(0)
+        self.add_file(ARCHIVE_MANIFEST, self.manifest, size)
+        self.stack.close()
+        os.replace(self.tmp, self.path)
+
+    def summary(self) -> str:
+        return f"archive: {self.count} document(s) and {ARCHIVE_MANIFEST} written to {self.path}"
+
+    def abort(self) -> None:
+        self.stack.close()
+        self.tmp.unlink(missing_ok=True)
+
+    def __enter__(self) -> ArchiveSink:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class StreamSink:
+    # Length-prefixed frames on a binary stream (stdout by default) so callers can pipe documents to upload code.
+    verb = "streamed"
+
+    def __init__(self, stream: IO[bytes] | None = None) -> None:
+        self.stream = stream or sys.stdout.buffer
+        self.count = 0
+
+    def add(self, name: str, data: bytes, record: dict[str, Any]) -> None:
+        header = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        self.stream.write(struct.pack(">I", len(header)) + header + data)
+        self.stream.flush()
+        self.count += 1
+
+    def summary(self) -> str:
+        return f"stream: {self.count} document(s) written"
+
+    def __enter__(self) -> StreamSink:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stream.flush()
+
+
+def shard_jobs(jobs: Iterable[dict[str, Any]], index: int, count: int) -> Iterator[dict[str, Any]]:
+    # Corpus slots are dealt round-robin, so each shard gets the same mix of document types and sizes.
+    # Every node still plans the whole corpus; planning is cheap next to rendering.
+    label = f"{index}/{count}"
+    for job in jobs:
+        if job["slot"] % count == index - 1:
+            yield {**job, "shard": label}
+
+
+def parse_size(text: str) -> int:
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", text)
+    if not match or match.group(2).lower() not in SIZE_UNITS:
+        raise ValueError(f"{text!r} is not a size like 800, 80k, 2.5M or 1G")
+    size = int(float(match.group(1)) * SIZE_UNITS[match.group(2).lower()])
+    if not 1 <= size <= MAX_TARGET_BYTES:
+        raise ValueError(f"{text!r} is outside 1 byte to {MAX_TARGET_BYTES >> 20} MiB")
+    return size
+
+
+def parse_size_distribution(spec: str) -> tuple[str, tuple[float, ...]]:
+    kind, _, rest = spec.partition(":")
+    if not rest:
+        return "fixed", (parse_size(spec),)
+    values = rest.split("," if kind == "choice" else ":")
+    if kind == "uniform" and len(values) == 2:
+        low, high = map(parse_size, values)
+        if low > high:
+            raise ValueError("uniform:MIN:MAX needs MIN <= MAX")
+        return kind, (low, high)
+    if kind == "lognormal" and len(values) == 2:
+        try:
+            sigma = float(values[1])
+        except ValueError:
+            sigma = -1.0
+        if not 0 <= sigma <= 5:
+            raise ValueError("lognormal sigma must be between 0 and 5")
+        return kind, (parse_size(values[0]), sigma)
+    if kind == "choice" and all(values):
+        return kind, tuple(map(parse_size, values))
+    raise ValueError(f"expected one of {', '.join(SIZE_DISTRIBUTIONS)}, got {spec!r}")
+
+
+def draw_target_size(distribution: tuple[str, tuple[float, ...]], rng: random.Random) -> int:
+    kind, params = distribution
+    if kind == "uniform":
+        value = rng.uniform(*params)
+    elif kind == "lognormal":
+        value = rng.lognormvariate(math.log(params[0]), params[1])
+    elif kind == "choice":
+        value = rng.choice(params)
+    else:
+        value = params[0]
+    return int(min(max(value, 1), MAX_TARGET_BYTES))
+
+
+def size_job(
+    job: dict[str, Any], profile: str, distribution: tuple[str, tuple[float, ...]] | None, seed: str
+) -> dict[str, Any]:
+    # Targets are drawn per file name, so a document keeps its target however the corpus is split or resumed.
+    sized = {**job, "output_profile": profile}
+    if distribution:
+        rng = random.Random(f"{seed}:{job['output_path'].name}:size")
+        sized["target_bytes"] = draw_target_size(distribution, rng)
+    return sized
+
+
+def scan_job(job: dict[str, Any], fmt: str, profile: str, dpi: int) -> dict[str, Any]:
+    output_path = job["output_path"].with_suffix(mock_legal_scan.SCAN_FORMATS[fmt])
+    return {**job, "output_path": output_path, "scan": {"fmt": fmt, "profile": profile, "dpi": dpi}}
+
+
+def render_job(job: dict[str, Any], keep_data: bool = False) -> dict[str, Any]:
+    # keep_data returns the PDF bytes to the caller (an archive sink) instead of writing output_path.
+    # A "profiled" job also returns its per-stage spans in seconds.
+    global DOCUMENT_SPANS
+    started = time.perf_counter()
+    spans = DOCUMENT_SPANS = {} if job.get("profiled") else None
+    try:
+        data, facts = render_document(
+            **{key: value for key, value in job.items() if key not in PLAN_KEYS and key != "scan"}
+        )
+        pages = facts["pages"]
+        lap = stage_timer()
+        if job.get("scan"):
+            seed = f"{job['run_tag']}:{job['output_path'].name}"
+            clock = issue_clock(job["issue_date"]) if job.get("reproducible") else None
+            data, pages = mock_legal_scan.scan_document(data, seed=seed, clock=clock, **job["scan"])
+            lap("scan")
+        if not keep_data:
+            job["output_path"].write_bytes(data)
+            lap("write")
+    except Exception as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"}
+    finally:
+        DOCUMENT_SPANS = None
+    outcome = {"error": None, "sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data), "pages": pages}
+    if keep_data:
+        outcome["data"] = data
+    if spans is not None:
+        spans["document"] = time.perf_counter() - started
+        outcome["spans"] = spans
+    return outcome
+
+
+def run_jobs(
+    tasks: Iterable[tuple[dict[str, Any], dict[str, Any] | None]],
+    workers: int,
+    render: Callable[[dict[str, Any]], dict[str, Any]] = render_job,
+    prepare: Callable[[dict[str, Any]], None] | None = None,
+) -> Iterator[tuple[dict[str, Any], dict[str, Any], bool]]:
+    # Tasks are (job, cached outcome or None); cached jobs pass through in order without being rendered.
+    # With a pool, prepare(job) runs in this process before the job is submitted.
+    if workers <= 1:
+        for job, cached in tasks:
+            yield job, cached or render(job), cached is not None
+        return
+    # Results are yielded in submission order; the in-flight window keeps memory flat for large corpora.
+    window = workers * 4
+    with contextlib.ExitStack() as stack:
+        pool = None
+        pending: collections.deque = collections.deque()
+        for job, cached in tasks:
+            if pool is None and not cached:
+                # Started on the first cache miss, so fully cached runs never import or fork the pool.
+                from concurrent.futures import ProcessPoolExecutor
+
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            if prepare and not cached:
+                prepare(job)
+            pending.append((job, cached, None if cached else pool.submit(render, job)))
+            if len(pending) >= window:
+                job, cached, future = pending.popleft()
+                yield job, cached or future.result(), cached is not None
+        while pending:
+            job, cached, future = pending.popleft()
+            yield job, cached or future.result(), cached is not None
+
+
+def render_in_memory(
+    jobs: Iterable[dict[str, Any]], workers: int
+) -> Iterator[tuple[str, dict[str, Any], dict[str, Any]]]:
+    # Yields (entry name, job, outcome with the PDF under "data") in job order; nothing touches the file system.
+    render = functools.partial(render_job, keep_data=True)
+    for job, outcome, _ in run_jobs(((job, None) for job in jobs), workers, render, preload_fonts):
+        yield job["output_path"].as_posix(), job, outcome
+
+
+def render_to_bytes(
+    fixture: dict[str, str],
+    run_tag: str,
+    recipient_name: str = DEFAULT_RECIPIENT_NAME,
+    recipient_address: str = DEFAULT_RECIPIENT_ADDRESS,
+    issue_date: dt.date | None = None,
+    reproducible: bool = False,
+) -> bytes:
+    fixture = validate_fixture(fixture)
+    issue_date = issue_date or reproducible_date(run_tag, reproducible)
+    data, _ = render_document(
+        fixture, run_tag, issue_date, recipient_name, recipient_address, reproducible=reproducible
+    )
+    return data
+
+
+def reproducible_date(run_tag: str, reproducible: bool) -> dt.date:
+    date = run_tag_date(run_tag)
+    if reproducible and date is None:
+        raise ValueError("reproducible output needs an explicit issue date or a run tag with a YYYYMMDD date")
+    return date or dt.date.today()
+
+
+def render_many(
+    fixtures: Iterable[dict[str, str]],
+    run_tag: str,
+    recipient_name: str = DEFAULT_RECIPIENT_NAME,
+    recipient_address: str = DEFAULT_RECIPIENT_ADDRESS,
+    variants: int = 1,
+    total_docs: int | None = None,
+    seed: str | None = None,
+    jobs: int = 1,
+    size_profile: str = "default",
+    size_target: str | None = None,
+    issue_date: dt.date | None = None,
+    reproducible: bool = False,
+) -> Iterator[tuple[dict[str, Any], bytes]]:
+    # Yields (manifest record, PDF bytes) in corpus order, with the same variant expansion as the CLI.
+    distribution = parse_size_distribution(size_target) if size_target else None
+    rows = [(index, validate_fixture(row)) for index, row in enumerate(fixtures)]
+    base = {
+        "run_tag": run_tag,
+        "issue_date": issue_date or reproducible_date(run_tag, reproducible),
+        "recipient_name": recipient_name,
+        "recipient_address": recipient_address,
+    }
+    if reproducible:
+        base["reproducible"] = True
+    planned = expand_jobs(rows, base, Path(), variants, total_docs, seed or run_tag)
+    if size_profile != "default" or distribution:
+        planned = (size_job(job, size_profile, distribution, seed or run_tag) for job in planned)
+    for name, job, outcome in render_in_memory(planned, jobs):
+        if outcome["error"]:
+            raise RuntimeError(f"{name}: {outcome['error']}")
+        data = outcome.pop("data")
+        yield manifest_record(job["slot"], name, job, outcome), data
+
+
+def main() -> int:
+    if sys.argv[1:2] == ["merge"]:
+        return merge_main(sys.argv[2:])
+    if sys.argv[1:2] == ["verify"]:
+        import mock_legal_verify
+
+        return mock_legal_verify.main(sys.argv[2:])
+    if sys.argv[1:2] == ["mail-packets"]:
+        import mock_legal_mail_packets
+
+        return mock_legal_mail_packets.main(sys.argv[2:])
+    with timed("parse arguments"):
+        args = parse_args()
+    metrics = mock_legal_metrics.RunMetrics() if args.profile else None
+    profiler = None
+    if args.profile_stats:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        return run(args, metrics)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile_stats)
+        if metrics:
+            metrics.write(Path(args.profile).resolve(), TIMINGS)
+        if args.timing:
+            report_timings()
+
+
+def run(args: argparse.Namespace, metrics: mock_legal_metrics.RunMetrics | None = None) -> int:
+    fixtures = FixtureSource(Path(args.fixtures).resolve())
+    if args.validate:
+        with timed("validate fixtures"):
+            valid = sum(1 for _ in fixtures)
+        print(f"{valid} valid fixture row(s), {fixtures.errors} invalid.")
+        return 1 if fixtures.errors else 0
+    if args.watch:
+        return watch(args, fixtures, metrics)
+    return build(args, fixtures, metrics)
+
+
+def build(
+    args: argparse.Namespace, fixtures: FixtureSource, metrics: mock_legal_metrics.RunMetrics | None = None
+) -> int:
+    run_tag = args.run_tag.strip()
+    base = {
+        "run_tag": run_tag,
+        "issue_date": args.issue_date or run_date(run_tag),
+        "recipient_name": args.recipient_name.strip() or DEFAULT_RECIPIENT_NAME,
+        "recipient_address": args.recipient_address.strip() or DEFAULT_RECIPIENT_ADDRESS,
+    }
+    if args.reproducible:
+        base["reproducible"] = True
+    if args.out_archive or args.out_stream:
+        # Entries are named relative to the archive root; nothing is written under an output directory.
+        out_dir = Path()
+    else:
+        out_dir = Path(args.out_dir).resolve()
+        out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = expand_jobs(
+        fixtures,
+        base,
+        out_dir,
+        variants=args.variants_per_fixture,
+        total_docs=args.total_docs,
+        seed=args.variant_seed or run_tag,
+    )
+    if args.shard:
+        jobs = shard_jobs(jobs, *args.shard)
+    if args.scan:
+        jobs = (scan_job(job, args.scan, args.scan_profile, args.scan_dpi) for job in jobs)
+    if args.size_profile != "default" or args.size_distribution:
+        seed = args.variant_seed or run_tag
+        jobs = (size_job(job, args.size_profile, args.size_distribution, seed) for job in jobs)
+    if metrics:
+        jobs = ({**job, "profiled": True} for job in jobs)
+    workers = args.jobs if args.total_docs is None else min(args.jobs, args.total_docs)
+    if args.out_stream:
+        return write_sink(args, fixtures, jobs, StreamSink(), workers, metrics)
+    if args.out_archive:
+        archive_path = Path(args.out_archive).resolve()
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        sink = ArchiveSink(archive_path, base["issue_date"])
+        return write_sink(args, fixtures, jobs, sink, workers, metrics)
+
+    with timed("load build cache"):
+        # Shards may share an output directory, so each keeps its own cache manifest.
+        cache_name = CACHE_MANIFEST
+        if args.shard:
+            cache_name = CACHE_MANIFEST.replace(".json", ".shard-{}-of-{}.json".format(*args.shard))
+        cache = BuildCache(out_dir, force=args.force, name=cache_name)
+    failures = 0
+    total = 0
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(timed("plan, render and write"))
+        manifest = None
+        if args.manifest:
+            manifest_path = Path(args.manifest).resolve()
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            manifest = stack.enter_context(manifest_path.open("wb"))
+        for job, outcome, cached in run_jobs(map(cache.lookup, jobs), workers, prepare=preload_fonts):
+            target = job["output_path"]
+            total += 1
+            if not cached:
+                cache.record(job, outcome)
+            if metrics:
+                metrics.add(outcome, cached)
+            if outcome.get("error"):
+                failures += 1
+                print(f"failed {target}: {outcome['error']}", file=sys.stderr)
+                continue
+            if not (cached and args.watch):
+                print(f"{'unchanged' if cached else 'generated'} {target}")
+            if manifest:
+                manifest.write(manifest_line(manifest_record(job["slot"], cache.name(job), job, outcome)))
+    # A row that failed validation is not an orphan; keep its previous output until it is fixed.
+    with timed("prune and save build cache"):
+        pruned = cache.prune() if not fixtures.errors else 0
+        cache.save()
+    print(f"cache: {cache.hits} unchanged, {cache.misses} rendered, {pruned} pruned")
+    return report_failures(fixtures, failures, total)
+
+
+def watch(
+    args: argparse.Namespace, fixtures: FixtureSource, metrics: mock_legal_metrics.RunMetrics | None = None
+) -> int:
+    # Builds, then rebuilds through the build cache on every save of the fixture file or this module, so only
+    # documents whose render inputs changed are re-rendered. Module edits are picked up by reloading it in place:
+    # reportlab, its fonts and the pool-free render path stay warm, and later builds run in this process unless
+    # the edit touched generator code, which invalidates every document.
+    module = sys.modules[__name__]
+    paths = [fixtures.path, Path(module.__file__).resolve()]
+    if args.scan:
+        paths.append(Path(mock_legal_scan.__file__).resolve())
+    status = build(args, fixtures, metrics)
+    warm = argparse.Namespace(**{**vars(args), "jobs": 1})
+    stamps = watch_stamps(paths)
+    layout = layout_state()
+    print(f"watching {', '.join(path.name for path in paths)} for changes (Ctrl-C to stop)", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = watch_stamps(paths)
+            if current == stamps:
+                continue
+            time.sleep(WATCH_SETTLE)
+            current = watch_stamps(paths)
+            started = time.perf_counter()
+            changes = ["fixtures"] if current[0] != stamps[0] else []
+            if current[1] != stamps[1]:
+                try:
+                    importlib.reload(module)
+                except Exception as exc:
+                    stamps = current
+                    print(f"watch: not reloading {paths[1].name}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                    continue
+                reloaded = layout_state()
+                changes += layout_changes(layout, reloaded)
+                layout = reloaded
+            if current[2:] != stamps[2:]:
+                before = scan_version()
+                try:
+                    importlib.reload(mock_legal_scan)
+                except Exception as exc:
+                    stamps = current
+                    print(f"watch: not reloading {paths[2].name}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                    continue
+                scan_version.cache_clear()
+                if scan_version() != before:
+                    changes.append("scan code")
+            stamps = current
+            if not changes:
+                continue
+            print(f"watch: {', '.join(changes)} changed", file=sys.stderr)
+            full = "generator code" in changes or "scan code" in changes
+            status = build(args if full else warm, FixtureSource(paths[0]), metrics)
+            print(f"watch: rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+    except KeyboardInterrupt:
+        return status
+
+
+def watch_stamps(paths: list[Path]) -> list[tuple[int, int] | None]:
+    stamps = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stamps.append(None)
+            continue
+        stamps.append((stat.st_mtime_ns, stat.st_size))
+    return stamps
+
+
+def layout_state() -> dict[str, Any]:
+    return {
+        "code": generator_version(),
+        "category": layout_digest(DOC_CATEGORY),
+        "profile": {category: layout_digest(profile) for category, profile in PROFILE.items()},
+        "template": {name: layout_digest(template) for name, template in TEMPLATES.items()},
+    }
+
+
+def layout_changes(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
+    # What an edit to this module touched, most general first; the build cache works out the documents.
+    if before["code"] != after["code"]:
+        return ["generator code"]
+    changes = ["DOC_CATEGORY"] if before["category"] != after["category"] else []
+    for kind, label in (("profile", "PROFILE"), ("template", "TEMPLATES")):
+        names = sorted(set(before[kind]) | set(after[kind]))
+        changes += [f"{label}[{name!r}]" for name in names if before[kind].get(name) != after[kind].get(name)]
+    return changes
+
+
+def write_sink(
+    args: argparse.Namespace,
+    fixtures: FixtureSource,
+    jobs: Iterable[dict[str, Any]],
+    sink: ArchiveSink | StreamSink,
+    workers: int,
+    metrics: mock_legal_metrics.RunMetrics | None = None,
+) -> int:
+    # Progress goes to stderr when stdout carries the documents themselves.
+    log = sys.stderr if args.out_stream else sys.stdout
+    failures = 0
+    total = 0
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(timed("plan, render and write"))
+        stack.enter_context(sink)
+        copy = None
+        if args.manifest:
+            manifest_path = Path(args.manifest).resolve()
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            copy = stack.enter_context(manifest_path.open("wb"))
+        for name, job, outcome in render_in_memory(jobs, workers):
+            total += 1
+            if metrics:
+                metrics.add(outcome, cached=False)
+            if outcome["error"]:
+                failures += 1
+                print(f"failed {name}: {outcome['error']}", file=sys.stderr)
+                continue
+            data = outcome.pop("data")
+            record = manifest_record(job["slot"], name, job, outcome)
+            started = time.perf_counter()
+            sink.add(name, data, record)
+            if metrics:
+                metrics.span("write", time.perf_counter() - started)
+            print(f"{sink.verb} {name}", file=log)
+            if copy:
+                copy.write(manifest_line(record))
+    print(sink.summary(), file=log)
+    return report_failures(fixtures, failures, total)
+
+
+def parse_shard(label: object) -> tuple[int, int] | None:
+    match = re.fullmatch(r"(\d+)/(\d+)", label) if isinstance(label, str) else None
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def merge_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="generate-realistic-mock-legal-cases.py merge",
+        description="Join the --manifest files of --shard runs in index order and check that every corpus slot "
+        "appears exactly once.",
+    )
+    parser.add_argument("manifests", nargs="+", help="One JSONL manifest per shard.")
+    parser.add_argument("--out", help="Write the merged manifest here instead of stdout.")
+    parser.add_argument(
+        "--expect-docs", type=int, help="Documents in the whole corpus, so missing slots at the end are caught too."
+    )
+    args = parser.parse_args(argv)
+    paths = [Path(name).resolve() for name in args.manifests]
+    if args.out:
+        out_path = Path(args.out).resolve()
+        tmp = out_path.with_name(out_path.name + ".tmp")
+        with tmp.open("wb") as out:
+            merged, problems = merge_manifests(paths, out, args.expect_docs)
+        if problems:
+            tmp.unlink()
+        else:
+            os.replace(tmp, out_path)
+    else:
+        merged, problems = merge_manifests(paths, sys.stdout.buffer, args.expect_docs)
+    for problem in problems[:MERGE_PROBLEMS_SHOWN]:
+        print(problem, file=sys.stderr)
+    if len(problems) > MERGE_PROBLEMS_SHOWN:
+        print(f"... and {len(problems) - MERGE_PROBLEMS_SHOWN} more problem(s)", file=sys.stderr)
+    print(f"merged {merged} record(s) from {len(paths)} manifest(s), {len(problems)} problem(s)", file=sys.stderr)
+    return 1 if problems else 0
+
+
+def merge_manifests(paths: list[Path], out: IO[bytes], expect_docs: int | None) -> tuple[int, list[str]]:
+    # Shard manifests are each in index order, so a k-way merge joins them with flat memory, and gaps or
+    # repeats in the merged index sequence are exactly the missing and duplicated slots.
+    problems: list[str] = []
+    shards: dict[tuple[int, int], Path] = {}
+    counts: set[int] = set()
+
+    def records(path: Path) -> Iterator[tuple[int, str, bytes]]:
+        previous = -1
+        label = None
+        with path.open("rb") as handle:
+            for number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    index = int(record["index"])
+                except (ValueError, TypeError, KeyError):
+                    problems.append(f"{path}:{number}: not a manifest record")
+                    continue
+                shard = record.get("shard")
+                if label is None:
+                    label = shard or "1/1"
+                    parsed = parse_shard(label)
+                    if parsed is None:
+                        # Without a usable label there is no way to check this manifest's slots; its records
+                        # are left out, so they also show up as missing indexes.
+                        problems.append(f"{path}:{number}: shard {label!r} is not I/N with 1 <= I <= N")
+                        return
+                    if parsed in shards:
+                        problems.append(f"{path}: shard {label} is also in {shards[parsed]}")
+                    shards[parsed] = path
+                    position, count = parsed
+                    counts.add(count)
+                if (shard or "1/1") != label:
+                    problems.append(f"{path}:{number}: shard {shard} in a manifest of shard {label}")
+                if index % count != position - 1:
+                    problems.append(f"{path}:{number}: index {index} does not belong to shard {label}")
+                if index <= previous:
+                    problems.append(f"{path}:{number}: index {index} is out of order")
+                previous = index
+                yield index, path.name, line if line.endswith(b"\n") else line + b"\n"
+
+    merged = 0
+    expected = 0
+    last: tuple[int, str] | None = None
+    for index, name, line in heapq.merge(*map(records, paths)):
+        if last and index == last[0]:
+            problems.append(f"duplicate index {index} in {last[1]} and {name}")
+            continue
+        if index > expected:
+            problems.append(f"missing index {expected}" + (f"-{index - 1}" if index - 1 > expected else ""))
+        out.write(line)
+        merged += 1
+        expected = index + 1
+        last = (index, name)
+    if expect_docs is not None and expected < expect_docs:
+        problems.append(f"missing index {expected}" + (f"-{expect_docs - 1}" if expect_docs - 1 > expected else ""))
+    if len(counts) > 1:
+        problems.append(f"manifests come from different shard counts: {sorted(counts)}")
+    elif counts:
+        [count] = counts
+        absent = sorted(set(range(1, count + 1)) - {position for position, _ in shards})
+        if absent:
+            problems.append(f"no manifest for shard(s) {', '.join(f'{i}/{count}' for i in absent)}")
+    return merged, problems
+
+
+def report_failures(fixtures: FixtureSource, failures: int, total: int) -> int:
+    if fixtures.errors:
+        print(f"{fixtures.errors} fixture row(s) were invalid and skipped.", file=sys.stderr)
+    if failures:
+        print(f"{failures} of {total} document(s) failed to render.", file=sys.stderr)
+    return 1 if failures or fixtures.errors else 0
+
+
+MODULE_CPU = time.process_time()
+
+if __name__ == "__main__":
+    raise SystemExit(main())
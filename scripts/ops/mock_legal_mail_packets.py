@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import argparse
+import collections
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+import mock_legal_generator as gen
+import mock_legal_metrics
+
+# Mail packets for the mock legal generator's mail-packets subcommand: already generated PDFs joined into one
+# upload the way a scanned envelope stack arrives. Nothing is re-rendered; each document's objects are copied
+# byte for byte under new object numbers, its pages are appended to one flat page tree and it gets one outline
+# entry. Only classic cross-reference tables are read (reportlab and Pillow both write them).
+REFERENCE = re.compile(rb"(\d+)\s+(\d+)\s+R\b")
+OBJECT_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+STREAM_START = re.compile(rb">>\s*stream\r?\n")
+STARTXREF = re.compile(rb"startxref\s+(\d+)\s+%%EOF\s*$")
+TYPE_PAGES = re.compile(rb"/Type\s*/Pages\b")
+INHERITED = re.compile(rb"/(?:Resources|MediaBox|CropBox|Rotate)\b")
+KIDS = re.compile(rb"/Kids\s*\[([^\]]*)\]")
+# Object numbers the writer reserves for the packet's own catalog, page tree and outline root.
+CATALOG, PAGE_TREE, OUTLINES = 1, 2, 3
+PRODUCER = "ClearCase QA Mail Packet Assembler"
+# Failed packets printed by main(); the rest are only counted.
+FAILURES_SHOWN = 20
+# Most notices in one packet, and packet file names by notices per packet and packet number.
+MAX_MAIL_PACKET_NOTICES = 10000
+MAIL_PACKET_NAME = "mail-packet-k{notices:04d}-{number:04d}.pdf"
+# Build manifest fields repeated for each notice in a packet's manifest record, next to its page range.
+MAIL_PACKET_FIELDS = ("fileName", "category", "documentType", "caseNumber", "noticeNumber")
+
+
+class PacketError(ValueError):
+    pass
+
+
+def pdf_objects(data: bytes) -> tuple[dict[int, bytes], bytes]:
+    # Every in-use object's body (between "obj" and "endobj") by object number, and the trailer dictionary.
+    found = STARTXREF.search(data, max(len(data) - 1024, 0))
+    if not found:
+        raise PacketError("no startxref at the end of the file")
+    xref_at = int(found.group(1))
+    if data[xref_at : xref_at + 4] != b"xref":
+        raise PacketError("cross-reference streams are not supported")
+    trailer_at = data.find(b"trailer", xref_at)
+    if trailer_at < 0:
+        raise PacketError("no trailer")
+    trailer = data[trailer_at + 7 : found.start()]
+    if b"/Prev" in trailer:
+        raise PacketError("incrementally updated PDFs are not supported")
+    tokens = data[xref_at + 4 : trailer_at].split()
+    offsets = {}
+    at = 0
+    try:
+        while at < len(tokens):
+            first, count = int(tokens[at]), int(tokens[at + 1])
+            at += 2
+            for number in range(first, first + count):
+                offset, _, kind = tokens[at : at + 3]
+                at += 3
+                if kind == b"n":
+                    offsets[number] = int(offset)
+    except (ValueError, IndexError):
+        raise PacketError("malformed cross-reference table") from None
+    # An object ends at the last "endobj" before the next object (or the xref table) starts.
+    bounds = sorted({*offsets.values(), xref_at})
+    following = dict(zip(bounds, bounds[1:]))
+    objects = {}
+    for number, offset in offsets.items():
+        header = OBJECT_HEADER.match(data, offset)
+        end = data.rfind(b"endobj", offset, following[offset])
+        if not header or int(header.group(1)) != number or end < 0:
+            raise PacketError(f"object {number} is not where the cross-reference table says")
+        objects[number] = data[header.end() : end]
+    return objects, trailer
+
+
+def page_tree(objects: dict[int, bytes], trailer: bytes) -> tuple[list[int], set[int]]:
+    # The page objects in order, and the page tree nodes above them (replaced by the packet's own tree).
+    root = reference(trailer, b"/Root")
+    pages, nodes = [], set()
+    stack = [reference(objects.get(root, b""), b"/Pages")]
+    while stack:
+        number = stack.pop()
+        body = objects.get(number)
+        if body is None:
+            raise PacketError(f"page tree object {number} is missing")
+        if not TYPE_PAGES.search(body):
+            pages.append(number)
+            continue
+        if INHERITED.search(KIDS.sub(b"", body)):
+            raise PacketError("page trees with inherited page attributes are not supported")
+        nodes.add(number)
+        kids = KIDS.search(body)
+        stack.extend(reversed([int(kid) for kid, _ in REFERENCE.findall(kids.group(1) if kids else b"")]))
+    if not pages:
+        raise PacketError("no pages")
+    return pages, nodes
+
+
+def reference(body: bytes, key: bytes) -> int:
+    found = re.search(re.escape(key) + rb"\s+(\d+)\s+\d+\s+R", body)
+    if not found:
+        raise PacketError(f"no {key.decode()} reference")
+    return int(found.group(1))
+
+
+def text_string(text: str) -> bytes:
+    # UTF-16BE with a byte order mark, so outline titles in any script survive.
+    return b"<FEFF" + text.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+class PacketWriter:
+    # Streams one packet PDF: add() copies a document's objects out as soon as it is read, so only object
+    # offsets and page numbers are held while the packet grows.
+
+    def __init__(self, out: IO[bytes]) -> None:
+        self.out = out
+        self.position = 0
+        self.digest = hashlib.sha256()
+        self.offsets: dict[int, int] = {}
+        self.next_number = OUTLINES + 1
+        self.pages: list[int] = []
+        self.bookmarks: list[tuple[str, int]] = []
+        self.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def write(self, data: bytes) -> None:
+        self.out.write(data)
+        self.digest.update(data)
+        self.position += len(data)
+
+    def write_object(self, number: int, body: bytes) -> None:
+        self.offsets[number] = self.position
+        self.write(b"%d 0 obj\n%s\nendobj\n" % (number, body.strip()))
+
+    def add(self, data: bytes, title: str) -> tuple[int, int]:
+        # Returns the document's first and last page in the packet (1-based).
+        objects, trailer = pdf_objects(data)
+        pages, nodes = page_tree(objects, trailer)
+        dropped = {reference(trailer, b"/Root"), *nodes}
+        info = re.search(rb"/Info\s+(\d+)\s+\d+\s+R", trailer)
+        if info:
+            dropped.add(int(info.group(1)))
+        renumbered = {}
+        for number in sorted(set(objects) - dropped):
+            renumbered[number] = self.next_number
+            self.next_number += 1
+        # The old catalog and page tree nodes become the packet's; anything else that is gone becomes null.
+        targets = dict.fromkeys(nodes, b"%d 0 R" % PAGE_TREE)
+        targets.update((number, b"%d 0 R" % new) for number, new in renumbered.items())
+
+        def renumber(match: re.Match) -> bytes:
+            return targets.get(int(match.group(1)), b"null")
+
+        for number, new in renumbered.items():
+            body = objects[number]
+            stream = STREAM_START.search(body)
+            head, tail = (body[: stream.end()], body[stream.end() :]) if stream else (body, b"")
+            self.offsets[new] = self.position
+            self.write(b"%d 0 obj\n%s%s\nendobj\n" % (new, REFERENCE.sub(renumber, head).lstrip(), tail.rstrip()))
+        first = len(self.pages) + 1
+        self.pages.extend(renumbered[page] for page in pages)
+        self.bookmarks.append((title, renumbered[pages[0]]))
+        return first, len(self.pages)
+
+    def close(self, title: str) -> None:
+        # Outline items, then the outline root, page tree, catalog and info, then the cross-reference table.
+        first = self.next_number
+        count = len(self.bookmarks)
+        for index, (label, page) in enumerate(self.bookmarks):
+            links = [b"/Title " + text_string(label), b"/Parent %d 0 R" % OUTLINES, b"/Dest [ %d 0 R /Fit ]" % page]
+            if index:
+                links.append(b"/Prev %d 0 R" % (first + index - 1))
+            if index < count - 1:
+                links.append(b"/Next %d 0 R" % (first + index + 1))
+            self.write_object(first + index, b"<< " + b" ".join(links) + b" >>")
+        outline = b"<< /Type /Outlines /Count %d" % count
+        if count:
+            outline += b" /First %d 0 R /Last %d 0 R" % (first, first + count - 1)
+        self.write_object(OUTLINES, outline + b" >>")
+        kids = b" ".join(b"%d 0 R" % page for page in self.pages)
+        self.write_object(PAGE_TREE, b"<< /Type /Pages /Count %d /Kids [ %s ] >>" % (len(self.pages), kids))
+        catalog = b"<< /Type /Catalog /Pages %d 0 R /Outlines %d 0 R /PageMode /UseOutlines >>"
+        self.write_object(CATALOG, catalog % (PAGE_TREE, OUTLINES))
+        info = first + count
+        self.write_object(info, b"<< /Producer %s /Title %s >>" % (text_string(PRODUCER), text_string(title)))
+        xref_at = self.position
+        size = info + 1
+        self.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        self.write(b"".join(b"%010d 00000 n \n" % self.offsets[number] for number in range(1, size)))
+        self.write(b"trailer\n<< /Info %d 0 R /Root %d 0 R /Size %d >>\n" % (info, CATALOG, size))
+        self.write(b"startxref\n%d\n%%%%EOF\n" % xref_at)
+
+
+def assemble_packet(item: dict[str, Any]) -> dict[str, Any]:
+    # item holds the packet "name", its output "path" and its "notices": source "path", outline "title" and
+    # the manifest's "sha256" for each. Returns each notice's page range; the packet is only written whole.
+    started = time.perf_counter()
+    path = Path(item["path"])
+    tmp = path.with_name(path.name + ".tmp")
+    ranges = []
+    try:
+        with tmp.open("wb") as out:
+            writer = PacketWriter(out)
+            for notice in item["notices"]:
+                source = Path(notice["path"])
+                try:
+                    data = source.read_bytes()
+                    if notice.get("sha256") and hashlib.sha256(data).hexdigest() != notice["sha256"]:
+                        raise PacketError("changed since the manifest was written")
+                    ranges.append(writer.add(data, notice["title"]))
+                except (OSError, PacketError) as exc:
+                    raise PacketError(f"{source.name}: {getattr(exc, 'strerror', None) or exc}") from None
+            writer.close(item["name"])
+        os.replace(tmp, path)
+    except (OSError, PacketError) as exc:
+        tmp.unlink(missing_ok=True)
+        return {"error": str(exc)}
+    return {
+        "error": None,
+        "pages": len(writer.pages),
+        "bytes": writer.position,
+        "sha256": writer.digest.hexdigest(),
+        "ranges": ranges,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="generate-realistic-mock-legal-cases.py mail-packets",
+        description="Join already generated notices into multi-notice PDFs, like a scanned envelope stack uploaded "
+        "at once: one outline bookmark per notice and a manifest of each notice's page range. Documents are "
+        "copied, not re-rendered.",
+    )
+    parser.add_argument("target", help="The --out-dir of a build.")
+    parser.add_argument("--manifest", required=True, help="That build's --manifest file.")
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument(
+        "--notices", default="10", help="Notices per packet; a list such as 1,10,100 makes packets of each size."
+    )
+    parser.add_argument("--packets", type=int, default=1, help="Packets of each size.")
+    parser.add_argument(
+        "--mix",
+        help="Category weights such as court=3,housing=1,receipt=1. Defaults to the mix of the build itself. "
+        "Notices of a category are used in manifest order and repeat only once all have been used.",
+    )
+    parser.add_argument("--seed", default="mail-packets", help="Seed for drawing categories from --mix.")
+    parser.add_argument(
+        "--packet-manifest", help="JSONL record per packet with its notices' page ranges (default: manifest.jsonl "
+        "in --out-dir)."
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--report", help="Write assembly latency and packet sizes per notice count here (JSON).")
+    args = parser.parse_args(argv)
+    if args.jobs < 1 or args.packets < 1:
+        parser.error("--jobs and --packets must be at least 1.")
+    try:
+        sizes = parse_notice_counts(args.notices)
+        mix = parse_mix(args.mix) if args.mix else None
+    except ValueError as exc:
+        parser.error(str(exc))
+    target = Path(args.target).resolve()
+    if not target.is_dir():
+        parser.error(f"{target} is not a directory; mail packets are built from an --out-dir.")
+    build_manifest = Path(args.manifest).resolve()
+    if not build_manifest.is_file():
+        parser.error(f"--manifest {build_manifest} is not a file.")
+    pool: dict[str, list[dict[str, Any]]] = {}
+    for number, line in enumerate(build_manifest.read_bytes().splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            name, category = record["fileName"], record["category"]
+        except (ValueError, TypeError, KeyError):
+            name = category = None
+        if not isinstance(name, str) or not isinstance(category, str):
+            parser.error(f"{build_manifest}:{number}: not a manifest record with a fileName and a category.")
+        if name.lower().endswith(".pdf"):
+            pool.setdefault(category, []).append(record)
+    if not pool:
+        parser.error("the manifest lists no PDF documents.")
+    if mix is None:
+        mix = {category: len(records) for category, records in sorted(pool.items())}
+    absent = sorted(category for category, weight in mix.items() if weight and category not in pool)
+    if absent:
+        parser.error(f"--mix names categories the build has no PDF documents for: {', '.join(absent)}")
+    out_dir = Path(args.out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = Path(args.packet_manifest).resolve() if args.packet_manifest else out_dir / gen.ARCHIVE_MANIFEST
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+
+    items = plan_mail_packets(pool, target, out_dir, sizes, args.packets, mix, args.seed)
+    latency = {notices: mock_legal_metrics.Histogram() for notices in sizes}
+    totals = {notices: collections.Counter() for notices in sizes}
+    failures = 0
+    started = time.perf_counter()
+    with manifest_path.open("wb") as manifest:
+        packets = gen.run_jobs(((item, None) for item in items), args.jobs, assemble_packet)
+        for index, (item, outcome, _) in enumerate(packets):
+            if outcome["error"]:
+                failures += 1
+                if failures <= FAILURES_SHOWN:
+                    print(f"failed {item['name']}: {outcome['error']}", file=sys.stderr)
+                continue
+            count = len(item["notices"])
+            latency[count].add(outcome["seconds"])
+            totals[count].update(packets=1, pages=outcome["pages"], bytes=outcome["bytes"])
+            manifest.write(gen.manifest_line(mail_packet_record(index, item, outcome)))
+    elapsed = time.perf_counter() - started
+    if failures > FAILURES_SHOWN:
+        print(f"... and {failures - FAILURES_SHOWN} more failed packet(s)", file=sys.stderr)
+    report = {"target": str(target), "jobs": args.jobs, "seconds": round(elapsed, 3), "failed": failures, "sizes": {}}
+    for notices in sizes:
+        total = totals[notices]
+        if not total["packets"]:
+            continue
+        summary = {
+            "packets": total["packets"],
+            "pagesPerPacket": round(total["pages"] / total["packets"], 1),
+            "mbPerPacket": round(total["bytes"] / total["packets"] / (1 << 20), 3),
+            "assembly": latency[notices].summary(),
+        }
+        report["sizes"][str(notices)] = summary
+        print(
+            f"{notices} notice(s): {summary['packets']} packet(s), {summary['pagesPerPacket']} pages and "
+            f"{summary['mbPerPacket']} MB each, assembled in p50 {summary['assembly']['p50Ms']} ms "
+            f"(max {summary['assembly']['maxMs']} ms)"
+        )
+    if args.report:
+        report_path = Path(args.report).resolve()
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"wrote {sum(total['packets'] for total in totals.values())} packet(s) to {out_dir} in {elapsed:.2f}s")
+    return 1 if failures else 0
+
+
+def parse_notice_counts(spec: str) -> list[int]:
+    try:
+        counts = [int(value) for value in spec.split(",")]
+    except ValueError:
+        counts = []
+    if not counts or not all(1 <= count <= MAX_MAIL_PACKET_NOTICES for count in counts):
+        raise ValueError(f"--notices must be a comma-separated list of counts from 1 to {MAX_MAIL_PACKET_NOTICES}")
+    return sorted(set(counts))
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    categories = {*gen.DOC_CATEGORY.values(), "general"}
+    mix = {}
+    for part in spec.split(","):
+        category, _, weight = part.partition("=")
+        category = category.strip()
+        if category not in categories:
+            raise ValueError(f"--mix: unknown category {category!r}; expected {', '.join(sorted(categories))}")
+        try:
+            mix[category] = float(weight or 1)
+        except ValueError:
+            mix[category] = -1.0
+        if not 0 <= mix[category] < math.inf:
+            raise ValueError(f"--mix: weight for {category} must be a non-negative number")
+    if not any(mix.values()):
+        raise ValueError("--mix needs at least one category with a positive weight")
+    return mix
+
+
+def plan_mail_packets(
+    pool: dict[str, list[dict[str, Any]]],
+    source: Path,
+    out_dir: Path,
+    sizes: list[int],
+    packets: int,
+    mix: dict[str, float],
+    seed: str,
+) -> Iterator[dict[str, Any]]:
+    # Categories are drawn by weight; within a category, notices rotate in manifest order across all packets.
+    rng = random.Random(seed)
+    categories = [category for category, weight in mix.items() if weight]
+    weights = [mix[category] for category in categories]
+    cursors = dict.fromkeys(categories, 0)
+    for notices in sizes:
+        for number in range(1, packets + 1):
+            chosen = []
+            for category in rng.choices(categories, weights, k=notices):
+                records = pool[category]
+                chosen.append(records[cursors[category] % len(records)])
+                cursors[category] += 1
+            name = MAIL_PACKET_NAME.format(notices=notices, number=number)
+            entries = [
+                {
+                    **{key: record[key] for key in MAIL_PACKET_FIELDS},
+                    "path": str(source / record["fileName"]),
+                    "title": f"{record['caseTitle']} ({record['noticeNumber']})",
+                    "sha256": record.get("sha256"),
+                }
+                for record in chosen
+            ]
+            yield {"name": name, "path": str(out_dir / name), "notices": entries}
+
+
+def mail_packet_record(index: int, item: dict[str, Any], outcome: dict[str, Any]) -> dict[str, Any]:
+    notices = [
+        {**{key: notice[key] for key in MAIL_PACKET_FIELDS}, "firstPage": first, "lastPage": last}
+        for notice, (first, last) in zip(item["notices"], outcome["ranges"])
+    ]
+    return {
+        "index": index,
+        "fileName": item["name"],
+        "notices": notices,
+        "pages": outcome["pages"],
+        "bytes": outcome["bytes"],
+        "sha256": outcome["sha256"],
+    }
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+# Aggregated --profile metrics for the mock legal generator. Samples go into log-spaced buckets
+# HISTOGRAM_GROWTH apart, so percentiles are within about 1% and memory stays flat however large the corpus.
+HISTOGRAM_GROWTH = 1.02
+QUANTILES = (0.5, 0.9, 0.99)
+METRIC_PREFIX = "mock_legal"
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        bucket = math.floor(math.log(max(value, 1e-9), HISTOGRAM_GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        # Upper edge of the bucket holding the q-th sample, capped at the largest sample seen.
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(HISTOGRAM_GROWTH ** (bucket + 1), self.max)
+        return self.max
+
+    def summary(self, unit: str = "Ms", scale: float = 1000, digits: int | None = 3) -> dict[str, float]:
+        summary = {"count": self.count, f"total{unit}": round(self.total * scale, digits)}
+        for q in QUANTILES:
+            summary[f"p{round(q * 100)}{unit}"] = round(self.quantile(q) * scale, digits)
+        summary[f"max{unit}"] = round(self.max * scale, digits)
+        return summary
+
+
+class RunMetrics:
+    # Per-document stage spans (from render_job outcomes) plus run-level stage totals and document counts.
+
+    def __init__(self) -> None:
+        self.stages: dict[str, Histogram] = {}
+        self.sizes = Histogram()
+        self.counts = {"rendered": 0, "cached": 0, "failed": 0}
+
+    def add(self, outcome: dict[str, Any], cached: bool) -> None:
+        if outcome.get("error"):
+            self.counts["failed"] += 1
+            return
+        self.counts["cached" if cached else "rendered"] += 1
+        self.sizes.add(outcome["bytes"])
+        for stage, seconds in (outcome.get("spans") or {}).items():
+            self.span(stage, seconds)
+
+    def span(self, stage: str, seconds: float) -> None:
+        self.stages.setdefault(stage, Histogram()).add(seconds)
+
+    def to_json(self, run_stages: dict[str, float]) -> dict[str, Any]:
+        return {
+            "documents": self.counts,
+            "stages": {stage: histogram.summary() for stage, histogram in sorted(self.stages.items())},
+            "sizes": self.sizes.summary("Bytes", 1, None),
+            "runMs": {stage: round(seconds * 1000, 3) for stage, seconds in run_stages.items()},
+        }
+
+    def to_prometheus(self, run_stages: dict[str, float]) -> str:
+        lines = [
+            f"# HELP {METRIC_PREFIX}_documents_total Documents in the run by outcome.",
+            f"# TYPE {METRIC_PREFIX}_documents_total counter",
+        ]
+        lines += [f'{METRIC_PREFIX}_documents_total{{outcome="{key}"}} {value}' for key, value in self.counts.items()]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_stage_seconds Per-document render stage duration.",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds summary",
+        ]
+        for stage, histogram in sorted(self.stages.items()):
+            label = f'stage="{stage}"'
+            for q in QUANTILES:
+                lines.append(f'{METRIC_PREFIX}_stage_seconds{{{label},quantile="{q}"}} {histogram.quantile(q):.6g}')
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_sum{{{label}}} {histogram.total:.6g}")
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_count{{{label}}} {histogram.count}")
+        lines += [
+            f"# HELP {METRIC_PREFIX}_document_bytes Size of each rendered or cached document.",
+            f"# TYPE {METRIC_PREFIX}_document_bytes summary",
+        ]
+        for q in QUANTILES:
+            lines.append(f'{METRIC_PREFIX}_document_bytes{{quantile="{q}"}} {round(self.sizes.quantile(q))}')
+        lines.append(f"{METRIC_PREFIX}_document_bytes_sum {round(self.sizes.total)}")
+        lines.append(f"{METRIC_PREFIX}_document_bytes_count {self.sizes.count}")
+        lines += [
+            f"# HELP {METRIC_PREFIX}_run_stage_seconds Wall time of each run-level stage.",
+            f"# TYPE {METRIC_PREFIX}_run_stage_seconds gauge",
+        ]
+        for stage, seconds in run_stages.items():
+            lines.append(f'{METRIC_PREFIX}_run_stage_seconds{{stage="{stage}"}} {seconds:.6g}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path, run_stages: dict[str, float]) -> None:
+        # .json gets the JSON summary; anything else (.prom, .txt) the Prometheus text exposition format.
+        if path.suffix.lower() == ".json":
+            text = json.dumps(self.to_json(run_stages), indent=2) + "\n"
+        else:
+            text = self.to_prometheus(run_stages)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import io
+import random
+import time
+from typing import IO, Any, Iterable, Iterator
+
+# Scanned-image output for the mock legal generator. numpy, Pillow and pypdfium2 are optional and only
+# imported while scanning, so vector-only runs never need them.
+SCAN_FORMATS = {"png": ".png", "jpeg": ".jpg", "pdf": ".pdf"}
+SCAN_DEPENDENCIES = {"numpy": "numpy", "PIL": "pillow", "pypdfium2": "pypdfium2"}
+# Pages degraded together. Scanned pages are encoded and written out batch by batch, so this bounds memory to
+# a few full-resolution float32 pages at a time whatever the page count.
+SCAN_BATCH_PAGES = 4
+SCAN_PRODUCER = b"ClearCase QA Mock Scanner"
+# --scan pdf object numbers: each page is an image, its content stream and the page, from IMAGE_OBJECTS on.
+IMAGE_OBJECTS = 4
+IMAGE_DICT = (
+    b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB /BitsPerComponent 8 "
+    b"/Filter /DCTDecode /Length %d >>"
+)
+
+# skew: max degrees either way; blur: box radius in px at 150 dpi; noise: sensor noise sigma (0-255 scale);
+# shadow: max darkening at the far edge of a lighting gradient; tint: warm paper cast; quality: JPEG quality;
+# background: what shows around a skewed page (scanner lid vs. table top).
+SCAN_PROFILES = {
+    "clean": {"skew": 0.4, "blur": 0, "noise": 2.5, "shadow": 0.0, "tint": 0.0, "quality": 90, "background": 255},
+    "office": {"skew": 1.5, "blur": 1, "noise": 6.0, "shadow": 0.12, "tint": 0.03, "quality": 78, "background": 245},
+    "phone": {"skew": 4.0, "blur": 2, "noise": 11.0, "shadow": 0.4, "tint": 0.07, "quality": 62, "background": 70},
+}
+
+
+def missing_dependencies() -> list[str]:
+    return [package for module, package in SCAN_DEPENDENCIES.items() if importlib.util.find_spec(module) is None]
+
+
+def scan_document(
+    pdf: bytes, fmt: str, profile: str, dpi: int, seed: str, clock: int | None = None
+) -> tuple[bytes, int]:
+    # Returns (encoded bytes, pages). png/jpeg hold the first page, like one phone photo of a notice;
+    # pdf is an image-only PDF of every page. clock (a Unix timestamp) replaces the wall clock in PDF metadata.
+    import pypdfium2
+
+    settings = SCAN_PROFILES[profile]
+    out = io.BytesIO()
+    document = pypdfium2.PdfDocument(pdf)
+    try:
+        count = len(document) if fmt == "pdf" else 1
+        pages = scanned_pages(document, count, settings, dpi, seed)
+        if fmt == "pdf":
+            write_image_pdf(out, pages, dpi, settings["quality"], time.time() if clock is None else clock)
+        elif fmt == "jpeg":
+            next(pages).save(out, "JPEG", quality=settings["quality"], dpi=(dpi, dpi))
+        else:
+            next(pages).save(out, "PNG", dpi=(dpi, dpi))
+    finally:
+        document.close()
+    return out.getvalue(), count
+
+
+def scanned_pages(document: Any, count: int, settings: dict[str, Any], dpi: int, seed: str) -> Iterator[Any]:
+    # Rendered, degraded and skewed PIL pages, one SCAN_BATCH_PAGES batch at a time.
+    import numpy as np
+    from PIL import Image
+
+    rng = random.Random(seed)
+    noise_rng = np.random.default_rng(int(hashlib.sha256(seed.encode("utf-8")).hexdigest()[:16], 16))
+    fill = (settings["background"],) * 3
+    for start in range(0, count, SCAN_BATCH_PAGES):
+        batch = np.stack(
+            [
+                document[index].render(scale=dpi / 72).to_numpy()[..., :3]
+                for index in range(start, min(start + SCAN_BATCH_PAGES, count))
+            ]
+        )
+        degraded = list(degrade(batch, settings, dpi, rng, noise_rng))
+        # Each page is dropped once handed on, so the next batch is built without this one still held.
+        del batch
+        while degraded:
+            angle = rng.uniform(-settings["skew"], settings["skew"])
+            yield Image.fromarray(degraded.pop(0), "RGB").rotate(angle, resample=Image.BILINEAR, fillcolor=fill)
+
+
+def write_image_pdf(out: IO[bytes], pages: Iterable[Any], dpi: int, quality: int, clock: float) -> int:
+    # An image-only PDF written as the pages arrive: each is JPEG-encoded and written out at once, so only
+    # object offsets are kept between pages. Returns the page count.
+    offsets: dict[int, int] = {}
+    base = out.tell()
+
+    def write_object(number: int, body: bytes, stream: bytes | None = None) -> None:
+        offsets[number] = out.tell() - base
+        out.write(b"%d 0 obj\n%s\n" % (number, body))
+        if stream is not None:
+            out.write(b"stream\n%s\nendstream\n" % stream)
+        out.write(b"endobj\n")
+
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    kids = []
+    for page in pages:
+        encoded = io.BytesIO()
+        page.save(encoded, "JPEG", quality=quality, dpi=(dpi, dpi))
+        jpeg = encoded.getvalue()
+        width, height = page.size
+        size = b"%.4f %.4f" % (width * 72 / dpi, height * 72 / dpi)
+        # Objects 1-3 are the catalog, page tree and info, written once every page is out.
+        image = IMAGE_OBJECTS + 3 * len(kids)
+        write_object(image, IMAGE_DICT % (width, height, len(jpeg)), jpeg)
+        content = b"q %s 0 0 %s 0 0 cm /Im0 Do Q" % tuple(size.split())
+        write_object(image + 1, b"<< /Length %d >>" % len(content), content)
+        resources = b"/Resources << /XObject << /Im0 %d 0 R >> >>" % image
+        page_dict = b"<< /Type /Page /Parent 2 0 R /MediaBox [ 0 0 %s ] %s /Contents %d 0 R >>"
+        write_object(image + 2, page_dict % (size, resources, image + 1))
+        kids.append(image + 2)
+    stamp = time.strftime("D:%Y%m%d%H%M%SZ", time.gmtime(clock)).encode("ascii")
+    write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    pages_tree = b" ".join(b"%d 0 R" % kid for kid in kids)
+    write_object(2, b"<< /Type /Pages /Count %d /Kids [ %s ] >>" % (len(kids), pages_tree))
+    write_object(3, b"<< /Producer (%s) /CreationDate (%s) /ModDate (%s) >>" % (SCAN_PRODUCER, stamp, stamp))
+    xref_at = out.tell() - base
+    size = max(offsets) + 1
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    out.write(b"".join(b"%010d 00000 n \n" % offsets[number] for number in range(1, size)))
+    out.write(b"trailer\n<< /Info 3 0 R /Root 1 0 R /Size %d >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_at))
+    return len(kids)
+
+
+def degrade(batch: Any, settings: dict[str, Any], dpi: int, rng: random.Random, noise_rng: Any) -> Any:
+    # Photometric scan artifacts applied to a whole (pages, height, width, 3) uint8 batch at once.
+    import numpy as np
+
+    pages, height, width, _ = batch.shape
+    img = batch.astype(np.float32)
+
+    radius = round(settings["blur"] * dpi / 150)
+    if radius:
+        img = box_blur(box_blur(img, radius, axis=1), radius, axis=2)
+
+    if settings["tint"]:
+        t = settings["tint"]
+        img *= np.array([1.0, 1.0 - t * 0.4, 1.0 - t], dtype=np.float32)
+
+    if settings["shadow"]:
+        # A linear lighting gradient per page, each with its own direction and strength.
+        angles = np.array([rng.uniform(0, 2 * np.pi) for _ in range(pages)], dtype=np.float32)
+        strength = np.array([rng.uniform(0.3, 1.0) for _ in range(pages)], dtype=np.float32) * settings["shadow"]
+        ys = np.linspace(-0.5, 0.5, height, dtype=np.float32)[None, :, None]
+        xs = np.linspace(-0.5, 0.5, width, dtype=np.float32)[None, None, :]
+        ramp = np.cos(angles)[:, None, None] * xs + np.sin(angles)[:, None, None] * ys + 0.5
+        img *= (1.0 - strength[:, None, None] * np.clip(ramp, 0.0, 1.0))[..., None]
+
+    if settings["noise"]:
+        img += noise_rng.standard_normal(size=(pages, height, width, 1), dtype=np.float32) * settings["noise"]
+
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def box_blur(img: Any, radius: int, axis: int) -> Any:
+    # Running-sum box filter along one axis; edges are padded by repetition.
+    import numpy as np
+
+    size = 2 * radius + 1
+    pad = [(0, 0)] * img.ndim
+    pad[axis] = (radius + 1, radius)
+    summed = np.cumsum(np.pad(img, pad, mode="edge"), axis=axis, dtype=np.float32)
+    upper = [slice(None)] * img.ndim
+    lower = [slice(None)] * img.ndim
+    upper[axis] = slice(size, None)
+    lower[axis] = slice(0, -size)
+    return (summed[tuple(upper)] - summed[tuple(lower)]) / size
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import argparse
+import collections
+import contextlib
+import datetime as dt
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+import mock_legal_generator as gen
+
+# Post-generation checks for the mock legal generator's output, run as its verify subcommand. pypdfium2 is
+# optional and only imported by verify_document(), so rendering never needs it.
+VERIFY_DEPENDENCIES = {"pypdfium2": "pypdfium2"}
+# Failed documents printed by main(); the rest only go to --report. Files a directory without a manifest holds.
+FAILURES_SHOWN = 20
+DOCUMENT_SUFFIXES = (".pdf", ".png", ".jpg")
+# Points text may sit past a page edge (glyph overhang, rounding) before it counts as outside the page.
+BOUNDS_TOLERANCE = 0.5
+IMAGE_SIGNATURES = {".png": b"\x89PNG\r\n\x1a\n", ".jpg": b"\xff\xd8\xff"}
+# Out-of-bounds text runs reported per document; the rest are only counted.
+BOUNDS_SHOWN = 3
+# Hebrew and Arabic are drawn in display order, and Arabic in its joined presentation forms, so their strings are
+# matched word by word against the extracted words read either way round, normalised back to plain letters and
+# without the punctuation that display order moves to the other end of a word.
+RTL_TEXT = re.compile(r"[\u0590-\u08ff\ufb1d-\ufdff\ufe70-\ufefc]")
+
+
+def missing_dependencies() -> list[str]:
+    return [package for module, package in VERIFY_DEPENDENCIES.items() if importlib.util.find_spec(module) is None]
+
+
+def verify_document(item: dict[str, Any]) -> dict[str, Any]:
+    # item holds "name", the document as "data" or a "path" to read (or "missing"), and optional "expected"
+    # values from the manifest: pages, bytes, sha256, "strings" ({label: text} that must be extractable),
+    # "cells" (timeline text that must appear whole) and "image" for scanned output without a text layer.
+    outcome: dict[str, Any] = {"error": None, "name": item["name"], "problems": [], "pages": 0, "bytes": 0}
+    problems = outcome["problems"]
+    if item.get("missing"):
+        problems.append("missing from the output")
+        return outcome
+    try:
+        data = item["data"] if "data" in item else Path(item["path"]).read_bytes()
+    except OSError as exc:
+        problems.append(f"unreadable: {exc.strerror or exc}")
+        return outcome
+    outcome["bytes"] = len(data)
+    expected = item.get("expected") or {}
+    if not data:
+        problems.append("empty file")
+        return outcome
+    if expected.get("bytes") not in (None, len(data)):
+        problems.append(f"{len(data)} bytes, manifest says {expected['bytes']}")
+    elif expected.get("sha256") and hashlib.sha256(data).hexdigest() != expected["sha256"]:
+        problems.append("sha256 differs from the manifest")
+
+    signature = IMAGE_SIGNATURES.get(Path(item["name"]).suffix.lower().replace(".jpeg", ".jpg"))
+    if signature is not None:
+        outcome["pages"] = 1
+        if not data.startswith(signature):
+            problems.append("not a valid image file")
+        return outcome
+
+    text = check_pdf(data, expected, outcome)
+    if text is None or expected.get("image"):
+        return outcome
+    flat = " ".join(text.split())
+    rtl_words = None
+    for label, value in (expected.get("strings") or {}).items():
+        if RTL_TEXT.search(value):
+            if rtl_words is None:
+                rtl_words = {rtl_word(w) for word in flat.split() for w in (word, word[::-1])}
+            found = all(rtl_word(word) in rtl_words for word in value.split())
+        else:
+            found = " ".join(value.split()) in flat
+        if not found:
+            problems.append(f"{label} {value!r} not found in the text")
+    # Wrapped table cells may be split across lines, so cells are checked word by word; a cell cut short
+    # loses its last word or ends mid-word.
+    words = set(flat.split())
+    for cell in expected.get("cells") or ():
+        if not all(word in words for word in cell.split()):
+            problems.append(f"table text cut short: {cell!r}")
+    return outcome
+
+
+def rtl_word(word: str) -> str:
+    return re.sub(r"\W", "", unicodedata.normalize("NFKC", word))
+
+
+def check_pdf(data: bytes, expected: dict[str, Any], outcome: dict[str, Any]) -> str | None:
+    # Returns the text of every page, or None when the PDF cannot be opened.
+    import pypdfium2
+
+    problems = outcome["problems"]
+    try:
+        document = pypdfium2.PdfDocument(data)
+    except pypdfium2.PdfiumError as exc:
+        problems.append(f"not a readable PDF: {exc}")
+        return None
+    texts = []
+    outside = 0
+    t = BOUNDS_TOLERANCE
+    try:
+        pages = outcome["pages"] = len(document)
+        if not pages:
+            problems.append("no pages")
+        if expected.get("pages") not in (None, pages):
+            problems.append(f"{pages} page(s), manifest says {expected['pages']}")
+        for index in range(pages):
+            page = document[index]
+            textpage = page.get_textpage()
+            try:
+                width, height = page.get_size()
+                texts.append(textpage.get_text_range())
+                for rect in range(textpage.count_rects()):
+                    left, bottom, right, top = textpage.get_rect(rect)
+                    if left >= -t and bottom >= -t and right <= width + t and top <= height + t:
+                        continue
+                    outside += 1
+                    if outside <= BOUNDS_SHOWN:
+                        snippet = " ".join(textpage.get_text_bounded(left, bottom, right, top).split())[:60]
+                        where = f"page {index + 1}: text outside the page at ({left:.0f}, {bottom:.0f})"
+                        problems.append(f"{where}: {snippet!r}")
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        document.close()
+    if outside > BOUNDS_SHOWN:
+        problems.append(f"... {outside - BOUNDS_SHOWN} more text run(s) outside the page")
+    return "\n".join(texts)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="generate-realistic-mock-legal-cases.py verify",
+        description="Check generated documents in an output directory or archive: every file parses, page counts, "
+        "sizes and hashes match the manifest, case number, due date and recipient can be extracted, table text "
+        "is whole and no text is drawn outside the page.",
+    )
+    parser.add_argument("target", help="An --out-dir directory or an --out-archive file.")
+    parser.add_argument(
+        "--manifest",
+        help="The build's --manifest file. Archives default to their own manifest; without one, only structure "
+        "and page bounds are checked.",
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--report", help="Write a JSON pass/fail report with throughput figures here.")
+    args = parser.parse_args(argv)
+    missing = missing_dependencies()
+    if missing:
+        parser.error(f"verify needs the optional packages {', '.join(missing)} (pip install {' '.join(missing)}).")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    target = Path(args.target).resolve()
+    kind = None if target.is_dir() else gen.archive_format(target)
+    if not target.is_dir() and (kind is None or not target.is_file()):
+        parser.error(f"{target} is neither a directory nor a {', '.join(gen.ARCHIVE_FORMATS)} archive.")
+    if kind == "tar.zst" and importlib.util.find_spec("zstandard") is None:
+        parser.error("reading .tar.zst archives needs the optional 'zstandard' package (pip install zstandard).")
+
+    expected = None
+    try:
+        if args.manifest:
+            manifest = Path(args.manifest).resolve()
+            if not manifest.is_file():
+                parser.error(f"--manifest {manifest} is not a file.")
+            expected = manifest_expectations(manifest.read_bytes().splitlines(), str(manifest))
+        elif kind:
+            # The manifest is an archive's last entry, so tar archives are read twice: once for it, once to verify.
+            entry = next((data for name, data in archive_entries(target, kind) if name == gen.ARCHIVE_MANIFEST), None)
+            source = f"{target}:{gen.ARCHIVE_MANIFEST}"
+            expected = manifest_expectations(entry.splitlines(), source) if entry else None
+    except ValueError as exc:
+        parser.error(str(exc))
+    items = verify_items(target, kind, expected)
+
+    started = time.perf_counter()
+    failures: list[dict[str, Any]] = []
+    totals = collections.Counter()
+    for item, outcome, _ in gen.run_jobs(((item, None) for item in items), args.jobs, verify_document):
+        totals["documents"] += 1
+        totals["pages"] += outcome["pages"]
+        totals["bytes"] += outcome["bytes"]
+        problems = item.get("problems", []) + outcome["problems"]
+        if problems:
+            failures.append({"fileName": item["name"], "problems": problems})
+            if len(failures) <= FAILURES_SHOWN:
+                print(f"failed {item['name']}: {'; '.join(problems)}", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    if len(failures) > FAILURES_SHOWN:
+        print(f"... and {len(failures) - FAILURES_SHOWN} more failed document(s)", file=sys.stderr)
+    rate = max(elapsed, 1e-9)
+    report = {
+        "target": str(target),
+        "manifest": expected is not None,
+        "documents": totals["documents"],
+        "passed": totals["documents"] - len(failures),
+        "failed": len(failures),
+        "pages": totals["pages"],
+        "bytes": totals["bytes"],
+        "jobs": args.jobs,
+        "seconds": round(elapsed, 3),
+        "docsPerSec": round(totals["documents"] / rate, 1),
+        "pagesPerSec": round(totals["pages"] / rate, 1),
+        "mbPerSec": round(totals["bytes"] / rate / (1 << 20), 2),
+        "failures": failures,
+    }
+    if args.report:
+        report_path = Path(args.report).resolve()
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(
+        f"verified {report['documents']} document(s) in {elapsed:.2f}s ({report['docsPerSec']} docs/s, "
+        f"{report['pagesPerSec']} pages/s, {report['mbPerSec']} MB/s): {report['passed']} passed, "
+        f"{report['failed']} failed" + ("" if expected is not None else " (no manifest: structure and bounds only)")
+    )
+    return 1 if failures or not totals["documents"] else 0
+
+
+def manifest_expectations(lines: Iterable[bytes], source: str) -> dict[str, dict[str, Any]]:
+    # What verify_document() checks for each manifest record, keyed by file name. source names the manifest in
+    # the ValueError a malformed record raises.
+    expected = {}
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            checks: dict[str, Any] = {key: record.get(key) for key in ("pages", "bytes", "sha256")}
+            if record.get("scan"):
+                checks["image"] = True
+            else:
+                checks["strings"] = {"case number": record["caseNumber"], "recipient": record["recipientName"]}
+                if record.get("dueDateIso"):
+                    checks["strings"]["due date"] = gen.fmt_date(dt.date.fromisoformat(record["dueDateIso"]))
+                # Receipts do not print the timeline.
+                if record.get("category") != "receipt":
+                    checks["cells"] = [row[key] for row in record["timeline"] for key in ("action", "notes")]
+            text = [record["fileName"], *checks.get("strings", {}).values(), *checks.get("cells", ())]
+            if not all(isinstance(value, str) for value in text):
+                raise TypeError
+        except (ValueError, TypeError, KeyError, AttributeError):
+            fields = "a fileName, caseNumber, recipientName and timeline"
+            raise ValueError(f"{source}:{number}: not a build manifest record with {fields}.") from None
+        expected[record["fileName"]] = checks
+    return expected
+
+
+def verify_items(
+    target: Path, kind: str | None, expected: dict[str, dict[str, Any]] | None
+) -> Iterator[dict[str, Any]]:
+    # Directory documents are read by the workers; archive entries are streamed here and sent with the item.
+    seen = set()
+    if kind:
+        for name, data in archive_entries(target, kind):
+            if name == gen.ARCHIVE_MANIFEST:
+                continue
+            seen.add(name)
+            item = {"name": name, "data": data}
+            if expected is not None:
+                item["expected"] = expected.get(name)
+                if item["expected"] is None:
+                    item["problems"] = ["not in the manifest"]
+            yield item
+        for name in sorted(set(expected or ()) - seen):
+            yield {"name": name, "missing": True}
+    elif expected is not None:
+        for name, checks in expected.items():
+            yield {"name": name, "path": str(target / name), "expected": checks}
+    else:
+        for path in sorted(target.iterdir()):
+            if path.suffix.lower() in DOCUMENT_SUFFIXES and path.is_file():
+                yield {"name": path.name, "path": str(path)}
+
+
+def archive_entries(path: Path, kind: str) -> Iterator[tuple[str, bytes]]:
+    modules = gen.archive_modules()
+    if kind == "zip":
+        with modules.zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield info.filename, archive.read(info)
+        return
+    with contextlib.ExitStack() as stack:
+        stream: IO[bytes] = stack.enter_context(path.open("rb"))
+        if kind == "tar.zst":
+            import zstandard
+
+            stream = stack.enter_context(zstandard.ZstdDecompressor().stream_reader(stream))
+        archive = stack.enter_context(modules.tarfile.open(fileobj=stream, mode="r|*"))
+        for member in archive:
+            if member.isfile():
+                yield member.name, archive.extractfile(member).read()
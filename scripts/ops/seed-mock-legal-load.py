@@ -0,0 +1,487 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import os
+import random
+import ssl
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+import mock_legal_generator as gen
+import mock_legal_metrics
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_API_BASE = os.environ.get("CLEARCASE_API_BASE", "").strip() or "http://127.0.0.1:3001"
+ARRIVALS = ("closed", "constant", "poisson", "burst")
+# The per-document API flow, in order; each is also a latency stage in the report.
+FLOW_STAGES = ("create", "plan", "upload", "finalize", "classify")
+ERRORS_SHOWN = 10
+# Open arrival modes schedule documents ahead of the server; at most this many wait for a --concurrency slot.
+MAX_PENDING = 4096
+# StreamReader limit for the response head and chunk-size lines.
+MAX_HEADER_BYTES = 64 << 10
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Render mock legal documents in memory and push them through the case upload API under load."
+    )
+    parser.add_argument("--fixtures", default=str(HERE / "mock-legal-fixtures.json"))
+    parser.add_argument("--run-tag", default="SEED")
+    parser.add_argument("--api-base", default=DEFAULT_API_BASE, help="Defaults to $CLEARCASE_API_BASE or :3001.")
+    parser.add_argument("--subject", default="mobile-test")
+    parser.add_argument("--email", default="test@test.com")
+    parser.add_argument("--docs", type=int, default=100, help="Documents to seed.")
+    parser.add_argument(
+        "--arrival",
+        default="closed",
+        help="closed (as fast as --concurrency allows), constant:RATE, poisson:RATE or burst:SIZE:SECONDS; "
+        "RATE is documents per second.",
+    )
+    parser.add_argument("--concurrency", type=int, default=16, help="Documents in flight at once.")
+    parser.add_argument("--connections", type=int, default=32, help="Pooled keep-alive connections per origin.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds allowed for each HTTP request.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Render worker processes.")
+    parser.add_argument("--seed", help="Seed for arrival times. Defaults to the run tag.")
+    parser.add_argument("--report", help="Write stage latency percentiles here: JSON for .json, Prometheus otherwise.")
+    parser.add_argument(
+        "--stub",
+        action="store_true",
+        help="Seed a local stand-in for the API instead of --api-base, to measure the seeder itself or model "
+        "a saturating backend with --stub-workers and --stub-service-ms.",
+    )
+    parser.add_argument("--stub-workers", type=int, default=8, help="Requests the stand-in serves at once.")
+    parser.add_argument("--stub-service-ms", type=float, default=5.0, help="Stand-in service time per request.")
+    args = parser.parse_args()
+    for name in ("docs", "concurrency", "connections", "jobs", "stub_workers"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1.")
+    if args.docs > gen.ID_SPACE:
+        parser.error(f"--docs must be at most {gen.ID_SPACE} (unique document IDs per run).")
+    try:
+        args.arrival = parse_arrival(args.arrival)
+    except ValueError as exc:
+        parser.error(f"--arrival: {exc}")
+    return args
+
+
+def parse_arrival(spec: str) -> tuple[str, tuple[float, ...]]:
+    kind, _, rest = spec.partition(":")
+    if kind not in ARRIVALS:
+        raise ValueError(f"expected one of {', '.join(ARRIVALS)}, not {kind!r}")
+    try:
+        params = tuple(float(part) for part in rest.split(":")) if rest else ()
+    except ValueError:
+        raise ValueError(f"{spec!r} has a non-numeric parameter") from None
+    expected = {"closed": 0, "constant": 1, "poisson": 1, "burst": 2}[kind]
+    if len(params) != expected or any(value <= 0 for value in params):
+        raise ValueError(f"{kind} takes {expected} positive parameter(s)")
+    if kind == "burst" and params[0] != int(params[0]):
+        raise ValueError("burst SIZE must be a whole number of documents")
+    return kind, params
+
+
+def arrival_offsets(arrival: tuple[str, tuple[float, ...]], rng: random.Random) -> Iterator[float]:
+    # Seconds after the start at which each document arrives, whether or not earlier ones have finished,
+    # so a slow server shows up as queueing and latency rather than a lower offered rate.
+    kind, params = arrival
+    if kind == "closed":
+        yield from itertools.repeat(0.0)
+    elif kind == "constant":
+        yield from (index / params[0] for index in itertools.count())
+    elif kind == "poisson":
+        at = 0.0
+        while True:
+            yield at
+            at += rng.expovariate(params[0])
+    else:
+        size, every = int(params[0]), params[1]
+        yield from (index // size * every for index in itertools.count())
+
+
+class SeedError(Exception):
+    def __init__(self, stage: str, message: str) -> None:
+        super().__init__(f"{stage}: {message}")
+        self.stage = stage
+
+
+class StaleConnection(Exception):
+    # The connection failed before any byte of the response was read, so the server never answered this request.
+    pass
+
+
+class HttpPool:
+    # Minimal HTTP/1.1 client over asyncio streams with keep-alive connections pooled per origin, so the
+    # seeder measures the API rather than connection setup. Enough for JSON calls and presigned PUTs.
+
+    def __init__(self, connections: int, timeout: float) -> None:
+        self.connections = connections
+        self.timeout = timeout
+        self.idle: dict[tuple[str, str, int], list[tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self.slots: dict[tuple[str, str, int], asyncio.Semaphore] = {}
+        self.opened = 0
+
+    async def request(
+        self, method: str, url: str, headers: dict[str, str], body: bytes = b""
+    ) -> tuple[int, dict[str, str], bytes]:
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        slot = self.slots.setdefault(origin, asyncio.Semaphore(self.connections))
+        async with slot:
+            idle = self.idle.setdefault(origin, [])
+            # A pooled connection may have been closed by the server while idle; retry once on a fresh one, but
+            # only when nothing came back, since a POST the server may have acted on must not be sent twice.
+            for reused in (True, False) if idle else (False,):
+                conn = idle.pop() if reused and idle else await self.connect(origin)
+                try:
+                    status, response_headers, payload = await asyncio.wait_for(
+                        self.exchange(conn, method, target, parts.netloc, headers, body), self.timeout
+                    )
+                except StaleConnection:
+                    conn[1].close()
+                    if reused:
+                        continue
+                    raise SeedError("http", f"{method} {url}: connection closed before a response") from None
+                except (ConnectionError, asyncio.IncompleteReadError) as exc:
+                    conn[1].close()
+                    raise SeedError("http", f"{method} {url}: {type(exc).__name__} during the response") from None
+                except asyncio.LimitOverrunError:
+                    conn[1].close()
+                    raise SeedError("http", f"{method} {url}: response head over {MAX_HEADER_BYTES} bytes") from None
+                except ValueError as exc:
+                    conn[1].close()
+                    raise SeedError("http", f"{method} {url}: malformed response: {exc}") from None
+                except asyncio.TimeoutError:
+                    conn[1].close()
+                    raise SeedError("http", f"{method} {url}: no response in {self.timeout:g}s") from None
+                if response_headers.get("connection", "").lower() == "close":
+                    conn[1].close()
+                else:
+                    idle.append(conn)
+                return status, response_headers, payload
+        raise AssertionError("unreachable")
+
+    async def connect(self, origin: tuple[str, str, int]) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        scheme, host, port = origin
+        context = ssl.create_default_context() if scheme == "https" else None
+        try:
+            opening = asyncio.open_connection(host, port, ssl=context, limit=MAX_HEADER_BYTES)
+            conn = await asyncio.wait_for(opening, self.timeout)
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise SeedError("http", f"cannot connect to {host}:{port}: {exc or type(exc).__name__}") from None
+        self.opened += 1
+        return conn
+
+    async def exchange(
+        self,
+        conn: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        method: str,
+        target: str,
+        host: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> tuple[int, dict[str, str], bytes]:
+        reader, writer = conn
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}", f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        try:
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            first = await reader.read(1)
+        except ConnectionError:
+            raise StaleConnection from None
+        if not first:
+            raise StaleConnection
+        head = first + await reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        try:
+            status = int(status_line.split(" ", 2)[1])
+        except (IndexError, ValueError):
+            raise ValueError(f"bad status line {status_line[:100]!r}") from None
+        response_headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if not size:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        elif "content-length" in response_headers:
+            payload = await reader.readexactly(int(response_headers["content-length"]))
+        elif method == "HEAD" or status in (204, 304):
+            payload = b""
+        else:
+            payload = await reader.read()
+            response_headers["connection"] = "close"
+        return status, response_headers, payload
+
+    async def close(self) -> None:
+        writers = [writer for conns in self.idle.values() for _, writer in conns]
+        self.idle.clear()
+        for writer in writers:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True)
+
+
+class Seeder:
+    # One document per task: render in a worker process, then create case -> upload plan -> PUT -> finalize
+    # -> classify, timing each step. --concurrency bounds documents in flight; later arrivals queue.
+
+    def __init__(self, args: argparse.Namespace, api_base: str, pool: ProcessPoolExecutor) -> None:
+        self.api_base = api_base.rstrip("/")
+        self.pool = pool
+        self.http = HttpPool(args.connections, args.timeout)
+        self.gate = asyncio.Semaphore(args.concurrency)
+        self.metrics = mock_legal_metrics.RunMetrics()
+        self.auth = {"x-auth-subject": args.subject, "x-user-email": args.email, "Accept": "application/json"}
+        self.errors: list[str] = []
+
+    async def api(self, stage: str, path: str, payload: dict[str, Any]) -> Any:
+        headers = {**self.auth, "Content-Type": "application/json"}
+        body = json.dumps(payload).encode("utf-8")
+        status, _, text = await self.http.request("POST", self.api_base + path, headers, body)
+        if not 200 <= status < 300:
+            raise SeedError(stage, f"HTTP {status} {text[:200].decode('utf-8', 'replace')}")
+        try:
+            return json.loads(text) if text else None
+        except ValueError:
+            raise SeedError(stage, f"non-JSON response {text[:200]!r}") from None
+
+    async def grant_entitlement(self, subject: str, email: str) -> None:
+        # Like seed-test-account.mjs, a refused grant is not fatal: the account may already be entitled.
+        payload = {"subject": subject, "email": email, "plan": "plus", "status": "active", "source": "manual"}
+        try:
+            await self.api("entitlement", "/ops/entitlements/grant", payload)
+        except SeedError as exc:
+            if exc.stage != "entitlement":
+                raise
+            print(f"warning: {exc}", file=sys.stderr)
+
+    async def seed(self, job: dict[str, Any], arrived: float | None) -> None:
+        # arrived is the scheduled arrival in open modes; None (closed mode) means the document arrives when
+        # it gets a slot, so it never queues.
+        spans: dict[str, float] = {}
+        outcome: dict[str, Any] = {"error": None, "bytes": 0, "spans": spans}
+        async with self.gate:
+            started = time.perf_counter()
+            if arrived is None:
+                arrived = started
+            spans["queue"] = started - arrived
+            try:
+                await self.flow(job, spans, outcome)
+            except SeedError as exc:
+                outcome["error"] = str(exc)
+                if len(self.errors) < ERRORS_SHOWN:
+                    self.errors.append(f"{job['output_path'].name}: {exc}")
+        if not outcome["error"]:
+            spans["total"] = time.perf_counter() - arrived
+        self.metrics.add(outcome, cached=False)
+
+    async def flow(self, job: dict[str, Any], spans: dict[str, float], outcome: dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        fixture = job["fixture"]
+        at = time.perf_counter()
+
+        def lap(stage: str) -> None:
+            nonlocal at
+            now = time.perf_counter()
+            spans[stage] = now - at
+            at = now
+
+        rendered = await loop.run_in_executor(self.pool, functools.partial(gen.render_job, job, keep_data=True))
+        if rendered["error"]:
+            raise SeedError("render", rendered["error"])
+        data = rendered["data"]
+        outcome["bytes"] = len(data)
+        lap("render")
+        case = await self.api("create", "/cases", {"title": fixture["caseTitle"]})
+        if not isinstance(case, dict) or not case.get("id"):
+            raise SeedError("create", f"no id in {str(case)[:200]}")
+        lap("create")
+        name = job["output_path"].name
+        plan = await self.api(
+            "plan",
+            f"/cases/{case['id']}/assets",
+            {"fileName": name, "mimeType": "application/pdf", "byteSize": len(data)},
+        )
+        if not isinstance(plan, dict) or not plan.get("uploadUrl") or not plan.get("assetId"):
+            raise SeedError("plan", f"no uploadUrl/assetId in {str(plan)[:200]}")
+        if not isinstance(plan.get("uploadHeaders") or {}, dict):
+            raise SeedError("plan", f"uploadHeaders is not an object in {str(plan)[:200]}")
+        lap("plan")
+        headers = {"Content-Type": "application/pdf", **(plan.get("uploadHeaders") or {})}
+        status, _, text = await self.http.request(plan.get("uploadMethod") or "PUT", plan["uploadUrl"], headers, data)
+        if not 200 <= status < 300:
+            raise SeedError("upload", f"HTTP {status} {text[:200].decode('utf-8', 'replace')}")
+        lap("upload")
+        finalize = f"/cases/{case['id']}/assets/{plan['assetId']}/finalize"
+        await self.api("finalize", finalize, {"userDescription": fixture["description"]})
+        lap("finalize")
+        await self.api("classify", f"/cases/{case['id']}/classification", {"documentType": fixture["documentType"]})
+        lap("classify")
+
+
+async def closed_loop(seeder: Seeder, jobs: Iterator[dict[str, Any]]) -> None:
+    # One of --concurrency workers sharing the job iterator: each starts its next document when the last one ends.
+    for job in jobs:
+        await seeder.seed(job, None)
+
+
+async def seed_corpus(args: argparse.Namespace, api_base: str) -> tuple[Seeder, float]:
+    fixtures = gen.load_fixtures(Path(args.fixtures).resolve())
+    run_tag = args.run_tag.strip()
+    base = {
+        "run_tag": run_tag,
+        "issue_date": gen.run_date(run_tag),
+        "recipient_name": gen.DEFAULT_RECIPIENT_NAME,
+        "recipient_address": gen.DEFAULT_RECIPIENT_ADDRESS,
+    }
+    jobs = iter(gen.expand_jobs(list(enumerate(fixtures)), base, Path(), None, args.docs, run_tag))
+    offsets = arrival_offsets(args.arrival, random.Random(f"{args.seed or run_tag}:arrivals"))
+    # Workers import reportlab up front so the first arrivals are not charged for it.
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=gen.backend) as pool:
+        seeder = Seeder(args, api_base, pool)
+        try:
+            await seeder.grant_entitlement(args.subject, args.email)
+            start = time.perf_counter()
+            if args.arrival[0] == "closed":
+                await asyncio.gather(*(closed_loop(seeder, jobs) for _ in range(args.concurrency)))
+                return seeder, time.perf_counter() - start
+            pending = asyncio.Semaphore(MAX_PENDING)
+            tasks = set()
+            for job, offset in zip(jobs, offsets):
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # A full backlog delays creating the task, not the arrival: the wait still counts as queueing.
+                await pending.acquire()
+                task = asyncio.create_task(seeder.seed(job, start + offset))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(lambda _: pending.release())
+            while tasks:
+                await asyncio.gather(*tasks)
+            return seeder, time.perf_counter() - start
+        finally:
+            await seeder.http.close()
+
+
+async def start_stub(workers: int, service_ms: float) -> tuple[asyncio.AbstractServer, str, set[asyncio.Task]]:
+    # Stand-in for the API's seeding routes plus a presigned-upload target. Each request holds one of
+    # `workers` slots for `service_ms`, so offered load past workers / service time queues like a saturated API.
+    slots = asyncio.Semaphore(workers)
+    base = ""
+    handlers: set[asyncio.Task] = set()
+
+    async def route(method: str, path: str, body: bytes) -> tuple[int, Any]:
+        parts = path.strip("/").split("/")
+        if method == "PUT" and parts[0] == "upload":
+            return 200, None
+        if method != "POST":
+            return 405, {"error": "METHOD_NOT_ALLOWED"}
+        if path == "/ops/entitlements/grant":
+            return 200, {"granted": True}
+        if path == "/cases":
+            return 201, {"id": uuid.uuid4().hex, "title": json.loads(body).get("title")}
+        if len(parts) == 3 and parts[0] == "cases" and parts[2] == "assets":
+            asset_id = uuid.uuid4().hex
+            upload = {"uploadUrl": f"{base}/upload/{asset_id}", "uploadMethod": "PUT"}
+            return 201, {"assetId": asset_id, "caseId": parts[1], **upload}
+        if len(parts) == 5 and parts[2] == "assets" and parts[4] == "finalize":
+            return 200, {"assetId": parts[3], "queued": True}
+        if len(parts) == 3 and parts[2] == "classification":
+            return 200, {"documentType": json.loads(body).get("documentType")}
+        return 404, {"error": "NOT_FOUND"}
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        handlers.add(asyncio.current_task())
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                fields = (line.partition(":") for line in lines)
+                headers = {name.strip().lower(): value.strip() for name, _, value in fields}
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+                async with slots:
+                    await asyncio.sleep(service_ms / 1000)
+                    status, payload = await route(method, path, body)
+                text = b"" if payload is None else json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\nContent-Length: {len(text)}\r\n\r\n"
+                    .encode("latin-1") + text
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            handlers.discard(asyncio.current_task())
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    base = f"http://{host}:{port}"
+    return server, base, handlers
+
+
+async def run(args: argparse.Namespace) -> tuple[Seeder, float]:
+    if not args.stub:
+        return await seed_corpus(args, args.api_base)
+    server, api_base, handlers = await start_stub(args.stub_workers, args.stub_service_ms)
+    async with server:
+        try:
+            return await seed_corpus(args, api_base)
+        finally:
+            # Connections the seeder closed end their handlers; let them finish before the loop shuts down.
+            await asyncio.wait_for(asyncio.gather(*handlers, return_exceptions=True), 5)
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        seeder, elapsed = asyncio.run(run(args))
+    except SeedError as exc:
+        print(f"seeding stopped: {exc}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    for error in seeder.errors:
+        print(f"failed {error}", file=sys.stderr)
+    metrics = seeder.metrics
+    summary = metrics.to_json({"seed": elapsed})
+    for stage in ("queue", "render", *FLOW_STAGES, "total"):
+        if stage in summary["stages"]:
+            values = ", ".join(f"{key}={value}" for key, value in summary["stages"][stage].items())
+            print(f"stage/{stage}: {values}")
+    done = metrics.counts["rendered"]
+    kind, params = args.arrival
+    offered = f"{params[0]:g}/s" if kind in ("constant", "poisson") else ":".join([kind, *map("{:g}".format, params)])
+    print(
+        f"seeded {done} of {args.docs} in {elapsed:.2f}s: {done / elapsed:.1f} docs/s achieved, offered {offered}, "
+        f"concurrency {args.concurrency}, {seeder.http.opened} connection(s) opened, "
+        f"{metrics.counts['failed']} failed"
+    )
+    if args.report:
+        metrics.write(Path(args.report).resolve(), {"seed": elapsed})
+    return 1 if metrics.counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
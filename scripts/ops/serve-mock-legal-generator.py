@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import base64
+import datetime as dt
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+import mock_legal_generator as gen
+
+HERE = Path(__file__).resolve().parent
+
+# JSON-RPC 2.0 error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+RENDER_FAILED = -32000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Long-running mock legal document generator speaking line-delimited JSON-RPC 2.0."
+    )
+    parser.add_argument("--fixtures", default=str(HERE / "mock-legal-fixtures.json"))
+    parser.add_argument("--run-tag", default="", help="Default run tag for requests that do not send one.")
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of stdin/stdout.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    return args
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def warm_worker(fixtures: list[dict[str, str]]) -> None:
+    # Render one document per category so fonts, metrics and the static page layers are built before requests.
+    seen = set()
+    for fixture in fixtures:
+        category = gen.DOC_CATEGORY.get(fixture["documentType"], "general")
+        if category not in seen:
+            seen.add(category)
+            gen.render_document(fixture, "WARM", dt.date(2026, 1, 1), gen.DEFAULT_RECIPIENT_NAME, "")
+
+
+def render_request(job: dict[str, Any], keep_data: bool) -> dict[str, Any]:
+    start = time.perf_counter()
+    outcome = gen.render_job(job, keep_data=keep_data)
+    outcome["renderMs"] = round((time.perf_counter() - start) * 1000, 3)
+    return outcome
+
+
+class Dispatcher:
+    # Owns the fixtures and the warm worker pool; replies may arrive out of order and are matched by request id.
+
+    def __init__(self, fixtures: list[dict[str, str]], run_tag: str, workers: int) -> None:
+        self.fixtures = fixtures
+        self.by_type = {fixture["documentType"]: index for index, fixture in enumerate(fixtures)}
+        self.run_tag = run_tag
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_worker, initargs=(fixtures,))
+        # Start every worker now so the first request does not pay for the warm-up.
+        for future in [self.pool.submit(int) for _ in range(workers)]:
+            future.result()
+        self.stopping = threading.Event()
+        # Renders finish on the pool's callback threads, so the count is only touched under the lock.
+        self.served_lock = threading.Lock()
+        self.served = 0
+
+    def handle(self, line: str, reply: Callable[[dict[str, Any]], None]) -> None:
+        received = time.perf_counter()
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                raise RpcError(PARSE_ERROR, f"invalid JSON: {exc}") from None
+            if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+                raise RpcError(INVALID_REQUEST, "expected a JSON-RPC 2.0 request object")
+            request_id = request.get("id")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            method = request["method"]
+            if method == "render":
+                future = self.submit_render(params)
+                future.add_done_callback(lambda done: self.finish_render(done, request, received, reply))
+                return
+            if method == "ping":
+                with self.served_lock:
+                    result: Any = {"served": self.served, "fixtures": len(self.fixtures)}
+            elif method == "fixtures":
+                result = [fixture["documentType"] for fixture in self.fixtures]
+            elif method == "shutdown":
+                self.stopping.set()
+                result = None
+            else:
+                raise RpcError(METHOD_NOT_FOUND, f"unknown method {method!r}")
+        except RpcError as exc:
+            if request_id is not None or exc.code in (PARSE_ERROR, INVALID_REQUEST):
+                reply({"jsonrpc": "2.0", "id": request_id, "error": {"code": exc.code, "message": str(exc)}})
+            return
+        if request_id is not None:
+            reply({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def submit_render(self, params: dict[str, Any]) -> Future:
+        listed = False
+        if "fixture" in params:
+            try:
+                fixture = gen.validate_fixture(params["fixture"])
+            except ValueError as exc:
+                raise RpcError(INVALID_PARAMS, f"fixture: {exc}") from None
+            index = self.by_type.get(fixture["documentType"])
+        elif params.get("documentType") in self.by_type:
+            index = self.by_type[params["documentType"]]
+            fixture = self.fixtures[index]
+            listed = True
+        else:
+            raise RpcError(INVALID_PARAMS, "send either 'fixture' or a known 'documentType'")
+        run_tag = str(params.get("runTag") or self.run_tag).strip()
+        if not run_tag:
+            raise RpcError(INVALID_PARAMS, "'runTag' is required when the server has no --run-tag")
+        try:
+            issue_date = dt.date.fromisoformat(params["issueDateIso"]) if params.get("issueDateIso") else None
+            variant = int(params.get("variant", 0))
+        except (TypeError, ValueError) as exc:
+            raise RpcError(INVALID_PARAMS, str(exc)) from None
+        out_path = params.get("outPath")
+        job = {
+            "run_tag": run_tag,
+            "issue_date": issue_date or gen.run_date(run_tag),
+            "recipient_name": params.get("recipientName") or gen.DEFAULT_RECIPIENT_NAME,
+            "recipient_address": params.get("recipientAddress") or gen.DEFAULT_RECIPIENT_ADDRESS,
+            "fixture": fixture,
+            "output_path": Path(out_path).resolve() if out_path else Path(fixture["fileName"]),
+        }
+        if listed:
+            # The same corpus slot (and so the same IDs) the CLI gives this fixture and variant for the run tag.
+            slot = variant * len(self.fixtures) + index
+            try:
+                [job["ids"]] = gen.allocate_ids(run_tag, range(slot, slot + 1))
+            except ValueError as exc:
+                raise RpcError(INVALID_PARAMS, str(exc)) from None
+        if variant:
+            if index is None:
+                # Variants are seeded from the fixture's row, so an ad-hoc fixture needs a listed documentType.
+                unlisted = fixture["documentType"]
+                raise RpcError(INVALID_PARAMS, f"variants need a documentType from --fixtures, not {unlisted!r}")
+            job = gen.variant_job(job, index, variant, str(params.get("variantSeed") or run_tag))
+            if out_path:
+                job["output_path"] = Path(out_path).resolve()
+        try:
+            return self.pool.submit(render_request, job, not out_path)
+        except RuntimeError as exc:
+            # A broken pool (a worker died) or one that is already shut down; the request cannot be rendered.
+            raise RpcError(RENDER_FAILED, f"{type(exc).__name__}: {exc}") from None
+
+    def finish_render(
+        self, future: Future, request: dict[str, Any], received: float, reply: Callable[[dict[str, Any]], None]
+    ) -> None:
+        request_id = request.get("id")
+        try:
+            outcome = future.result()
+        except Exception as exc:
+            outcome = {"error": f"{type(exc).__name__}: {exc}"}
+        with self.served_lock:
+            self.served += 1
+        if request_id is None:
+            return
+        if outcome["error"]:
+            reply({"jsonrpc": "2.0", "id": request_id, "error": {"code": RENDER_FAILED, "message": outcome["error"]}})
+            return
+        data = outcome.pop("data", None)
+        result = {key: outcome[key] for key in ("sha256", "bytes", "pages", "renderMs")}
+        params = request.get("params") or {}
+        if data is None:
+            result["path"] = str(Path(params["outPath"]).resolve())
+        else:
+            result["pdfBase64"] = base64.b64encode(data).decode("ascii")
+        result["elapsedMs"] = round((time.perf_counter() - received) * 1000, 3)
+        reply({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def close(self) -> None:
+        # Waits for in-flight renders so every accepted request still gets its reply.
+        self.pool.shutdown(wait=True)
+
+
+def line_writer(stream: TextIO) -> Callable[[dict[str, Any]], None]:
+    lock = threading.Lock()
+
+    def reply(message: dict[str, Any]) -> None:
+        line = json.dumps(message, separators=(",", ":")) + "\n"
+        with lock:
+            try:
+                stream.write(line)
+                stream.flush()
+            except (BrokenPipeError, ValueError):
+                pass
+
+    return reply
+
+
+def serve_stdio(dispatcher: Dispatcher) -> None:
+    reply = line_writer(sys.stdout)
+    for line in sys.stdin:
+        if line.strip():
+            dispatcher.handle(line, reply)
+        if dispatcher.stopping.is_set():
+            break
+
+
+class SocketText:
+    # Text adapter over a socket's binary stream so socket and stdio replies share line_writer.
+
+    def __init__(self, stream: Any) -> None:
+        self.stream = stream
+
+    def write(self, text: str) -> None:
+        self.stream.write(text.encode("utf-8"))
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def serve_socket(dispatcher: Dispatcher, path: Path) -> None:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            reply = line_writer(SocketText(self.wfile))
+            for raw in self.rfile:
+                if raw.strip():
+                    dispatcher.handle(raw.decode("utf-8"), reply)
+                if dispatcher.stopping.is_set():
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    break
+
+    if path.exists():
+        path.unlink()
+    server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+    server.daemon_threads = True
+    print(f"listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+def stop(signum: int, frame: Any) -> None:
+    raise KeyboardInterrupt
+
+
+def main() -> int:
+    args = parse_args()
+    signal.signal(signal.SIGTERM, stop)
+    started = time.perf_counter()
+    try:
+        fixtures = gen.load_fixtures(Path(args.fixtures).resolve())
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    dispatcher = Dispatcher(fixtures, args.run_tag, args.jobs)
+    print(f"ready in {(time.perf_counter() - started) * 1000:.0f} ms with {args.jobs} warm worker(s)", file=sys.stderr)
+    try:
+        if args.socket:
+            serve_socket(dispatcher, Path(args.socket))
+        else:
+            serve_stdio(dispatcher)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dispatcher.close()
+    print(f"served {dispatcher.served} render request(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
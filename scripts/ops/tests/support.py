@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Shared by the test modules. Importing it puts scripts/ops on sys.path for the generator modules.
+OPS = Path(__file__).resolve().parents[1]
+CLI = OPS / "generate-realistic-mock-legal-cases.py"
+FIXTURES = OPS / "mock-legal-fixtures.json"
+RUN_TAG = "QA20260301"
+sys.path.insert(0, str(OPS))
+
+
+def cli(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, str(CLI), *args], capture_output=True, text=True)
+
+
+class CorpusTestCase(unittest.TestCase):
+    # Every test gets its own temporary directory; build() renders a corpus and its --manifest into it.
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.out = self.tmp / "out"
+        self.manifest = self.tmp / "manifest.jsonl"
+
+    def build(self, fixtures: Path = FIXTURES, *extra: str, sink: tuple[str, ...] = ()) -> Path:
+        # sink replaces the default --out-dir, e.g. ("--out-archive", path).
+        sink = sink or ("--out-dir", str(self.out))
+        paths = ["--fixtures", str(fixtures), *sink, "--manifest", str(self.manifest)]
+        result = cli(*paths, "--run-tag", RUN_TAG, "--jobs", "1", *extra)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return self.out
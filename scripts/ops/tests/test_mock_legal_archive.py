@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+import tarfile
+import unittest
+import zipfile
+
+from support import FIXTURES, CorpusTestCase, cli
+
+import mock_legal_generator as gen
+import mock_legal_verify
+
+ROWS = gen.load_fixtures(FIXTURES)
+
+
+@unittest.skipIf(mock_legal_verify.missing_dependencies(), "verify needs pypdfium2")
+class ArchiveRoundTripTest(CorpusTestCase):
+    def test_archives_verify_against_their_own_manifest(self) -> None:
+        for suffix in (".zip", ".tar.gz"):
+            with self.subTest(suffix=suffix):
+                archive = self.tmp / f"corpus{suffix}"
+                self.build(sink=("--out-archive", str(archive)))
+                self.assertFalse(self.out.exists())
+                if suffix == ".zip":
+                    with zipfile.ZipFile(archive) as opened:
+                        names = opened.namelist()
+                        manifest = opened.read(gen.ARCHIVE_MANIFEST)
+                else:
+                    with tarfile.open(archive) as opened:
+                        names = opened.getnames()
+                        manifest = opened.extractfile(gen.ARCHIVE_MANIFEST).read()
+                self.assertEqual(names, [*(row["fileName"] for row in ROWS), gen.ARCHIVE_MANIFEST])
+                self.assertEqual(manifest, self.manifest.read_bytes())
+
+                report = self.tmp / "verify.json"
+                result = cli("verify", str(archive), "--jobs", "2", "--report", str(report))
+                self.assertEqual(result.returncode, 0, result.stderr)
+                summary = json.loads(report.read_text(encoding="utf-8"))
+                self.assertEqual((summary["manifest"], summary["documents"], summary["failed"]), (True, len(ROWS), 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
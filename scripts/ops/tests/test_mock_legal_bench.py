@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import unittest
+
+from support import OPS, CorpusTestCase
+
+BENCH = OPS / "bench-mock-legal-generator.py"
+
+
+class BenchSmokeTest(CorpusTestCase):
+    def bench(self, *args: str) -> subprocess.CompletedProcess:
+        quick = ["--quick", "--only", "category/court", "--jobs", "1", "--out", str(self.tmp / "bench.json")]
+        return subprocess.run([sys.executable, str(BENCH), *quick, *args], capture_output=True, text=True)
+
+    def test_quick_run_writes_results_and_compares_a_baseline(self) -> None:
+        result = self.bench()
+        self.assertEqual(result.returncode, 0, result.stderr)
+        payload = json.loads((self.tmp / "bench.json").read_text(encoding="utf-8"))
+        self.assertEqual(list(payload["results"]), ["category/court"])
+        self.assertRegex(payload["reportlab"], r"^\d+\.")
+        baseline = self.tmp / "baseline.json"
+        (self.tmp / "bench.json").rename(baseline)
+        result = self.bench("--baseline", str(baseline), "--threshold", "100")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("no regressions", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
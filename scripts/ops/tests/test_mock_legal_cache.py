@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import re
+import sys
+import unittest
+from unittest import mock
+
+from support import FIXTURES, RUN_TAG, CorpusTestCase
+
+import mock_legal_generator as gen
+
+ROWS = json.loads(FIXTURES.read_text(encoding="utf-8"))[:4]
+
+
+class BuildCacheTest(CorpusTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.fixtures = self.tmp / "fixtures.json"
+        self.write_rows(ROWS)
+
+    def write_rows(self, rows: list[dict]) -> None:
+        self.fixtures.write_text(json.dumps(rows), encoding="utf-8")
+
+    def run_build(self, *extra: str) -> tuple[int, int, int]:
+        # Builds in this process, so generator_version() can be patched; returns (unchanged, rendered, pruned).
+        argv = ["gen", "--fixtures", str(self.fixtures), "--out-dir", str(self.out), "--run-tag", RUN_TAG]
+        stdout = io.StringIO()
+        with mock.patch.object(sys, "argv", [*argv, "--jobs", "1", *extra]), contextlib.redirect_stdout(stdout):
+            self.assertEqual(gen.run(gen.parse_args()), 0)
+        found = re.search(r"cache: (\d+) unchanged, (\d+) rendered, (\d+) pruned", stdout.getvalue())
+        return tuple(map(int, found.groups()))
+
+    def test_unchanged_inputs_are_not_rendered_again(self) -> None:
+        self.assertEqual(self.run_build(), (0, 4, 0))
+        first = {path.name: path.read_bytes() for path in self.out.glob("*.pdf")}
+        self.assertEqual(self.run_build(), (4, 0, 0))
+        self.assertEqual({path.name: path.read_bytes() for path in self.out.glob("*.pdf")}, first)
+        self.assertEqual(self.run_build("--force"), (0, 4, 0))
+
+    def test_an_input_or_code_change_renders_again(self) -> None:
+        self.run_build()
+        self.write_rows([ROWS[0], {**ROWS[1], "description": ROWS[1]["description"] + " Amended."}, *ROWS[2:]])
+        self.assertEqual(self.run_build(), (3, 1, 0))
+        (self.out / ROWS[2]["fileName"]).unlink()
+        self.assertEqual(self.run_build(), (3, 1, 0))
+        with mock.patch.object(gen, "generator_version", return_value="edited"):
+            self.assertEqual(self.run_build(), (0, 4, 0))
+
+    def test_a_comment_does_not_change_the_code_fingerprint(self) -> None:
+        source = gen.Path(gen.__file__).read_text(encoding="utf-8")
+        fingerprint = gen.code_fingerprint(source)
+        self.assertEqual(gen.code_fingerprint("# note\n" + source), fingerprint)
+        self.assertNotEqual(gen.code_fingerprint(source + "\nMARGIN = 41\n"), fingerprint)
+
+    def test_prune_removes_dropped_rows_and_stays_in_the_output_dir(self) -> None:
+        self.run_build()
+        outside = self.tmp / "keep.pdf"
+        outside.write_bytes(b"%PDF")
+        index = self.out / gen.CACHE_MANIFEST
+        payload = json.loads(index.read_text(encoding="utf-8"))
+        for name in ("../keep.pdf", str(outside), gen.CACHE_MANIFEST):
+            payload["entries"][name] = {"digest": "x"}
+        index.write_text(json.dumps(payload), encoding="utf-8")
+        self.write_rows(ROWS[:3])
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(self.run_build(), (3, 0, 1))
+        self.assertFalse((self.out / ROWS[3]["fileName"]).exists())
+        self.assertTrue(outside.exists())
+        self.assertIn("not pruning '../keep.pdf'", stderr.getvalue())
+        entries = json.loads(index.read_text(encoding="utf-8"))["entries"]
+        self.assertEqual(sorted(entries), sorted(row["fileName"] for row in ROWS[:3]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from support import FIXTURES, CorpusTestCase
+
+import mock_legal_generator as gen
+
+ROWS = gen.load_fixtures(FIXTURES)
+
+
+class JsonArrayTest(CorpusTestCase):
+    def write(self, text: str) -> Path:
+        path = self.tmp / "fixtures.json"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_rows_split_across_chunks_decode_whole(self) -> None:
+        path = self.write(json.dumps(ROWS, indent=2, ensure_ascii=False))
+        lines = [line for line, _, _ in gen.iter_json_array(path)]
+        for chunk_size in (1, 7, 64, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                rows = list(gen.iter_json_array(path, chunk_size))
+                self.assertEqual([row for _, row, _ in rows], ROWS)
+                self.assertEqual([line for line, _, _ in rows], lines)
+        self.assertEqual(lines[:2], [2, 2 + json.dumps(ROWS[0], indent=2).count("\n") + 1])
+
+    def test_errors_name_the_line(self) -> None:
+        rows = [json.dumps(row) for row in ROWS[:3]]
+        cases = {
+            '[\n{"a": 1},\n{"a": tru},\n{"a": 3}\n]': (3, "invalid JSON: Expecting value"),
+            '[\n{"a": 1}\n{"a": 2}\n]': (3, "expected ',' or ']' after fixture row"),
+            '[\n{"a": 1},\n{"a": "x\n"}\n]': (3, "invalid JSON: Invalid control character"),
+            '[\n{"a": 1},\n{"a": 2': (3, "invalid JSON: Expecting ',' delimiter"),
+            '[\n{"a": 1}\n] []': (3, "unexpected data after the closing ']'"),
+            '{"a": 1}': (1, "fixture file must be a JSON array"),
+        }
+        for text, (line, message) in cases.items():
+            with self.subTest(text=text):
+                *_, (error_line, row, error) = gen.iter_json_array(self.write(text), 4)
+                self.assertEqual((error_line, row), (line, None))
+                self.assertTrue(error.startswith(message), error)
+        self.assertEqual(len(list(gen.iter_json_array(self.write("[" + ",\n".join(rows) + "]"), 4))), 3)
+
+    def test_a_syntax_error_is_reported_without_reading_the_rest(self) -> None:
+        padding = ",\n".join(json.dumps(row) for row in ROWS * 2000)
+        path = self.write('[\n{"a": 1},\n{"a": ]],\n' + padding + "\n]")
+        tracemalloc.start()
+        try:
+            *_, (line, _, error) = gen.iter_json_array(path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual((line, error), (3, "invalid JSON: Expecting value"))
+        self.assertLess(peak, path.stat().st_size // 4)
+
+    def test_bad_rows_are_reported_and_good_rows_kept(self) -> None:
+        bad = {**ROWS[0], "caseTitle": " "}
+        path = self.write(json.dumps([ROWS[0], bad, 7, ROWS[1]], indent=1))
+        rows = list(gen.iter_fixtures(path))
+        self.assertEqual([fixture for _, _, fixture, _ in rows], [ROWS[0], None, None, ROWS[1]])
+        errors = [error for *_, error in rows]
+        self.assertEqual(errors, [None, "missing field 'caseTitle'", "fixture row must be an object", None])
+        with self.assertRaisesRegex(ValueError, rf"{path}:{rows[1][1]}: missing field 'caseTitle'"):
+            gen.load_fixtures(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
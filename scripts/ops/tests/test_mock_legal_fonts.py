@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+from unittest import mock
+
+from support import FIXTURES
+
+import mock_legal_generator as gen
+import mock_legal_verify
+
+RUN_TAG = "FONTS"
+ISSUE_DATE = dt.date(2026, 3, 1)
+BASE = gen.load_fixtures(FIXTURES)[0]
+RUSSIAN = {**BASE, "caseTitle": "Иванов против ООО «Дом»", "description": "Арендодатель уведомляет арендатора."}
+CHINESE = {**BASE, "caseTitle": "张三诉李四", "description": "本通知告知收件人答复期限。"}
+GREEK = {**BASE, "caseTitle": "Παπαδόπουλος κατά Νικολάου", "description": "Ο εκμισθωτής ειδοποιεί τον μισθωτή."}
+ARABIC = {**BASE, "caseTitle": "شركة السلام ضد أحمد", "description": "إشعار إلى المستأجر بموعد الإخلاء."}
+HEBREW = {**BASE, "caseTitle": "כהן נגד לוי", "description": "הודעה לשוכר על מועד הפינוי."}
+
+
+def family(fixture: dict[str, str], recipient: str = gen.DEFAULT_RECIPIENT_NAME) -> str:
+    return gen.font_family_name(fixture, recipient, gen.DEFAULT_RECIPIENT_ADDRESS)
+
+
+class FontFamilyTest(unittest.TestCase):
+    def test_family_follows_the_text_unless_the_fixture_names_one(self) -> None:
+        self.assertEqual(family(BASE), "latin")
+        self.assertEqual(family({**BASE, "caseTitle": "Müller v. Café Noël"}), "latin")
+        self.assertEqual(family(BASE, recipient="Łukasz Wróbel"), "unicode")
+        self.assertEqual(family(RUSSIAN), "unicode")
+        self.assertEqual(family(CHINESE), "chinese")
+        self.assertEqual(family({**CHINESE, "language": "ja"}), "japanese")
+        self.assertEqual(family({**CHINESE, "language": "zh-TW"}), "chinese-traditional")
+        self.assertEqual(family({**BASE, "caseTitle": "ご通知"}), "japanese")
+        self.assertEqual(family({**BASE, "caseTitle": "법원 통지서"}), "korean")
+        self.assertEqual(family({**RUSSIAN, "language": "ru"}), "unicode")
+        self.assertEqual(family({**BASE, "fontFamily": "unicode"}), "unicode")
+        self.assertEqual(family(ARABIC), "rtl")
+        self.assertEqual(family(HEBREW), "rtl")
+        self.assertEqual(family(BASE, recipient="יעקב כהן"), "rtl")
+        self.assertEqual(family({**BASE, "language": "ar"}), "rtl")
+
+    def test_fixture_font_fields_are_validated(self) -> None:
+        self.assertEqual(gen.validate_fixture({**BASE, "language": " ja "})["language"], "ja")
+        for row in ({**BASE, "fontFamily": "comic"}, {**BASE, "language": 7}, {**BASE, "fontFamily": " "}):
+            with self.assertRaises(ValueError):
+                gen.validate_fixture(row)
+
+    def test_chinese_text_wraps_between_characters(self) -> None:
+        text = "本通知告知收件人答复期限以及需要准备的相关文件和记录。" * 8
+        font = gen.embedded_font(gen.FONT_FAMILIES["chinese"]["Helvetica"])
+        lines = gen.wrap_text(text, font, 10, 200)
+        self.assertGreater(len(lines), 1)
+        self.assertEqual("".join(lines), text)
+        self.assertTrue(all(gen.word_width(line, font, 10) <= 200 for line in lines))
+
+    @unittest.skipIf(gen.missing_rtl_dependencies(), "shaping needs arabic-reshaper and python-bidi")
+    def test_right_to_left_text_is_shaped_and_drawn_in_display_order(self) -> None:
+        shaped = gen.shaped(ARABIC["caseTitle"])
+        self.assertNotEqual(shaped, ARABIC["caseTitle"])
+        self.assertTrue(all("\ufb50" <= char <= "\ufefc" or char == " " for char in shaped))
+        self.assertEqual(gen.visual(HEBREW["caseTitle"]), HEBREW["caseTitle"][::-1])
+        self.assertEqual(gen.visual(gen.shaped("Case 12")), "Case 12")
+
+    def test_shaping_libraries_are_render_inputs_of_right_to_left_jobs(self) -> None:
+        jobs = [{"run_tag": RUN_TAG, "issue_date": ISSUE_DATE, "fixture": fixture} for fixture in (BASE, ARABIC)]
+        digests = [gen.render_inputs_digest(job) for job in jobs]
+        with mock.patch.object(gen, "rtl_version", return_value="edited"):
+            self.assertEqual(gen.render_inputs_digest(jobs[0]), digests[0])
+            self.assertNotEqual(gen.render_inputs_digest(jobs[1]), digests[1])
+
+    def test_missing_shaping_packages_are_reported(self) -> None:
+        self.addCleanup(gen.rtl_modules.cache_clear)
+        gen.rtl_modules.cache_clear()
+        with mock.patch.object(gen, "missing_rtl_dependencies", return_value=["python-bidi"]):
+            with self.assertRaisesRegex(ValueError, r"needs the optional packages python-bidi \(pip install"):
+                gen.rtl_modules()
+
+    def test_missing_font_is_reported(self) -> None:
+        with mock.patch.dict(gen.FONT_FAMILIES, {"missing": {"Helvetica": "NoSuchFont-Regular"}}):
+            with self.assertRaisesRegex(ValueError, "NoSuchFont-Regular"):
+                gen.font_family("missing")
+
+
+@unittest.skipIf(mock_legal_verify.missing_dependencies(), "checking the text layer needs pypdfium2")
+class MultilingualRenderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        try:
+            gen.font_family("unicode")
+        except ValueError as exc:
+            self.skipTest(str(exc))
+
+    def verify(self, fixture: dict[str, str]) -> dict:
+        data = gen.render_to_bytes(fixture, RUN_TAG, issue_date=ISSUE_DATE, reproducible=True)
+        self.assertEqual(data, gen.render_to_bytes(fixture, RUN_TAG, issue_date=ISSUE_DATE, reproducible=True))
+        strings = {"title": fixture["caseTitle"], "description": fixture["description"]}
+        return mock_legal_verify.verify_document({"name": "doc.pdf", "data": data, "expected": {"strings": strings}})
+
+    def test_text_layer_keeps_every_script(self) -> None:
+        fixtures = [RUSSIAN, GREEK, CHINESE, {**CHINESE, "language": "ko"}, {**RUSSIAN, "packetPages": 3}]
+        if not gen.missing_rtl_dependencies():
+            fixtures += [ARABIC, HEBREW, {**ARABIC, "packetPages": 3}]
+        for fixture in fixtures:
+            with self.subTest(title=fixture["caseTitle"], packet="packetPages" in fixture):
+                self.assertEqual(self.verify(fixture)["problems"], [])
+
+    def test_subset_cache_does_not_change_the_bytes(self) -> None:
+        fixtures = (RUSSIAN, GREEK, RUSSIAN, CHINESE)
+
+        def render_all() -> list[bytes]:
+            # Fonts are registered afresh so embedded_font() wraps makeSubset with whatever cached_subsets is.
+            gen.embedded_font.cache_clear()
+            gen.font_family.cache_clear()
+            return [gen.render_to_bytes(row, RUN_TAG, issue_date=ISSUE_DATE, reproducible=True) for row in fixtures]
+
+        self.addCleanup(gen.font_family.cache_clear)
+        self.addCleanup(gen.embedded_font.cache_clear)
+
+        cached = render_all()
+        with mock.patch.object(gen, "cached_subsets", lambda make: make):
+            uncached = render_all()
+        self.assertEqual(cached, uncached)
+
+    def test_preload_registers_the_family_before_workers_fork(self) -> None:
+        from reportlab.pdfbase import pdfmetrics
+
+        job = {"fixture": RUSSIAN, "recipient_name": "A", "recipient_address": "B"}
+        gen.preload_fonts(job)
+        self.assertTrue(set(gen.FONT_FAMILIES["unicode"].values()) <= set(pdfmetrics.getRegisteredFontNames()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import collections
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from support import FIXTURES, RUN_TAG, cli
+
+import mock_legal_generator as gen
+
+
+class IdAllocatorTest(unittest.TestCase):
+    def test_every_slot_of_a_run_gets_unique_ids(self) -> None:
+        ids = gen.allocate_ids("QA20260301", range(gen.ID_SPACE))
+        for field in gen.ID_FIELDS:
+            values = {row[field] for row in ids}
+            self.assertEqual(len(values), gen.ID_SPACE, field)
+            self.assertEqual((min(values), max(values)), (100000, 999999), field)
+
+    def test_blocks_match_single_slots_and_are_reproducible(self) -> None:
+        block = gen.allocate_ids("QA20260301", range(5000, 5000 + gen.ID_BLOCK))
+        self.assertEqual(block[17], gen.allocate_ids("QA20260301", range(5017, 5018))[0])
+        self.assertNotEqual(block, gen.allocate_ids("QA20260302", range(5000, 5000 + gen.ID_BLOCK)))
+
+    def test_slots_past_the_id_space_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            gen.allocate_ids("QA20260301", range(gen.ID_SPACE - 1, gen.ID_SPACE + 1))
+
+    def test_a_corpus_stops_at_the_id_space(self) -> None:
+        fixture = gen.load_fixtures(FIXTURES)[0]
+        base = {"run_tag": "QA20260301", "issue_date": gen.run_date("QA20260301")}
+
+        def jobs(rows: int, variants: int) -> collections.deque:
+            # A list, since each variant pass iterates the fixture rows again.
+            fixtures = [(index, fixture) for index in range(rows)]
+            return collections.deque(gen.expand_jobs(fixtures, base, Path(), variants, None, "QA20260301"), maxlen=1)
+
+        [last] = jobs(gen.ID_SPACE, 1)
+        self.assertEqual(last["slot"], gen.ID_SPACE - 1)
+        with self.assertRaisesRegex(ValueError, "unique document IDs"):
+            jobs(gen.ID_SPACE + 1, 1)
+
+    def test_variants_past_the_id_space_are_a_usage_error(self) -> None:
+        rows = len(gen.load_fixtures(FIXTURES))
+        variants = gen.ID_SPACE // rows + 1
+        with tempfile.TemporaryDirectory() as out_dir:
+            args = ("--fixtures", str(FIXTURES), "--out-dir", out_dir, "--run-tag", RUN_TAG)
+            result = cli(*args, "--variants-per-fixture", str(variants))
+            self.assertEqual(list(Path(out_dir).iterdir()), [])
+        self.assertEqual(result.returncode, 2)
+        self.assertIn(f"{rows} fixture row(s) x --variants-per-fixture {variants}", result.stderr)
+
+    def test_only_a_file_that_could_overflow_is_counted_up_front(self) -> None:
+        smallest = json.dumps(dict.fromkeys(gen.FIXTURE_FIELDS, "a"), separators=(",", ":"))
+        self.assertEqual(len(smallest), gen.MIN_FIXTURE_ROW_BYTES)
+        rows = len(gen.load_fixtures(FIXTURES))
+        for variants, counted in ((1, False), (gen.ID_SPACE // rows + 1, True)):
+            argv = ["gen", "--fixtures", str(FIXTURES), "--out-dir", "out", "--run-tag", RUN_TAG]
+            argv += ["--variants-per-fixture", str(variants)]
+            with self.subTest(variants=variants), mock.patch.object(sys, "argv", argv):
+                with mock.patch.object(gen, "count_fixture_rows", return_value=0) as count:
+                    gen.parse_args()
+                self.assertEqual(count.called, counted)
+
+    def test_fixtures_sharing_a_document_type_get_distinct_numbers(self) -> None:
+        fixture = {
+            "documentType": "demand_letter",
+            "caseTitle": "Demand Letter",
+            "fileName": "demand-letter.pdf",
+            "description": "Formal demand letter.",
+        }
+        rows = [(0, fixture), (1, {**fixture, "fileName": "demand-letter-copy.pdf"})]
+        base = {"run_tag": "QA20260301", "issue_date": gen.run_date("QA20260301")}
+        jobs = list(gen.expand_jobs(rows, base, Path(), variants=3, total_docs=None, seed="QA20260301"))
+        cases = {
+            gen.document_facts(job["fixture"], job["run_tag"], job["issue_date"], job["ids"])["case_no"]
+            for job in jobs
+        }
+        self.assertEqual(len(cases), len(jobs))
+
+    def test_shards_partition_the_corpus_with_unsharded_ids(self) -> None:
+        fixtures = gen.load_fixtures(FIXTURES)
+        rows = list(enumerate(fixtures))
+        base = {"run_tag": "QA20260301", "issue_date": gen.run_date("QA20260301")}
+        full = list(gen.expand_jobs(rows, base, Path(), variants=3, total_docs=None, seed="QA20260301"))
+        shards = [
+            job
+            for index in (1, 2, 3, 4)
+            for job in gen.shard_jobs(gen.expand_jobs(rows, base, Path(), 3, None, "QA20260301"), index, 4)
+        ]
+        self.assertEqual(sorted(job["slot"] for job in shards), [job["slot"] for job in full])
+        by_slot = {job["slot"]: job for job in shards}
+        for job in full:
+            self.assertEqual(by_slot[job["slot"]]["ids"], job["ids"])
+            self.assertEqual(by_slot[job["slot"]]["fixture"], job["fixture"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import datetime as dt
+import importlib.util
+import io
+import json
+import subprocess
+import unittest
+
+from support import FIXTURES, RUN_TAG, CorpusTestCase, cli
+
+import mock_legal_generator as gen
+import mock_legal_mail_packets
+import mock_legal_verify
+
+
+@unittest.skipIf(mock_legal_verify.missing_dependencies(), "reading packets back needs pypdfium2")
+class MailPacketTest(CorpusTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.corpus = self.build()
+
+    def packets(self, out: str, *extra: str) -> subprocess.CompletedProcess:
+        return cli("mail-packets", str(self.corpus), "--manifest", str(self.manifest), "--out-dir", str(out), *extra)
+
+    def test_packets_hold_every_notice_with_a_bookmark_and_page_range(self) -> None:
+        import pypdfium2
+
+        args = ("--notices", "1,6", "--packets", "2", "--mix", "court=2,receipt=1", "--jobs", "2")
+        result = self.packets(self.tmp / "packets", *args)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        records = [json.loads(line) for line in (self.tmp / "packets" / "manifest.jsonl").read_text().splitlines()]
+        self.assertEqual([len(record["notices"]) for record in records], [1, 1, 6, 6])
+        for record in records:
+            notices = record["notices"]
+            self.assertLessEqual({notice["category"] for notice in notices}, {"court", "receipt"})
+            self.assertEqual(notices[0]["firstPage"], 1)
+            for before, after in zip(notices, notices[1:]):
+                self.assertEqual(after["firstPage"], before["lastPage"] + 1)
+            self.assertEqual(notices[-1]["lastPage"], record["pages"])
+
+            document = pypdfium2.PdfDocument(self.tmp / "packets" / record["fileName"])
+            try:
+                self.assertEqual(len(document), record["pages"])
+                bookmarks = [bookmark.get_dest().get_index() for bookmark in document.get_toc()]
+                self.assertEqual(bookmarks, [notice["firstPage"] - 1 for notice in notices])
+                for notice in notices:
+                    text = document[notice["firstPage"] - 1].get_textpage().get_text_range()
+                    self.assertIn(notice["noticeNumber"], text)
+            finally:
+                document.close()
+
+        again = self.packets(self.tmp / "again", *args)
+        self.assertEqual(again.returncode, 0, again.stderr)
+        manifests = [(self.tmp / out / "manifest.jsonl").read_text() for out in ("packets", "again")]
+        self.assertEqual(manifests[0], manifests[1])
+
+    def test_a_changed_notice_fails_its_packet(self) -> None:
+        first = json.loads(self.manifest.read_text().splitlines()[0])
+        (self.corpus / first["fileName"]).write_bytes(gen.render_to_bytes(gen.load_fixtures(FIXTURES)[1], RUN_TAG))
+        result = self.packets(self.tmp / "packets", "--notices", "3", "--mix", f"{first['category']}=1", "--jobs", "1")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("changed since the manifest was written", result.stderr)
+        self.assertEqual(list((self.tmp / "packets").glob("*.pdf")), [])
+
+    @unittest.skipIf(importlib.util.find_spec("PIL") is None, "needs Pillow for a scanned PDF")
+    def test_writer_joins_reportlab_and_pillow_output(self) -> None:
+        import pypdfium2
+        from PIL import Image
+
+        scan = io.BytesIO()
+        Image.new("L", (60, 80), 255).save(scan, "PDF", save_all=True, append_images=[Image.new("L", (60, 80), 200)])
+        notice = gen.render_to_bytes(gen.load_fixtures(FIXTURES)[0], RUN_TAG, issue_date=dt.date(2026, 3, 1))
+        out = io.BytesIO()
+        writer = mock_legal_mail_packets.PacketWriter(out)
+        self.assertEqual(writer.add(notice, "Première notice"), (1, 2))
+        self.assertEqual(writer.add(scan.getvalue(), "法院通知"), (3, 4))
+        writer.close("packet")
+        document = pypdfium2.PdfDocument(out.getvalue())
+        try:
+            self.assertEqual(len(document), 4)
+            self.assertEqual([bookmark.get_title() for bookmark in document.get_toc()], ["Première notice", "法院通知"])
+        finally:
+            document.close()
+
+
+class CorruptSourceTest(CorpusTestCase):
+    def test_a_malformed_cross_reference_table_fails_only_its_packet(self) -> None:
+        good = gen.render_to_bytes(gen.load_fixtures(FIXTURES)[0], RUN_TAG, issue_date=dt.date(2026, 3, 1))
+        xref = good.rindex(b"\nxref\n") + 1
+        sources = {
+            "good.pdf": good,
+            "letters.pdf": good[: xref + 5] + b"zero " + good[xref + 7 :],
+            "short.pdf": good[: xref + 5] + b"0 9999\n" + good[good.index(b"\n", xref + 5) + 1 :],
+        }
+        for name, data in sources.items():
+            (self.tmp / name).write_bytes(data)
+        outcomes = {}
+        for name in sources:
+            notices = [{"path": self.tmp / "good.pdf", "title": "first"}, {"path": self.tmp / name, "title": name}]
+            item = {"name": f"packet-{name}", "path": self.tmp / f"packet-{name}", "notices": notices}
+            outcomes[name] = mock_legal_mail_packets.assemble_packet(item)
+        self.assertIsNone(outcomes["good.pdf"]["error"])
+        for name in ("letters.pdf", "short.pdf"):
+            self.assertEqual(outcomes[name]["error"], f"{name}: malformed cross-reference table")
+            self.assertFalse((self.tmp / f"packet-{name}").exists())
+
+
+class ManifestErrorTest(CorpusTestCase):
+    def test_a_bad_build_manifest_is_a_usage_error(self) -> None:
+        args = ("mail-packets", str(self.tmp), "--manifest", str(self.manifest), "--out-dir", str(self.out))
+        missing = cli(*args)
+        self.assertEqual(missing.returncode, 2)
+        self.assertIn("manifest.jsonl is not a file", missing.stderr)
+        record = {"fileName": "notice.pdf", "category": "court"}
+        for line, problem in (
+            ("{not json", "not JSON"),
+            ("[1, 2]", "not an object"),
+            (json.dumps({"fileName": "notice.pdf"}), "no category"),
+            (json.dumps({**record, "category": ["court"]}), "a list category"),
+        ):
+            self.manifest.write_text(json.dumps(record) + "\n\n" + line + "\n")
+            result = cli(*args)
+            with self.subTest(problem):
+                self.assertEqual(result.returncode, 2)
+                self.assertIn("manifest.jsonl:3: not a manifest record", result.stderr)
+                self.assertNotIn("Traceback", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import io
+import json
+import unittest
+from pathlib import Path
+
+from support import CorpusTestCase, cli
+
+import mock_legal_generator as gen
+
+
+class MergeTest(CorpusTestCase):
+    def shard_manifest(self, name: str, shard: object, indexes: range) -> Path:
+        path = self.tmp / name
+        path.write_text("".join(json.dumps({"index": index, "shard": shard}) + "\n" for index in indexes))
+        return path
+
+    def merge(self, *paths: Path, expect_docs: int | None = None) -> tuple[list[int], list[str]]:
+        out = io.BytesIO()
+        merged, problems = gen.merge_manifests(list(paths), out, expect_docs)
+        indexes = [json.loads(line)["index"] for line in out.getvalue().splitlines()]
+        self.assertEqual(merged, len(indexes))
+        return indexes, problems
+
+    def test_shards_join_in_index_order(self) -> None:
+        second = self.shard_manifest("b.jsonl", "2/2", range(1, 9, 2))
+        first = self.shard_manifest("a.jsonl", "1/2", range(0, 9, 2))
+        self.assertEqual(self.merge(second, first, expect_docs=9), (list(range(9)), []))
+
+    def test_a_missing_shard_is_reported(self) -> None:
+        indexes, problems = self.merge(self.shard_manifest("a.jsonl", "1/3", range(0, 6, 3)))
+        self.assertEqual(indexes, [0, 3])
+        self.assertIn("no manifest for shard(s) 2/3, 3/3", problems)
+
+    def test_bad_shard_labels_are_problems_not_crashes(self) -> None:
+        good = self.shard_manifest("a.jsonl", "1/2", range(0, 6, 2))
+        for label in ("2/x", "3/2", "0/2", "2", 2, ["2", "2"]):
+            with self.subTest(label=label):
+                bad = self.shard_manifest("b.jsonl", label, range(1, 6, 2))
+                indexes, problems = self.merge(good, bad)
+                self.assertEqual(indexes, [0, 2, 4])
+                self.assertIn(f"{bad}:1: shard {label!r} is not I/N with 1 <= I <= N", problems)
+
+    def test_cli_reports_a_bad_label(self) -> None:
+        good = self.shard_manifest("a.jsonl", "1/2", range(0, 6, 2))
+        bad = self.shard_manifest("b.jsonl", "two/2", range(1, 6, 2))
+        out = self.tmp / "merged.jsonl"
+        result = cli("merge", str(good), str(bad), "--out", str(out))
+        self.assertEqual(result.returncode, 1)
+        self.assertNotIn("Traceback", result.stderr)
+        self.assertIn("shard 'two/2' is not I/N", result.stderr)
+        self.assertFalse(out.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import random
+import statistics
+import unittest
+
+import support  # noqa: F401
+
+import mock_legal_metrics
+
+
+class HistogramTest(unittest.TestCase):
+    def test_quantiles_match_the_exact_sample_quantiles(self) -> None:
+        rng = random.Random(7)
+        sample = [rng.lognormvariate(-3, 0.8) for _ in range(2000)]
+        histogram = mock_legal_metrics.Histogram()
+        for value in sample:
+            histogram.add(value)
+        cuts = statistics.quantiles(sample, n=100, method="inclusive")
+        for q in mock_legal_metrics.QUANTILES:
+            with self.subTest(q=q):
+                exact = cuts[round(q * 100) - 1]
+                self.assertLessEqual(abs(histogram.quantile(q) / exact - 1), mock_legal_metrics.HISTOGRAM_GROWTH - 1)
+        self.assertEqual(histogram.count, len(sample))
+        self.assertAlmostEqual(histogram.total, sum(sample))
+        self.assertEqual(histogram.max, max(sample))
+        self.assertEqual(histogram.quantile(1), max(sample))
+
+    def test_an_empty_histogram_reports_zero(self) -> None:
+        histogram = mock_legal_metrics.Histogram()
+        self.assertEqual(histogram.quantile(0.5), 0)
+        self.assertEqual(histogram.summary()["count"], 0)
+
+
+class PrometheusTest(unittest.TestCase):
+    def test_text_exposition_lines(self) -> None:
+        metrics = mock_legal_metrics.RunMetrics()
+        metrics.add({"error": "", "bytes": 1500, "spans": {"draw": 0.25, "save": 0.125}}, cached=False)
+        metrics.add({"error": "", "bytes": 1500}, cached=True)
+        metrics.add({"error": "boom"}, cached=False)
+        self.assertEqual(
+            metrics.to_prometheus({"expand jobs": 0.5}).splitlines(),
+            [
+                "# HELP mock_legal_documents_total Documents in the run by outcome.",
+                "# TYPE mock_legal_documents_total counter",
+                'mock_legal_documents_total{outcome="rendered"} 1',
+                'mock_legal_documents_total{outcome="cached"} 1',
+                'mock_legal_documents_total{outcome="failed"} 1',
+                "# HELP mock_legal_stage_seconds Per-document render stage duration.",
+                "# TYPE mock_legal_stage_seconds summary",
+                'mock_legal_stage_seconds{stage="draw",quantile="0.5"} 0.25',
+                'mock_legal_stage_seconds{stage="draw",quantile="0.9"} 0.25',
+                'mock_legal_stage_seconds{stage="draw",quantile="0.99"} 0.25',
+                'mock_legal_stage_seconds_sum{stage="draw"} 0.25',
+                'mock_legal_stage_seconds_count{stage="draw"} 1',
+                'mock_legal_stage_seconds{stage="save",quantile="0.5"} 0.125',
+                'mock_legal_stage_seconds{stage="save",quantile="0.9"} 0.125',
+                'mock_legal_stage_seconds{stage="save",quantile="0.99"} 0.125',
+                'mock_legal_stage_seconds_sum{stage="save"} 0.125',
+                'mock_legal_stage_seconds_count{stage="save"} 1',
+                "# HELP mock_legal_document_bytes Size of each rendered or cached document.",
+                "# TYPE mock_legal_document_bytes summary",
+                'mock_legal_document_bytes{quantile="0.5"} 1500',
+                'mock_legal_document_bytes{quantile="0.9"} 1500',
+                'mock_legal_document_bytes{quantile="0.99"} 1500',
+                "mock_legal_document_bytes_sum 3000",
+                "mock_legal_document_bytes_count 2",
+                "# HELP mock_legal_run_stage_seconds Wall time of each run-level stage.",
+                "# TYPE mock_legal_run_stage_seconds gauge",
+                'mock_legal_run_stage_seconds{stage="expand jobs"} 0.5',
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
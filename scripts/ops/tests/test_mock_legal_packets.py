@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import re
+import unittest
+
+from support import FIXTURES, RUN_TAG, CorpusTestCase, cli
+
+import mock_legal_generator as gen
+
+ROWS = gen.load_fixtures(FIXTURES)
+NOTICE = next(row for row in ROWS if gen.DOC_CATEGORY.get(row["documentType"]) != "receipt")
+RECEIPT = next(row for row in ROWS if gen.DOC_CATEGORY.get(row["documentType"]) == "receipt")
+
+
+def render(pages: int, output_profile: str = "default") -> tuple[bytes, dict]:
+    fixture = {**NOTICE, "packetPages": pages}
+    return gen.render_document(fixture, RUN_TAG, dt.date(2026, 3, 1), "A", "B", output_profile=output_profile)
+
+
+class PacketPagesTest(CorpusTestCase):
+    def test_packets_have_exactly_the_pages_asked_for(self) -> None:
+        for pages, output_profile in ((2, "default"), (5, "default"), (40, "default"), (3, "embedded-font")):
+            with self.subTest(pages=pages, output_profile=output_profile):
+                data, facts = render(pages, output_profile)
+                self.assertEqual(facts["pages"], pages)
+                self.assertEqual(re.findall(rb"/Count (\d+)", data), [str(pages).encode()])
+
+    def test_an_enclosure_page_needs_a_third_page(self) -> None:
+        with self.assertRaisesRegex(ValueError, "'packetPages' must be at least 3 with an enclosure page"):
+            render(2, "embedded-font")
+        fixtures = self.tmp / "fixtures.json"
+        fixtures.write_text(json.dumps([{**NOTICE, "packetPages": 2}, ROWS[1]]), encoding="utf-8")
+        args = ["--fixtures", str(fixtures), "--out-dir", str(self.out), "--run-tag", RUN_TAG, "--jobs", "1"]
+        result = cli(*args, "--size-profile", "embedded-font")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn(f"{NOTICE['fileName']}: ValueError: 'packetPages' must be at least 3", result.stderr)
+        self.assertTrue((self.out / ROWS[1]["fileName"]).is_file())
+
+    def test_packet_pages_are_validated(self) -> None:
+        for pages in (1, gen.MAX_PACKET_PAGES + 1, True, "5"):
+            with self.subTest(pages=pages), self.assertRaisesRegex(ValueError, "'packetPages' must be an integer"):
+                gen.validate_fixture({**NOTICE, "packetPages": pages})
+        with self.assertRaisesRegex(ValueError, "not supported for receipts"):
+            gen.validate_fixture({**RECEIPT, "packetPages": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import time
+import unittest
+from unittest import mock
+
+from support import OPS
+
+import mock_legal_generator as gen
+
+spec = importlib.util.spec_from_file_location("update_mock_legal_golden", OPS / "update-mock-legal-golden.py")
+golden = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(golden)
+
+
+def category_fixture(category: str) -> dict[str, str]:
+    return next(
+        fixture
+        for fixture in golden.golden_fixtures()["bundled"]
+        if gen.DOC_CATEGORY.get(fixture["documentType"], "general") == category
+    )
+
+
+class ReproducibleOutputTest(unittest.TestCase):
+    def test_golden_hashes(self) -> None:
+        # Byte-for-byte output of every bundled template; after an intended change run update-mock-legal-golden.py.
+        recorded = json.loads(golden.GOLDEN.read_text(encoding="utf-8"))
+        if recorded["reportlab"] != gen.reportlab_version():
+            self.skipTest(f"golden hashes were recorded with reportlab {recorded['reportlab']}")
+        self.assertEqual((recorded["runTag"], recorded["issueDate"]), (golden.RUN_TAG, golden.ISSUE_DATE.isoformat()))
+        for group, hashes in golden.golden_hashes().items():
+            with self.subTest(group=group):
+                self.assertEqual(hashes, recorded[group])
+
+    def test_identical_inputs_give_identical_bytes_at_any_time(self) -> None:
+        from reportlab import rl_config
+
+        settings = (rl_config.invariant, os.environ.get("SOURCE_DATE_EPOCH"))
+        fixture = category_fixture("housing")
+        first = golden.render(fixture)
+        with mock.patch.object(time, "time", return_value=time.time() + 86400 * 400):
+            self.assertEqual(golden.render(fixture), first)
+        self.assertIn(b"D:20260301000000", first)
+        # The pinned clock is scoped to each render.
+        self.assertEqual((rl_config.invariant, os.environ.get("SOURCE_DATE_EPOCH")), settings)
+
+    def test_reproducible_output_needs_a_date(self) -> None:
+        with self.assertRaises(ValueError):
+            gen.render_to_bytes(category_fixture("court"), golden.RUN_TAG, reproducible=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
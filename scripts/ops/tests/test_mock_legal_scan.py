@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import datetime as dt
+import io
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from support import FIXTURES, OPS
+
+import mock_legal_generator as gen
+import mock_legal_mail_packets
+import mock_legal_scan
+
+RUN_TAG = "SCAN"
+ISSUE_DATE = dt.date(2026, 3, 1)
+FIXTURE = gen.load_fixtures(FIXTURES)[0]
+# Scans a packet of argv[1] pages to an image PDF and prints the process's peak RSS in KiB.
+PEAK_RSS = """
+import datetime as dt, resource, sys
+sys.path.insert(0, {ops!r})
+import mock_legal_generator as gen, mock_legal_scan
+fixture = {{**gen.load_fixtures(gen.Path({fixtures!r}))[0], "packetPages": int(sys.argv[1])}}
+pdf = gen.render_to_bytes(fixture, "SCAN", issue_date=dt.date(2026, 3, 1))
+data, pages = mock_legal_scan.scan_document(pdf, "pdf", "clean", 150, "seed", clock=0)
+assert pages == int(sys.argv[1]), pages
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+# Peak RSS a scan may add for 16 more pages: their encoded output, well short of one page image (~6 MB) each.
+PAGE_GROWTH_KIB = 40 << 10
+
+
+def packet(pages: int) -> bytes:
+    return gen.render_to_bytes({**FIXTURE, "packetPages": pages}, RUN_TAG, issue_date=ISSUE_DATE)
+
+
+def peak_rss(pages: int) -> int:
+    code = PEAK_RSS.format(ops=str(OPS), fixtures=str(FIXTURES))
+    result = subprocess.run([sys.executable, "-c", code, str(pages)], capture_output=True, text=True)
+    if result.returncode:
+        raise AssertionError(result.stderr)
+    return int(result.stdout)
+
+
+@unittest.skipIf(mock_legal_scan.missing_dependencies(), "scanning needs numpy, Pillow and pypdfium2")
+class ScanTest(unittest.TestCase):
+    def test_image_pdf_holds_every_page_across_batches(self) -> None:
+        import pypdfium2
+
+        pages = 2 * mock_legal_scan.SCAN_BATCH_PAGES + 1
+        data, count = mock_legal_scan.scan_document(packet(pages), "pdf", "office", 72, "seed", clock=0)
+        self.assertEqual(count, pages)
+        again, _ = mock_legal_scan.scan_document(packet(pages), "pdf", "office", 72, "seed", clock=0)
+        self.assertEqual(again, data)
+        document = pypdfium2.PdfDocument(data)
+        try:
+            self.assertEqual(len(document), pages)
+            self.assertEqual([round(size) for size in document[pages - 1].get_size()], [612, 792])
+        finally:
+            document.close()
+        # Mail packets copy scans as they are, so the writer's output must be readable by the packet assembler.
+        writer = mock_legal_mail_packets.PacketWriter(io.BytesIO())
+        self.assertEqual(writer.add(data, "scan"), (1, pages))
+
+    def test_image_formats_hold_the_first_page(self) -> None:
+        from PIL import Image
+
+        for fmt, kind in (("png", "PNG"), ("jpeg", "JPEG")):
+            data, count = mock_legal_scan.scan_document(packet(3), fmt, "phone", 72, "seed")
+            self.assertEqual(count, 1)
+            self.assertEqual(Image.open(io.BytesIO(data)).format, kind)
+
+    def test_peak_memory_does_not_grow_with_the_page_count(self) -> None:
+        small = peak_rss(2 * mock_legal_scan.SCAN_BATCH_PAGES)
+        large = peak_rss(6 * mock_legal_scan.SCAN_BATCH_PAGES)
+        self.assertLess(large - small, PAGE_GROWTH_KIB, f"{small} KiB for 8 pages, {large} KiB for 24")
+
+
+class ScanDigestTest(unittest.TestCase):
+    def test_scan_code_and_libraries_are_render_inputs(self) -> None:
+        base = {"run_tag": RUN_TAG, "issue_date": ISSUE_DATE, "output_path": Path("doc.pdf"), "fixture": FIXTURE}
+        scanned = gen.scan_job(base, "pdf", "office", 150)
+        digests = [gen.render_inputs_digest(base), gen.render_inputs_digest(scanned)]
+        with mock.patch.object(gen, "scan_version", return_value="edited"):
+            self.assertEqual(gen.render_inputs_digest(base), digests[0])
+            self.assertNotEqual(gen.render_inputs_digest(scanned), digests[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
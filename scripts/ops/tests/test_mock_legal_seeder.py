@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from support import FIXTURES, OPS
+
+CLI = OPS / "seed-mock-legal-load.py"
+
+spec = importlib.util.spec_from_file_location("seed_mock_legal_load", CLI)
+seeder = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(seeder)
+
+
+def offsets(spec: str, count: int) -> list[float]:
+    arrivals = seeder.arrival_offsets(seeder.parse_arrival(spec), random.Random(1))
+    return [at for _, at in zip(range(count), arrivals)]
+
+
+class ArrivalTest(unittest.TestCase):
+    def test_arrival_specs(self) -> None:
+        self.assertEqual(seeder.parse_arrival("burst:20:0.5"), ("burst", (20.0, 0.5)))
+        for bad in ("constant", "poisson:0", "burst:2.5:1", "ramp:3", "constant:fast"):
+            with self.assertRaises(ValueError, msg=bad):
+                seeder.parse_arrival(bad)
+
+    def test_offsets(self) -> None:
+        self.assertEqual(offsets("constant:4", 3), [0.0, 0.25, 0.5])
+        self.assertEqual(offsets("burst:2:1.5", 5), [0.0, 0.0, 1.5, 1.5, 3.0])
+        poisson = offsets("poisson:100", 4000)
+        self.assertAlmostEqual(len(poisson) / poisson[-1], 100, delta=8)
+
+
+async def read_request(reader: asyncio.StreamReader) -> bytes:
+    head = await reader.readuntil(b"\r\n\r\n")
+    return head + await reader.readexactly(int(re.search(rb"Content-Length: (\d+)", head).group(1)))
+
+
+def response(body: bytes = b"{}", head: str = "HTTP/1.1 200 OK") -> bytes:
+    return f"{head}\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+
+
+async def with_server(handle, client) -> None:
+    # Runs client(url) against an asyncio server whose connections are handled by handle(reader, writer).
+    async def guarded(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(guarded, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    async with server:
+        await client(f"http://{host}:{port}")
+
+
+class HttpPoolTest(unittest.TestCase):
+    def test_an_idle_connection_the_server_closed_is_retried(self) -> None:
+        received = []
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            received.append(await read_request(reader))
+            writer.write(response())
+            await writer.drain()
+
+        async def client(url: str) -> None:
+            http = seeder.HttpPool(2, 5)
+            self.assertEqual((await http.request("POST", url + "/cases", {}))[0], 200)
+            await asyncio.sleep(0.05)
+            self.assertEqual((await http.request("POST", url + "/cases", {}))[0], 200)
+            self.assertEqual(http.opened, 2)
+            await http.close()
+
+        asyncio.run(with_server(handle, client))
+        self.assertEqual(len(received), 2)
+
+    def test_a_post_that_got_part_of_a_response_is_not_sent_again(self) -> None:
+        received = []
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            received.append(await read_request(reader))
+            writer.write(response())
+            received.append(await read_request(reader))
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Len")
+            await writer.drain()
+
+        async def client(url: str) -> None:
+            http = seeder.HttpPool(2, 5)
+            await http.request("POST", url + "/cases", {})
+            with self.assertRaisesRegex(seeder.SeedError, "during the response"):
+                await http.request("POST", url + "/cases", {})
+            await http.close()
+
+        asyncio.run(with_server(handle, client))
+        self.assertEqual(len(received), 2)
+
+    def test_malformed_responses_are_seed_errors(self) -> None:
+        replies = {
+            "/status": b"garbage\r\n\r\n",
+            "/length": b"HTTP/1.1 200 OK\r\nContent-Length: many\r\n\r\n",
+            "/chunk": b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n",
+            "/head": response(head="HTTP/1.1 200 OK\r\nX-Pad: " + "x" * seeder.MAX_HEADER_BYTES),
+        }
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            path = (await read_request(reader)).split(b" ")[1].decode()
+            writer.write(replies[path])
+            await writer.drain()
+
+        async def client(url: str) -> None:
+            http = seeder.HttpPool(1, 5)
+            for path, message in (
+                ("/status", "bad status line"),
+                ("/length", "malformed response"),
+                ("/chunk", "malformed response"),
+                ("/head", f"response head over {seeder.MAX_HEADER_BYTES} bytes"),
+            ):
+                with self.subTest(path=path), self.assertRaisesRegex(seeder.SeedError, message):
+                    await http.request("GET", url + path, {})
+            await http.close()
+
+        asyncio.run(with_server(handle, client))
+
+    def test_a_case_without_an_id_fails_that_document(self) -> None:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            while True:
+                await read_request(reader)
+                writer.write(response(b'{"title": "no id"}'))
+                await writer.drain()
+
+        async def client(url: str) -> None:
+            args = argparse.Namespace(connections=1, timeout=5.0, concurrency=1, subject="s", email="e@example.com")
+            fixtures = list(enumerate(seeder.gen.load_fixtures(FIXTURES)))[:1]
+            base = {
+                "run_tag": "SEED",
+                "issue_date": seeder.gen.run_date("SEED"),
+                "recipient_name": seeder.gen.DEFAULT_RECIPIENT_NAME,
+                "recipient_address": seeder.gen.DEFAULT_RECIPIENT_ADDRESS,
+            }
+            [job] = seeder.gen.expand_jobs(fixtures, base, Path(), None, 1, "SEED")
+            with ThreadPoolExecutor(1) as pool:
+                seed = seeder.Seeder(args, url, pool)
+                await seed.seed(job, 0.0)
+                await seed.http.close()
+            self.assertEqual(seed.metrics.counts["failed"], 1)
+            self.assertIn("create: no id in {'title': 'no id'}", seed.errors[0])
+
+        asyncio.run(with_server(handle, client))
+
+
+class SeedCorpusTest(unittest.TestCase):
+    def seed_corpus(self, arrival: str, concurrency: int) -> tuple[int, list[float | None]]:
+        # Runs seed_corpus with each document's flow replaced by a short sleep; returns the most documents in
+        # flight at once and each document's arrival time.
+        live, peak, arrivals = 0, 0, []
+
+        async def seed(_, job: dict, arrived: float | None) -> None:
+            nonlocal live, peak
+            live += 1
+            peak = max(peak, live)
+            arrivals.append(arrived)
+            await asyncio.sleep(0.002)
+            live -= 1
+
+        async def grant(*_) -> None:
+            pass
+
+        args = argparse.Namespace(
+            fixtures=str(FIXTURES), run_tag="SEED", seed=None, docs=40, jobs=1, connections=1, timeout=5.0,
+            concurrency=concurrency, subject="s", email="e@example.com", arrival=seeder.parse_arrival(arrival),
+        )
+        with mock.patch.object(seeder, "MAX_PENDING", 5):
+            with mock.patch.multiple(seeder.Seeder, seed=seed, grant_entitlement=grant):
+                asyncio.run(seeder.seed_corpus(args, "http://127.0.0.1:9"))
+        return peak, arrivals
+
+    def test_closed_mode_runs_one_document_per_slot(self) -> None:
+        peak, arrivals = self.seed_corpus("closed", 3)
+        self.assertEqual((peak, len(arrivals)), (3, 40))
+        self.assertEqual(set(arrivals), {None})
+
+    def test_open_arrivals_keep_a_bounded_backlog(self) -> None:
+        peak, arrivals = self.seed_corpus("burst:40:1", 1)
+        self.assertEqual((peak, len(arrivals)), (5, 40))
+        self.assertEqual(len(set(arrivals)), 1)
+
+
+class StubSeedTest(unittest.TestCase):
+    def test_seeds_the_stub_through_the_whole_flow(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = Path(tmp) / "seed.json"
+            result = subprocess.run(
+                [sys.executable, str(CLI), "--stub", "--docs", "30", "--jobs", "1", "--report", str(report)],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            summary = json.loads(report.read_text(encoding="utf-8"))
+        self.assertEqual(summary["documents"], {"rendered": 30, "cached": 0, "failed": 0})
+        for stage in ("queue", "render", *seeder.FLOW_STAGES, "total"):
+            self.assertEqual(summary["stages"][stage]["count"], 30, stage)
+        # Closed mode: a document arrives when it gets a slot, so its total is the sum of its own stages.
+        self.assertEqual(summary["stages"]["queue"]["maxMs"], 0)
+        stages = sum(summary["stages"][stage]["totalMs"] for stage in ("render", *seeder.FLOW_STAGES))
+        self.assertAlmostEqual(summary["stages"]["total"]["totalMs"], stages, delta=stages * 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
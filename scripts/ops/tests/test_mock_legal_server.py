@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import base64
+import importlib.util
+import json
+import subprocess
+import sys
+import unittest
+
+from support import FIXTURES, OPS, RUN_TAG
+
+SERVER = OPS / "serve-mock-legal-generator.py"
+LISTED = "summons_complaint"
+
+spec = importlib.util.spec_from_file_location("serve_mock_legal_generator", SERVER)
+serve = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(serve)
+UNLISTED = {**serve.gen.load_fixtures(FIXTURES)[0], "documentType": "unlisted"}
+
+
+def request(request_id: int | None, method: str, **params: object) -> str:
+    message = {"jsonrpc": "2.0", "method": method, "params": params}
+    if request_id is not None:
+        message["id"] = request_id
+    return json.dumps(message) + "\n"
+
+
+class StdioServerTest(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        lines = [
+            request(1, "render", documentType=LISTED),
+            request(2, "render", documentType=LISTED, variant=2),
+            request(3, "render", runTag=RUN_TAG),
+            request(4, "render", fixture=UNLISTED, variant=1),
+            "{not json\n",
+            request(5, "nope"),
+            request(6, "ping"),
+            request(None, "render", documentType=LISTED),
+            request(7, "shutdown"),
+            request(8, "ping"),
+        ]
+        server = subprocess.run(
+            [sys.executable, str(SERVER), "--run-tag", RUN_TAG, "--jobs", "1"],
+            input="".join(lines),
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        self.assertEqual(server.returncode, 0, server.stderr)
+        replies = {reply["id"]: reply for reply in map(json.loads, server.stdout.splitlines())}
+        # The notification gets no reply and nothing after shutdown is read, but accepted renders still finish.
+        self.assertEqual(sorted(replies, key=str), [1, 2, 3, 4, 5, 6, 7, None])
+        self.assertIn("served 3 render request(s)", server.stderr)
+
+        for request_id in (1, 2):
+            result = replies[request_id]["result"]
+            data = base64.b64decode(result["pdfBase64"])
+            self.assertTrue(data.startswith(b"%PDF-"))
+            self.assertEqual(result["bytes"], len(data))
+        self.assertNotEqual(replies[1]["result"]["sha256"], replies[2]["result"]["sha256"])
+        self.assertEqual(replies[3]["error"]["code"], -32602)
+        self.assertEqual(replies[4]["error"]["code"], -32602)
+        self.assertIn("'unlisted'", replies[4]["error"]["message"])
+        self.assertEqual(replies[None]["error"]["code"], -32700)
+        self.assertEqual(replies[5]["error"]["code"], -32601)
+        self.assertGreater(replies[6]["result"]["fixtures"], 0)
+        self.assertIsNone(replies[7]["result"])
+
+    def test_a_stopped_pool_answers_with_an_error(self) -> None:
+        dispatcher = serve.Dispatcher(serve.gen.load_fixtures(FIXTURES), RUN_TAG, 1)
+        dispatcher.close()
+        replies = []
+        dispatcher.handle(request(1, "render", documentType=LISTED), replies.append)
+        self.assertEqual(replies[0]["error"]["code"], serve.RENDER_FAILED)
+
+
+if __name__ == "__main__":
+    unittest.main()
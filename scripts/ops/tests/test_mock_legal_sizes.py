@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import datetime as dt
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import support
+
+import mock_legal_generator as gen
+
+RUN_TAG = "SIZES"
+ISSUE_DATE = dt.date(2026, 3, 1)
+FIXTURES = gen.load_fixtures(support.FIXTURES)
+NOTICE = FIXTURES[0]
+
+
+def render(fixture: dict[str, str], profile: str = "default", target: int | None = None) -> tuple[bytes, int]:
+    recipient = (gen.DEFAULT_RECIPIENT_NAME, gen.DEFAULT_RECIPIENT_ADDRESS)
+    data, facts = gen.render_document(
+        fixture, RUN_TAG, ISSUE_DATE, *recipient, output_profile=profile, target_bytes=target, reproducible=True
+    )
+    return data, facts["pages"]
+
+
+class SizeTargetTest(unittest.TestCase):
+    def test_targets_land_within_min_padding(self) -> None:
+        for profile in gen.OUTPUT_PROFILES:
+            natural = len(render(NOTICE, profile)[0])
+            for target in (natural + 40_000, 3 * natural + 100_000, 2 << 20):
+                with self.subTest(profile=profile, target=target):
+                    data, pages = render(NOTICE, profile, target)
+                    self.assertLessEqual(abs(len(data) - target), gen.MIN_PADDING)
+                    self.assertEqual(pages, 3)
+
+    def test_documents_above_their_target_are_left_alone(self) -> None:
+        plain, pages = render(NOTICE, "compact")
+        self.assertEqual(render(NOTICE, "compact", target=1024), (plain, pages))
+
+    def test_distributions_draw_reproducible_targets_in_range(self) -> None:
+        distribution = gen.parse_size_distribution("uniform:80k:2M")
+        job = {"output_path": Path("a.pdf")}
+        targets = {gen.size_job(job, "compact", distribution, RUN_TAG)["target_bytes"] for _ in range(3)}
+        self.assertEqual(len(targets), 1)
+        self.assertTrue(80 << 10 <= targets.pop() <= 2 << 20)
+        for bad in ("uniform:2M:80k", "lognormal:80k:9", "choice:", "12q"):
+            with self.assertRaises(ValueError, msg=bad):
+                gen.parse_size_distribution(bad)
+
+
+class SizeProfileTest(unittest.TestCase):
+    def test_enclosure_page_counts_towards_packet_pages(self) -> None:
+        for profile in ("embedded-font", "scanned-enclosure"):
+            for pages in (3, 7):
+                with self.subTest(profile=profile, pages=pages):
+                    self.assertEqual(render({**NOTICE, "packetPages": pages}, profile)[1], pages)
+            with self.assertRaisesRegex(ValueError, "at least 3"):
+                render({**NOTICE, "packetPages": 2}, profile)
+        self.assertEqual(render({**NOTICE, "packetPages": 3}, "compact", target=400_000)[1], 3)
+        with self.assertRaisesRegex(ValueError, "at least 3"):
+            render({**NOTICE, "packetPages": 2}, "compact", target=400_000)
+
+    def test_ascii85_is_chosen_per_document(self) -> None:
+        from reportlab import rl_config
+
+        setting = rl_config.useA85
+        self.assertIn(b"/ASCII85Decode", render(NOTICE, "default")[0])
+        self.assertNotIn(b"/ASCII85Decode", render(NOTICE, "compact")[0])
+        self.assertEqual(rl_config.useA85, setting)
+
+    def test_threads_render_the_same_bytes(self) -> None:
+        jobs = [(fixture, profile) for fixture in FIXTURES[:4] for profile in ("default", "compact", "uncompressed")]
+        expected = [render(fixture, profile) for fixture, profile in jobs]
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            for _ in range(3):
+                self.assertEqual(list(pool.map(lambda job: render(*job), jobs)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
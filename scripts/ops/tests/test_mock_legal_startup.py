@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from support import CLI, FIXTURES, OPS, RUN_TAG
+
+# Modules only a render (or an archive sink) needs. Paths that render nothing must finish without loading any.
+RENDER_ONLY_MODULES = (
+    "reportlab",
+    "reportlab.lib.colors",
+    "reportlab.pdfbase.pdfmetrics",
+    "reportlab.pdfgen.canvas",
+    "concurrent.futures.process",
+    "zipfile",
+    "tarfile",
+)
+# Runs the CLI in-process and writes the names in sys.modules to the file named by the first argument on exit.
+DRIVER = """
+import json, runpy, sys
+modules_path, sys.argv = sys.argv[1], sys.argv[2:]
+sys.path.insert(0, {ops!r})
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+finally:
+    with open(modules_path, "w") as out:
+        json.dump(sorted(sys.modules), out)
+"""
+
+
+def run_cli(*args: str) -> tuple[subprocess.CompletedProcess, set[str]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        modules_path = Path(tmp) / "modules.json"
+        driver = DRIVER.format(ops=str(OPS))
+        result = subprocess.run(
+            [sys.executable, "-c", driver, str(modules_path), str(CLI), *args], capture_output=True, text=True
+        )
+        return result, set(json.loads(modules_path.read_text()))
+
+
+class LightStartupTest(unittest.TestCase):
+    def assert_light_start(self, modules: set[str]) -> None:
+        self.assertIn("mock_legal_generator", modules)
+        loaded = [name for name in RENDER_ONLY_MODULES if name in modules]
+        self.assertEqual(loaded, [], "render-only modules were imported on a path that renders nothing")
+
+    def test_help(self) -> None:
+        result, modules = run_cli("--help")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assert_light_start(modules)
+
+    def test_validate(self) -> None:
+        with tempfile.TemporaryDirectory() as out_dir:
+            args = ("--fixtures", str(FIXTURES), "--out-dir", out_dir, "--run-tag", RUN_TAG, "--validate")
+            result, modules = run_cli(*args)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assert_light_start(modules)
+
+    def test_fully_cached_run(self) -> None:
+        with tempfile.TemporaryDirectory() as out_dir:
+            args = ("--fixtures", str(FIXTURES), "--out-dir", out_dir, "--run-tag", RUN_TAG, "--jobs", "2")
+            first, _ = run_cli(*args)
+            self.assertEqual(first.returncode, 0, first.stderr)
+            second, modules = run_cli(*args)
+        self.assertEqual(second.returncode, 0, second.stderr)
+        self.assertIn("28 unchanged, 0 rendered", second.stdout)
+        self.assert_light_start(modules)
+
+    def test_render_loads_the_backend(self) -> None:
+        # Guards the check itself: a run that does render must show up as loading reportlab.
+        with tempfile.TemporaryDirectory() as out_dir:
+            args = ("--fixtures", str(FIXTURES), "--out-dir", out_dir, "--run-tag", RUN_TAG, "--jobs", "1")
+            result, modules = run_cli(*args)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("reportlab.pdfgen.canvas", modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import subprocess
+import sys
+import unittest
+
+from support import CLI, FIXTURES, RUN_TAG, CorpusTestCase
+
+import mock_legal_generator as gen
+
+ROWS = gen.load_fixtures(FIXTURES)
+
+
+def read_frames(stream: bytes) -> list[tuple[dict, bytes]]:
+    # Frame: 4-byte big-endian header length, the JSON manifest record, then record["bytes"] of PDF.
+    frames, pos = [], 0
+    while pos < len(stream):
+        (length,) = struct.unpack_from(">I", stream, pos)
+        record = json.loads(stream[pos + 4 : pos + 4 + length])
+        pos += 4 + length
+        frames.append((record, stream[pos : pos + record["bytes"]]))
+        pos += record["bytes"]
+    return frames
+
+
+class StreamSinkTest(CorpusTestCase):
+    def test_frames_carry_the_same_documents_as_an_out_dir_build(self) -> None:
+        out = self.build(FIXTURES, "--reproducible")
+        records = [json.loads(line) for line in self.manifest.read_text(encoding="utf-8").splitlines()]
+        args = ["--fixtures", str(FIXTURES), "--out-stream", "--run-tag", RUN_TAG, "--reproducible"]
+        result = subprocess.run([sys.executable, str(CLI), *args], capture_output=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        frames = read_frames(result.stdout)
+        self.assertEqual([record for record, _ in frames], records)
+        for record, data in frames:
+            self.assertEqual(hashlib.sha256(data).hexdigest(), record["sha256"])
+            self.assertEqual(data, (out / record["fileName"]).read_bytes())
+        self.assertIn(f"stream: {len(ROWS)} document(s) written", result.stderr.decode())
+
+
+class RenderToBytesTest(unittest.TestCase):
+    def test_renders_a_validated_fixture_in_memory(self) -> None:
+        data = gen.render_to_bytes({**ROWS[0], "caseTitle": "  Doe v. Roe  "}, RUN_TAG)
+        self.assertTrue(data.startswith(b"%PDF-") and data.rstrip().endswith(b"%%EOF"))
+        with self.assertRaisesRegex(ValueError, "missing field 'description'"):
+            gen.render_to_bytes({**ROWS[0], "description": ""}, RUN_TAG)
+
+
+if __name__ == "__main__":
+    unittest.main()
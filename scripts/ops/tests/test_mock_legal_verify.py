@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+import unittest
+from pathlib import Path
+
+from support import FIXTURES, CorpusTestCase, cli
+
+import mock_legal_verify
+
+
+@unittest.skipIf(mock_legal_verify.missing_dependencies(), "verify needs pypdfium2")
+class VerifyTest(CorpusTestCase):
+    def verify(self, target: Path) -> dict:
+        report = self.tmp / "verify.json"
+        cli("verify", str(target), "--manifest", str(self.manifest), "--jobs", "2", "--report", str(report))
+        return json.loads(report.read_text(encoding="utf-8"))
+
+    def test_generated_corpus_passes(self) -> None:
+        report = self.verify(self.build(FIXTURES, "--variants-per-fixture", "2"))
+        self.assertEqual((report["documents"], report["failed"]), (56, 0), report["failures"])
+        self.assertGreater(report["docsPerSec"], 0)
+
+    def test_corrupt_truncated_and_overflowing_documents_fail(self) -> None:
+        rows = json.loads(FIXTURES.read_text(encoding="utf-8"))[:3]
+        rows[0] = {**rows[0], "description": " ".join(row["description"] for row in rows) * 12}
+        fixtures = self.tmp / "fixtures.json"
+        fixtures.write_text(json.dumps(rows), encoding="utf-8")
+        out = self.build(fixtures)
+        (out / rows[1]["fileName"]).write_bytes(b"%PDF-1.4 not really")
+        records = [json.loads(line) for line in self.manifest.read_text(encoding="utf-8").splitlines()]
+        records[2]["timeline"][0]["action"] += " and more"
+        self.manifest.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+        failures = {failure["fileName"]: failure["problems"] for failure in self.verify(out)["failures"]}
+        self.assertIn("text outside the page", failures[rows[0]["fileName"]][0])
+        self.assertTrue(any("manifest says" in problem for problem in failures[rows[1]["fileName"]]))
+        self.assertTrue(any("cut short" in problem for problem in failures[rows[2]["fileName"]]))
+
+    def test_a_missing_or_malformed_manifest_is_a_usage_error(self) -> None:
+        out = self.build(FIXTURES)
+        result = cli("verify", str(out), "--manifest", str(self.tmp / "none.jsonl"))
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("none.jsonl is not a file.", result.stderr)
+        records = self.manifest.read_text(encoding="utf-8").splitlines()
+        for name, line in (("caseNumber", 2), ("recipientName", 3)):
+            with self.subTest(missing=name):
+                bad = [*records]
+                record = json.loads(bad[line - 1])
+                del record[name]
+                bad[line - 1] = json.dumps(record)
+                manifest = self.tmp / "bad.jsonl"
+                manifest.write_text("\n".join(bad) + "\n", encoding="utf-8")
+                result = cli("verify", str(out), "--manifest", str(manifest))
+                self.assertEqual(result.returncode, 2)
+                self.assertNotIn("Traceback", result.stderr)
+                self.assertIn(f"bad.jsonl:{line}: not a build manifest record", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from support import FIXTURES
+
+import mock_legal_generator as gen
+
+SOURCE = Path(gen.__file__).read_text(encoding="utf-8")
+
+
+class IncrementalRebuildTest(unittest.TestCase):
+    def test_code_fingerprint_ignores_comments_and_layout_data(self) -> None:
+        base = gen.code_fingerprint(SOURCE)
+        self.assertEqual(gen.code_fingerprint(SOURCE.replace("# Round-robin", "# Round robin")), base)
+        edited = SOURCE.replace('"issuer": "Superior Court Administration"', '"issuer": "Court Office"')
+        self.assertNotEqual(edited, SOURCE)
+        self.assertEqual(gen.code_fingerprint(edited), base)
+        self.assertNotEqual(gen.code_fingerprint(SOURCE.replace("FLOW_BOTTOM = 58", "FLOW_BOTTOM = 60")), base)
+
+    def test_profile_edit_only_changes_digests_of_that_category(self) -> None:
+        fixtures = gen.load_fixtures(FIXTURES)
+        base = {"run_tag": "QA20260301", "issue_date": gen.run_date("QA20260301")}
+        jobs = list(gen.expand_jobs(enumerate(fixtures), base, Path(), 1, None, "QA20260301"))
+        before = [gen.render_inputs_digest(job) for job in jobs]
+        court = {**gen.PROFILE["court"], "issuer": "Court Office"}
+        with mock.patch.dict(gen.PROFILE, {"court": court}):
+            after = [gen.render_inputs_digest(job) for job in jobs]
+        categories = [gen.DOC_CATEGORY.get(job["fixture"]["documentType"], "general") for job in jobs]
+        changed = {category for category, old, new in zip(categories, before, after) if old != new}
+        self.assertEqual(changed, {"court"})
+
+    def test_layout_changes_name_what_was_edited(self) -> None:
+        state = gen.layout_state()
+        edited = {**state, "profile": {**state["profile"], "court": "x"}, "template": {**state["template"]}}
+        edited["template"]["receipt"] = "y"
+        self.assertEqual(gen.layout_changes(state, edited), ["PROFILE['court']", "TEMPLATES['receipt']"])
+        self.assertEqual(gen.layout_changes(state, {**edited, "code": "z"}), ["generator code"])
+
+
+if __name__ == "__main__":
+    unittest.main()
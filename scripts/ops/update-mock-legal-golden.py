@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+from pathlib import Path
+
+import mock_legal_generator as gen
+
+HERE = Path(__file__).resolve().parent
+GOLDEN = HERE / "tests" / "golden" / "mock-legal-render.json"
+# A run tag without a date, so the explicit issue date is what pins the clock.
+RUN_TAG = "GOLDEN"
+ISSUE_DATE = dt.date(2026, 3, 1)
+# Notice fixtures re-rendered as packets so the "packet" template part is covered too.
+PACKET_FIXTURES = 3
+PACKET_PAGES = 5
+
+
+def golden_fixtures() -> dict[str, list[dict[str, str]]]:
+    # Every bundled fixture (so every DOC_CATEGORY template, receipts included) plus a few notices as packets.
+    fixtures = gen.load_fixtures(HERE / "mock-legal-fixtures.json")
+    notices = [fixture for fixture in fixtures if "receipt" not in fixture["documentType"]][:PACKET_FIXTURES]
+    return {"bundled": fixtures, "packets": [{**fixture, "packetPages": PACKET_PAGES} for fixture in notices]}
+
+
+def render(fixture: dict[str, str]) -> bytes:
+    return gen.render_to_bytes(fixture, RUN_TAG, issue_date=ISSUE_DATE, reproducible=True)
+
+
+def golden_hashes() -> dict[str, dict[str, str]]:
+    return {
+        group: {fixture["fileName"]: hashlib.sha256(render(fixture)).hexdigest() for fixture in fixtures}
+        for group, fixtures in golden_fixtures().items()
+    }
+
+
+def main() -> int:
+    argparse.ArgumentParser(
+        description="Re-record the golden hashes tests/test_mock_legal_reproducible.py compares the bundled fixtures "
+        "against. Run it only when a change is meant to alter the rendered documents."
+    ).parse_args()
+    hashes = golden_hashes()
+    golden = {"reportlab": gen.reportlab_version(), "runTag": RUN_TAG, "issueDate": ISSUE_DATE.isoformat(), **hashes}
+    GOLDEN.parent.mkdir(parents=True, exist_ok=True)
+    GOLDEN.write_text(json.dumps(golden, indent=2) + "\n", encoding="utf-8")
+    print(f"wrote {sum(map(len, hashes.values()))} hash(es) to {GOLDEN}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())